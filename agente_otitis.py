@@ -3,13 +3,66 @@ Agente de Diagnóstico de Otitis - VERSIÓN MEJORADA CON GRAFO INTERCONECTADO
 Explora TODO el grafo y muestra paso a paso el proceso
 """
 
-from collections import deque
+from collections import deque, namedtuple
+import hashlib
+import heapq
+import json
 import time
 
+from motor_probabilistico import MotorProbabilistico
+from traza import Traza
+from flujo_pasos import normalizar_observadores
+from control_busqueda import ControlBusqueda, HAZ, marcar_estado
+from grafo_csr import GrafoCSR
+from indice_traza import IndiceTraza
+from catalogo_sintomas import CatalogoSintomas
+from dominadores import ArbolPostdominadores
+from condensacion import Condensacion
+
+
+# Vista inmutable del grafo que usa una búsqueda mientras se ejecuta
+InstantaneaGrafo = namedtuple('InstantaneaGrafo', ['version', 'grafo', 'pesos'])
+
+# Nodos por nivel que conserva busqueda_haz por defecto
+ANCHO_HAZ = 64
+
+
 class AgenteOtitis:
     
-    def __init__(self):
-        self.grafo, self.pesos = self._crear_grafo()
+    def __init__(self, grafo=None, pesos=None, objetivos=None):
+        """
+        Sin argumentos usa el grafo de otitis. Para un grafo combinado con
+        varias enfermedades se pasan `grafo` (nodo -> vecinos), `pesos`
+        (opcional, 0.5 por defecto) y `objetivos` (diagnósticos, en orden de
+        prioridad). El primero es el objetivo principal que usan el motor
+        probabilístico, la política de preguntas y los caminos alternativos.
+        """
+        if grafo is None:
+            self.grafo, self.pesos = self._crear_grafo()
+        else:
+            self.grafo = {nodo: list(vecinos) for nodo, vecinos in grafo.items()}
+            for vecinos in grafo.values():
+                for vecino in vecinos:
+                    self.grafo.setdefault(vecino, [])
+            self.pesos = {nodo: 0.5 for nodo in self.grafo}
+            self.pesos.update(pesos or {})
+        
+        self.objetivos = tuple(objetivos) if objetivos else ("OTITIS",)
+        if grafo is not None:
+            for objetivo in self.objetivos:
+                self._validar_nodo(objetivo)
+        self.objetivo = self.objetivos[0]
+        
+        # Versión monotónica: aumenta con cada modificación del grafo
+        self.version = 0
+        # Copy-on-write: si hay instantáneas vivas, la próxima escritura copia
+        self._compartido = False
+        
+        # Índices derivados que se mantienen de forma INCREMENTAL
+        self._inversos = self._crear_inversos()
+        self._distancia_objetivo = self._calcular_distancias_objetivo()
+        # Estructuras que se reconstruyen bajo demanda cuando cambia la versión
+        self._derivados = {}
         
     def _crear_grafo(self):
         """
@@ -67,70 +120,809 @@ class AgenteOtitis:
         
         return grafo, pesos
         
+    # ========================================================================
+    # MODIFICACIÓN INCREMENTAL DEL GRAFO
+    # ========================================================================
+    
+    def _crear_inversos(self):
+        """Lista de predecesores de cada nodo (aristas invertidas)"""
+        inversos = {nodo: [] for nodo in self.grafo}
+        for nodo, vecinos in self.grafo.items():
+            for vecino in vecinos:
+                inversos.setdefault(vecino, []).append(nodo)
+        return inversos
+    
+    def _calcular_distancias_objetivo(self, objetivo=None):
+        """BFS inverso desde OTITIS: distancia (en saltos) de cada nodo al objetivo"""
+        objetivo = self.objetivo if objetivo is None else objetivo
+        if objetivo not in self.grafo:
+            return {}
+        distancias = {objetivo: 0}
+        cola = deque([objetivo])
+        while cola:
+            nodo = cola.popleft()
+            for previo in self._inversos.get(nodo, []):
+                if previo not in distancias:
+                    distancias[previo] = distancias[nodo] + 1
+                    cola.append(previo)
+        return distancias
+    
+    def instantanea(self):
+        """
+        Retorna una vista consistente del grafo para una búsqueda.
+        
+        Es O(1): no copia nada, sólo marca el grafo como compartido. Las
+        modificaciones posteriores copian los diccionarios antes de escribir
+        (copy-on-write) y nunca alteran las listas de vecinos en su lugar,
+        así que la búsqueda en curso sigue viendo la versión original.
+        """
+        self._compartido = True
+        return InstantaneaGrafo(self.version, self.grafo, self.pesos)
+    
+    def _preparar_escritura(self):
+        """Copia el grafo y los pesos si alguna instantánea los comparte"""
+        if self._compartido:
+            self.grafo = dict(self.grafo)
+            self.pesos = dict(self.pesos)
+            self._compartido = False
+    
+    def _validar_nodo(self, nodo):
+        if nodo not in self.grafo:
+            raise ValueError(f"Síntoma desconocido: {nodo}")
+    
+    def agregar_sintoma(self, sintoma, peso=0.5):
+        """Agrega un síntoma nuevo (sin aristas) con su peso"""
+        if sintoma in self.grafo:
+            raise ValueError(f"El síntoma ya existe: {sintoma}")
+        self._validar_peso(peso)
+        
+        self._preparar_escritura()
+        self.grafo[sintoma] = []
+        self.pesos[sintoma] = peso
+        self._inversos[sintoma] = []
+        self.version += 1
+    
+    def agregar_arista(self, origen, destino):
+        """
+        Agrega la arista origen → destino.
+        
+        Si destino alcanza OTITIS, las distancias al objetivo sólo pueden
+        disminuir: se propagan hacia atrás desde origen, tocando únicamente
+        los nodos cuya distancia mejora.
+        """
+        self._validar_nodo(origen)
+        self._validar_nodo(destino)
+        if destino in self.grafo[origen]:
+            return False
+        
+        self._preparar_escritura()
+        self.grafo[origen] = self.grafo[origen] + [destino]
+        self._inversos[destino].append(origen)
+        self.version += 1
+        
+        # Actualización incremental de distancias (sólo mejoras)
+        distancias = self._distancia_objetivo
+        if destino in distancias and distancias[destino] + 1 < distancias.get(origen, float('inf')):
+            distancias[origen] = distancias[destino] + 1
+            cola = deque([origen])
+            while cola:
+                nodo = cola.popleft()
+                for previo in self._inversos[nodo]:
+                    if distancias[nodo] + 1 < distancias.get(previo, float('inf')):
+                        distancias[previo] = distancias[nodo] + 1
+                        cola.append(previo)
+        return True
+    
+    def eliminar_arista(self, origen, destino):
+        """
+        Elimina la arista origen → destino.
+        
+        Sólo se recalculan los nodos que pierden TODOS sus caminos mínimos
+        al objetivo (al estilo Ramalingam-Reps): primero se identifican en
+        orden de distancia y luego se re-relajan desde sus vecinos intactos.
+        """
+        self._validar_nodo(origen)
+        self._validar_nodo(destino)
+        if destino not in self.grafo[origen]:
+            return False
+        
+        self._preparar_escritura()
+        self.grafo[origen] = [v for v in self.grafo[origen] if v != destino]
+        self._inversos[destino].remove(origen)
+        self.version += 1
+        
+        distancias = self._distancia_objetivo
+        if (origen not in distancias or destino not in distancias
+                or distancias[origen] != distancias[destino] + 1):
+            return True  # La arista no sostenía ningún camino mínimo
+        
+        # 1) Nodos cuya distancia AUMENTA (procesados por distancia creciente)
+        afectados = set()
+        pendientes = [(distancias[origen], origen)]
+        while pendientes:
+            d, nodo = heapq.heappop(pendientes)
+            if nodo in afectados or nodo == self.objetivo:
+                continue
+            sigue_apoyado = any(
+                v not in afectados and distancias.get(v) == d - 1
+                for v in self.grafo[nodo]
+            )
+            if sigue_apoyado:
+                continue
+            afectados.add(nodo)
+            for previo in self._inversos[nodo]:
+                if previo not in afectados and distancias.get(previo) == d + 1:
+                    heapq.heappush(pendientes, (d + 1, previo))
+        
+        # 2) Recalcular sólo los afectados a partir de sus vecinos intactos
+        for nodo in afectados:
+            del distancias[nodo]
+        pendientes = []
+        for nodo in afectados:
+            candidatas = [distancias[v] + 1 for v in self.grafo[nodo] if v in distancias]
+            if candidatas:
+                heapq.heappush(pendientes, (min(candidatas), nodo))
+        while pendientes:
+            d, nodo = heapq.heappop(pendientes)
+            if nodo in distancias:
+                continue
+            distancias[nodo] = d
+            for previo in self._inversos[nodo]:
+                if previo in afectados and previo not in distancias:
+                    heapq.heappush(pendientes, (d + 1, previo))
+        return True
+    
+    def fijar_peso(self, sintoma, peso):
+        """Cambia el peso (importancia) de un síntoma"""
+        self._validar_nodo(sintoma)
+        self._validar_peso(peso)
+        if self.pesos.get(sintoma) == peso:
+            return
+        self._preparar_escritura()
+        self.pesos[sintoma] = peso
+        self.version += 1
+    
+    def _validar_peso(self, peso):
+        if not 0.0 <= peso <= 1.0:
+            raise ValueError(f"El peso debe estar entre 0.0 y 1.0: {peso}")
+    
+    def _derivado(self, clave, construir):
+        """Cache de una estructura derivada; se invalida al cambiar la versión"""
+        entrada = self._derivados.get(clave)
+        if entrada is None or entrada[0] != self.version:
+            entrada = (self.version, construir())
+            self._derivados[clave] = entrada
+        return entrada[1]
+    
+    def huella(self):
+        """
+        Hash SHA-256 (hex) del contenido: grafo con el orden de los vecinos,
+        pesos y objetivos. Es estable entre procesos (no depende de hash()
+        ni del orden de inserción de los nodos); se calcula una vez por versión.
+        """
+        def construir():
+            contenido = {
+                'grafo': sorted(self.grafo.items()),
+                'pesos': sorted(self.pesos.items()),
+                'objetivos': self.objetivos
+            }
+            texto = json.dumps(contenido, ensure_ascii=False, separators=(',', ':'))
+            return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+        return self._derivado('huella', construir)
+    
+    def alcanza_objetivo(self, nodo):
+        """True si existe algún camino desde el nodo hasta OTITIS"""
+        return nodo in self._distancia_objetivo
+    
+    def nodos_que_alcanzan_objetivo(self):
+        """Conjunto (inverso-alcanzable) de nodos con algún camino hasta OTITIS"""
+        return set(self._distancia_objetivo)
+    
+    def distancia_a_objetivo(self, nodo):
+        """Saltos mínimos desde el nodo hasta OTITIS (None si es inalcanzable)"""
+        return self._distancia_objetivo.get(nodo)
+    
+    # ========================================================================
+    # VARIOS DIAGNÓSTICOS (CONJUNTO DE OBJETIVOS)
+    # ========================================================================
+    
+    def _objetivos(self, objetivos):
+        """Normaliza un conjunto de objetivos (por defecto, todos los del agente)"""
+        if objetivos is None:
+            return self.objetivos
+        if isinstance(objetivos, str):
+            objetivos = (objetivos,)
+        objetivos = tuple(objetivos)
+        for objetivo in objetivos:
+            self._validar_nodo(objetivo)
+        return objetivos
+    
+    def tabla_distancias(self):
+        """
+        Tabla objetivo -> {nodo: saltos mínimos hasta ese objetivo}.
+        
+        Un BFS inverso por objetivo, una vez por versión del grafo; el
+        objetivo principal reutiliza las distancias incrementales. Es de sólo
+        lectura: no modificar los diccionarios retornados.
+        """
+        def construir():
+            tabla = {}
+            for objetivo in self.objetivos:
+                if objetivo == self.objetivo:
+                    tabla[objetivo] = self._distancia_objetivo
+                else:
+                    tabla[objetivo] = self._calcular_distancias_objetivo(objetivo)
+            return tabla
+        return self._derivado('tabla_distancias', construir)
+    
+    def distancias_a_objetivos(self, nodo):
+        """Saltos mínimos desde el nodo hasta cada diagnóstico alcanzable"""
+        return {objetivo: distancias[nodo]
+                for objetivo, distancias in self.tabla_distancias().items()
+                if nodo in distancias}
+    
+    def _distancias_objetivos(self):
+        """Nodo -> saltos hasta el diagnóstico más cercano, una vez por versión"""
+        if self.objetivos == (self.objetivo,):
+            return self._distancia_objetivo
+        
+        def construir():
+            minimas = {}
+            for distancias in self.tabla_distancias().values():
+                for nodo, d in distancias.items():
+                    if d < minimas.get(nodo, d + 1):
+                        minimas[nodo] = d
+            return minimas
+        return self._derivado('distancias_objetivos', construir)
+    
+    def diagnostico_mas_cercano(self, nodo):
+        """
+        (diagnóstico, saltos) del diagnóstico más cercano al nodo, o None si
+        no alcanza ninguno. Los empates se resuelven por el orden de
+        `objetivos`. Cada consulta es O(número de diagnósticos).
+        """
+        mejor = None
+        for objetivo, distancias in self.tabla_distancias().items():
+            d = distancias.get(nodo)
+            if d is not None and (mejor is None or d < mejor[1]):
+                mejor = (objetivo, d)
+        return mejor
+    
+    def catalogo(self):
+        """CatalogoSintomas (ordenado, con índice de prefijos), uno por versión del grafo"""
+        def construir():
+            sintomas = [nodo for nodo in self.grafo if nodo not in self.objetivos]
+            return CatalogoSintomas(sintomas, self.formatear_nombre)
+        return self._derivado('catalogo', construir)
+    
     def obtener_sintomas(self):
-        """Obtiene todos los síntomas disponibles (excluyendo OTITIS)"""
-        sintomas = set()
-        for nodo in self.grafo.keys():
-            if nodo != "OTITIS":
-                sintomas.add(nodo)
-        return sorted(list(sintomas))
+        """Obtiene todos los síntomas disponibles (excluyendo los diagnósticos)"""
+        return list(self.catalogo().sintomas)
+    
+    def buscar_sintomas(self, texto, limite=None):
+        """Síntomas con alguna palabra que empieza por `texto` (sin acentos ni mayúsculas)"""
+        return self.catalogo().buscar(texto, limite)
     
     def obtener_vecinos(self, nodo):
         """Obtiene los síntomas a los que se puede ir desde un nodo"""
         return self.grafo.get(nodo, [])
     
-    def bfs(self, sintoma_inicial):
+    def obtener_predecesores(self, nodo):
+        """Obtiene los síntomas desde los que se llega a un nodo"""
+        return self._inversos.get(nodo, [])
+    
+    def bfs(self, sintoma_inicial, podar=False, objetivos=None, observadores=None, ventana=None,
+            max_nodos=None, tiempo_limite=None, token=None):
         """
         BFS - Búsqueda por amplitud desde UN síntoma inicial
         Explora nivel por nivel usando cola (FIFO)
         Retorna todos los pasos de la exploración
+        
+        Con podar=True no se encolan los vecinos que nunca pueden llegar a
+        OTITIS; quedan marcados en 'podados' de cada paso.
+        
+        `objetivos` (por defecto los del agente) es el conjunto de
+        diagnósticos buscados en el MISMO recorrido: ver _busqueda_frontera.
+        `observadores` y `ventana`: ver flujo_pasos.py y Traza.
+        `max_nodos`, `tiempo_limite` (segundos) y `token` (TokenCancelacion)
+        cortan la búsqueda con un resultado 'inconcluso': ver control_busqueda.py.
+        """
+        control = ControlBusqueda.crear(max_nodos, tiempo_limite, token)
+        return self._busqueda_frontera(sintoma_inicial, 'cola', podar, objetivos,
+                                       observadores, ventana, control)
+    
+    def dfs(self, sintoma_inicial, podar=False, objetivos=None, observadores=None, ventana=None,
+            max_nodos=None, tiempo_limite=None, token=None):
+        """
+        DFS - Búsqueda en profundidad desde UN síntoma inicial
+        Explora en profundidad usando pila (LIFO)
+        Retorna todos los pasos de la exploración
+        
+        Con podar=True no se apilan los vecinos que nunca pueden llegar a
+        OTITIS; quedan marcados en 'podados' de cada paso.
+        
+        `objetivos` (por defecto los del agente) es el conjunto de
+        diagnósticos buscados en el MISMO recorrido: ver _busqueda_frontera.
+        `observadores` y `ventana`: ver flujo_pasos.py y Traza.
+        `max_nodos`, `tiempo_limite` (segundos) y `token` (TokenCancelacion)
+        cortan la búsqueda con un resultado 'inconcluso': ver control_busqueda.py.
+        """
+        control = ControlBusqueda.crear(max_nodos, tiempo_limite, token)
+        return self._busqueda_frontera(sintoma_inicial, 'pila', podar, objetivos,
+                                       observadores, ventana, control)
+    
+    def grafo_csr(self):
+        """GrafoCSR del grafo actual, construido una vez por versión"""
+        return self._derivado('grafo_csr', lambda: GrafoCSR(self.grafo))
+
+    def condensacion(self):
+        """Condensación del grafo (componentes fuertes y su DAG), una por versión"""
+        return self._derivado('condensacion', lambda: Condensacion(self.grafo_csr()))
+    
+    def alcanzables(self, sintoma):
+        """Síntomas a los que se puede ir desde `sintoma` (incluido), recorriendo el DAG de componentes"""
+        self._validar_nodo(sintoma)
+        return self.condensacion().alcanzables(sintoma)
+    
+    def camino_entre(self, origen, destino):
+        """Algún camino de síntomas reales de origen a destino (None si no hay), ver Condensacion.camino"""
+        self._validar_nodo(origen)
+        self._validar_nodo(destino)
+        return self.condensacion().camino(origen, destino)
+    
+    def postdominadores(self, objetivo=None):
+        """ArbolPostdominadores hacia el objetivo (por defecto el principal), uno por versión"""
+        objetivo = objetivo or self.objetivo
+        self._validar_nodo(objetivo)
+        return self._derivado(('postdominadores', objetivo),
+                              lambda: ArbolPostdominadores(self.grafo_csr(), objetivo))
+    
+    def sintomas_inevitables(self, sintoma, objetivo=None):
+        """
+        Síntomas por los que pasa TODO camino del síntoma a OTITIS (u otro
+        objetivo), del más cercano al más lejano. None si no llega.
+        """
+        self._validar_nodo(sintoma)
+        return self.postdominadores(objetivo).inevitables(sintoma)
+    
+    def compuerta_comun(self, sintomas, objetivo=None):
+        """
+        Primer síntoma obligado para TODOS los síntomas dados: desde
+        cualquiera de ellos, todo camino a OTITIS pasa por él.
+        None si alguno no llega.
+        """
+        for sintoma in sintomas:
+            self._validar_nodo(sintoma)
+        return self.postdominadores(objetivo).compuerta(sintomas)
+    
+    def explicar_diagnostico(self, sintoma_inicial, objetivo=None):
+        """
+        Por qué un síntoma inicial lleva (o no) a OTITIS.
+        
+        Si llega: 'inevitables' son los síntomas por los que pasa todo camino.
+        Si no llega (SANO): 'alcanzables' cuenta los síntomas a los que se
+        puede ir desde el inicial (ninguno tiene camino a OTITIS) y
+        'callejones' son los de ellos sin salida.
+        """
+        self._validar_nodo(sintoma_inicial)
+        objetivo = objetivo or self.objetivo
+        arbol = self.postdominadores(objetivo)
+        nombre = self.formatear_nombre(objetivo)
+        
+        if arbol.llega(sintoma_inicial):
+            inevitables = arbol.inevitables(sintoma_inicial)
+            if inevitables:
+                explicacion = (f"Todo camino a {nombre} pasa por: "
+                               + ", ".join(self.formatear_nombre(n) for n in inevitables))
+            else:
+                explicacion = f"Hay caminos a {nombre} sin ningún síntoma obligado"
+            return {'objetivo': objetivo, 'llega': True, 'inevitables': inevitables,
+                    'explicacion': explicacion}
+        
+        alcanzables = self.condensacion().alcanzables(sintoma_inicial)
+        callejones = sorted(n for n in alcanzables if not self.grafo[n])
+        explicacion = (f"Desde {self.formatear_nombre(sintoma_inicial)} se alcanzan "
+                       f"{len(alcanzables) - 1} síntomas y ninguno tiene camino a {nombre}")
+        if callejones:
+            explicacion += ("; terminan en: "
+                            + ", ".join(self.formatear_nombre(n) for n in callejones[:10]))
+            if len(callejones) > 10:
+                explicacion += f" y {len(callejones) - 10} más"
+        return {'objetivo': objetivo, 'llega': False, 'alcanzables': len(alcanzables) - 1,
+                'callejones': callejones, 'explicacion': explicacion}
+    
+    def bfs_niveles(self, sintoma_inicial, podar=False, objetivos=None):
+        """
+        BFS por niveles sobre el grafo CSR (ver grafo_csr.py)
+
+        Recorre el grafo en el MISMO orden que bfs() y retorna el mismo
+        resultado (camino_final, nodos_explorados, objetivos_alcanzados con
+        su 'paso', nodos_podados...) pero SIN traza: 'pasos' queda vacío y
+        'niveles' dice cuántos niveles se expandieron. Pensado para grafos
+        anchos en los que sólo interesa el diagnóstico; no admite
+        observadores ni límites.
+        """
+        if not sintoma_inicial or sintoma_inicial not in self.grafo:
+            return marcar_estado(self._resultado_vacio())
+
+        objetivos = self._objetivos(objetivos)
+        csr = self.grafo_csr()
+        mascara = None
+        if podar:
+            mascara = self._derivado(('mascara_csr', objetivos),
+                                     lambda: csr.mascara(self._mascara_objetivo(objetivos)))
+
+        inicio = time.time()
+        recorrido = csr.bfs_niveles(csr.indice[sintoma_inicial],
+                                    [csr.indice[objetivo] for objetivo in objetivos], mascara)
+        alcanzados = [{'objetivo': csr.nodos[objetivo],
+                       'camino': csr.camino(recorrido['padres'], objetivo),
+                       'paso': paso}
+                      for objetivo, paso in recorrido['alcanzados']]
+        tiempo_ms = (time.time() - inicio) * 1000
+
+        resultado = {
+            'encontrado': bool(alcanzados),
+            'tiene_otitis': bool(alcanzados),
+            'probabilidad': self._calcular_probabilidad([sintoma_inicial]) if alcanzados else 0.0,
+            'camino_final': alcanzados[0]['camino'] if alcanzados else [],
+            'pasos': [],
+            'tiempo_ms': tiempo_ms,
+            'nodos_explorados': recorrido['visitados'],
+            'diagnostico': alcanzados[0]['objetivo'] if alcanzados else None,
+            'objetivos_alcanzados': alcanzados,
+            'niveles': recorrido['niveles']
+        }
+        if podar:
+            resultado['nodos_podados'] = recorrido['podados']
+        return marcar_estado(resultado)
+
+    def busqueda_haz(self, sintoma_inicial, ancho=ANCHO_HAZ, puntaje='peso', max_niveles=None,
+                     podar=False, objetivos=None, max_nodos=None, tiempo_limite=None, token=None):
+        """
+        Búsqueda en haz: BFS por niveles que conserva sólo los `ancho`
+        mejores nodos de cada nivel.
+        
+        `puntaje` ordena los candidatos (mayor = mejor):
+        - 'peso': importancia del síntoma (self.pesos)
+        - 'distancia': más cerca de alguno de los `objetivos` primero (los que
+          no llegan, al final)
+        - una función f(nodo) -> número (por ejemplo un puntaje aprendido)
+        A igual puntaje gana el que se generó antes (orden del BFS).
+        
+        Los candidatos de un nivel pasan por un heap de tamaño `ancho`, así
+        cada nivel usa memoria O(ancho) y tiempo O(ancho · grado · log ancho)
+        sin importar cuántos nodos tenga el grafo; con `max_niveles` la
+        búsqueda completa queda acotada por ancho · max_niveles. Un objetivo
+        se registra en cuanto aparece como candidato, aunque el haz lo descarte.
+        
+        El resultado tiene los campos de bfs (sin traza: 'pasos' vacío) más
+        'ancho', 'niveles', 'descartados' (candidatos que el haz dejó afuera)
+        y 'truncado' (descartó nodos o cortó en max_niveles). Si el haz se
+        truncó y no se llegó a ningún diagnóstico el resultado es
+        'inconcluso' (motivo 'haz'): un haz truncado sin diagnóstico NO
+        significa paciente sano.
+        """
+        if not sintoma_inicial or sintoma_inicial not in self.grafo:
+            return marcar_estado(self._resultado_vacio())
+        if ancho < 1:
+            raise ValueError(f"El ancho del haz debe ser >= 1 (recibido {ancho})")
+        
+        objetivos = self._objetivos(objetivos)
+        # Grafo, pesos y distancias de la misma versión
+        instantanea = self.instantanea()
+        grafo = instantanea.grafo
+        mascara = self._mascara_objetivo(objetivos) if podar else None
+        if puntaje == 'peso':
+            pesos = instantanea.pesos
+            puntuar = lambda nodo: pesos.get(nodo, 0.0)
+        elif puntaje == 'distancia':
+            # Distancia al MÁS CERCANO de los objetivos pedidos
+            tabla = self.tabla_distancias()
+            tablas = [tabla[objetivo] if objetivo in tabla
+                      else self._calcular_distancias_objetivo(objetivo)
+                      for objetivo in objetivos]
+            infinito = float('inf')
+            puntuar = lambda nodo: -min((d.get(nodo, infinito) for d in tablas),
+                                        default=infinito)
+        elif callable(puntaje):
+            puntuar = puntaje
+        else:
+            raise ValueError(f"Puntaje desconocido: {puntaje}")
+        control = ControlBusqueda.crear(max_nodos, tiempo_limite, token)
+        
+        inicio = time.time()
+        # Padres sólo de los nodos que entraron al haz: O(ancho · niveles)
+        padres = {sintoma_inicial: None}
+        
+        def camino(nodo, padre):
+            camino = [nodo]
+            while padre is not None:
+                camino.append(padre)
+                padre = padres[padre]
+            camino.reverse()
+            return camino
+        
+        pendientes = set(objetivos)
+        alcanzados = []
+        if sintoma_inicial in pendientes:
+            pendientes.discard(sintoma_inicial)
+            alcanzados.append({'objetivo': sintoma_inicial, 'camino': [sintoma_inicial], 'paso': 0})
+        haz = [sintoma_inicial]
+        niveles = expandidos = descartados = podados = 0
+        motivo = None
+        
+        while haz and pendientes:
+            if max_niveles is not None and niveles >= max_niveles:
+                break
+            niveles += 1
+            # Mínimo en la raíz: (puntaje, -orden) del peor candidato conservado
+            mejores = []
+            en_haz = set()
+            orden = 0
+            for nodo in haz:
+                if control is not None:
+                    motivo = control.detener(expandidos)
+                    if motivo:
+                        break
+                expandidos += 1
+                for vecino in grafo.get(nodo, []):
+                    if vecino in padres or vecino in en_haz:
+                        continue
+                    if mascara is not None and vecino not in mascara:
+                        podados += 1
+                        continue
+                    if vecino in pendientes:
+                        pendientes.discard(vecino)
+                        alcanzados.append({'objetivo': vecino, 'camino': camino(vecino, nodo),
+                                           'paso': niveles})
+                    orden += 1
+                    entrada = (puntuar(vecino), -orden, vecino, nodo)
+                    if len(mejores) < ancho:
+                        heapq.heappush(mejores, entrada)
+                        en_haz.add(vecino)
+                    elif entrada > mejores[0]:
+                        salida = heapq.heapreplace(mejores, entrada)
+                        en_haz.discard(salida[2])
+                        en_haz.add(vecino)
+                        descartados += 1
+                    else:
+                        descartados += 1
+                if not pendientes:
+                    break
+            if motivo:
+                break
+            
+            mejores.sort(reverse=True)
+            haz = []
+            for _, _, vecino, padre in mejores:
+                padres[vecino] = padre
+                haz.append(vecino)
+        
+        tiempo_ms = (time.time() - inicio) * 1000
+        resultado = {
+            'encontrado': bool(alcanzados),
+            'tiene_otitis': bool(alcanzados),
+            'probabilidad': self._calcular_probabilidad([sintoma_inicial]) if alcanzados else 0.0,
+            'camino_final': alcanzados[0]['camino'] if alcanzados else [],
+            'pasos': [],
+            'tiempo_ms': tiempo_ms,
+            'nodos_explorados': len(padres),
+            'diagnostico': alcanzados[0]['objetivo'] if alcanzados else None,
+            'objetivos_alcanzados': alcanzados,
+            'ancho': ancho,
+            'niveles': niveles,
+            'descartados': descartados,
+            # Quedó haz sin expandir en max_niveles: también es un corte
+            'truncado': descartados > 0 or bool(haz and pendientes and motivo is None)
+        }
+        if podar:
+            resultado['nodos_podados'] = podados
+        if motivo is None and resultado['truncado'] and not alcanzados:
+            motivo = HAZ
+        return marcar_estado(resultado, motivo, haz if motivo else ())
+    
+    def _mascara_objetivo(self, objetivos=None):
+        """Nodos que pueden llegar a algún objetivo (BFS inverso), una vez por versión"""
+        objetivos = objetivos or (self.objetivo,)
+        if objetivos == (self.objetivo,):
+            return self._derivado('mascara_objetivo', lambda: frozenset(self._distancia_objetivo))
+        
+        def construir():
+            tabla = self.tabla_distancias()
+            mascara = set()
+            for objetivo in objetivos:
+                mascara.update(tabla[objetivo] if objetivo in tabla
+                               else self._calcular_distancias_objetivo(objetivo))
+            return frozenset(mascara)
+        return self._derivado(('mascara_objetivo', objetivos), construir)
+    
+    def _busqueda_frontera(self, sintoma_inicial, estructura, podar, objetivos=None,
+                           observadores=None, ventana=None, control=None):
+        """
+        Núcleo común de BFS y DFS: sólo cambia por dónde sale el nodo
+        - 'cola': sale el PRIMERO (FIFO)
+        - 'pila': sale el TOPE (LIFO); los vecinos se apilan en reversa para
+          que el primero de la lista se explore primero
+        
+        Con varios objetivos el recorrido no se detiene en el primero: sigue
+        hasta alcanzarlos todos o agotar la frontera, y 'objetivos_alcanzados'
+        los lista en el orden en que salieron de la frontera. camino_final y
+        'diagnostico' corresponden al PRIMERO. Con un único objetivo el
+        recorrido es idéntico al de siempre.
+        
+        Cada paso se entrega a los `observadores` (ObservadorPasos o
+        funciones f(paso)) en cuanto se registra. Con `ventana` la traza sólo
+        conserva los últimos `ventana` pasos y 'pasos_totales' los cuenta todos.
+        
+        Antes de sacar cada nodo se consulta el `control` (ControlBusqueda):
+        si pide parar, el resultado queda 'inconcluso' con la frontera
+        pendiente y lo alcanzado hasta ese momento.
+        """
+        observadores = normalizar_observadores(observadores)
+        if not sintoma_inicial or sintoma_inicial not in self.grafo:
+            resultado = marcar_estado(self._resultado_vacio())
+            for observador in observadores:
+                observador.al_terminar(resultado)
+            return resultado
+        
+        objetivos = self._objetivos(objetivos)
+        grafo = self.instantanea().grafo
+        mascara = self._mascara_objetivo(objetivos) if podar else None
+        es_cola = estructura == 'cola'
+        
+        inicio = time.time()
+        # La traza es también la frontera: guarda cada paso en arreglos
+        # paralelos y arma los diccionarios sólo cuando se leen
+        frontera = Traza(estructura, sintoma_inicial, con_podados=podar, ventana=ventana)
+        pendientes = set(objetivos)
+        alcanzados = []  # [{'objetivo', 'camino', 'paso'}] en orden
+        motivo = None
+        
+        while frontera.hay_pendientes():
+            # ¿Cancelada, sin presupuesto o fuera de tiempo? (nodos expandidos = pasos)
+            if control is not None:
+                motivo = control.detener(frontera.num_pasos)
+                if motivo:
+                    break
+            
+            # Guardar estado ANTES de sacar el nodo (para mostrar todo incluyendo
+            # el que va a salir: el frente de la cola o el TOPE de la pila)
+            frontera.registrar_paso()
+            if observadores:
+                paso = frontera.ultimo_paso()
+                for observador in observadores:
+                    observador.al_paso(paso)
+            
+            # Ahora sí sacar el nodo
+            nodo_actual = frontera.sacar()
+            
+            # Si llegamos a un diagnóstico (OTITIS)
+            if nodo_actual in pendientes:
+                pendientes.discard(nodo_actual)
+                alcanzados.append({'objetivo': nodo_actual, 'camino': frontera.camino(nodo_actual),
+                                   'paso': frontera.num_pasos})
+                if not pendientes:
+                    break
+            
+            # Explorar vecinos y agregarlos a la frontera
+            vecinos = list(grafo.get(nodo_actual, []))
+            if not es_cola:
+                vecinos.reverse()
+            for vecino in vecinos:
+                if frontera.visitado(vecino) or frontera.podado(vecino):
+                    continue
+                # Poda: este vecino nunca puede llegar a OTITIS
+                if mascara is not None and vecino not in mascara:
+                    frontera.marcar_podado(vecino)
+                    continue
+                frontera.marcar_visitado(vecino)
+                frontera.meter(vecino, nodo_actual)
+        
+        tiempo_ms = (time.time() - inicio) * 1000
+        
+        # 'en_camino' de cada paso se deriva de los caminos finales al leerlo
+        frontera.finalizar(alcanzado['camino'] for alcanzado in alcanzados)
+        
+        # Determinar resultado
+        if alcanzados:
+            resultado = {
+                'encontrado': True,
+                'tiene_otitis': True,
+                'probabilidad': self._calcular_probabilidad([sintoma_inicial]),
+                'camino_final': alcanzados[0]['camino'],
+                'pasos': frontera,
+                'tiempo_ms': tiempo_ms,
+                'nodos_explorados': frontera.num_visitados
+            }
+        else:
+            # NO llegó a OTITIS = Paciente SANO
+            resultado = {
+                'encontrado': False,
+                'tiene_otitis': False,
+                'probabilidad': 0.0,
+                'camino_final': [],
+                'pasos': frontera,
+                'tiempo_ms': tiempo_ms,
+                'nodos_explorados': frontera.num_visitados
+            }
+        resultado['diagnostico'] = alcanzados[0]['objetivo'] if alcanzados else None
+        resultado['objetivos_alcanzados'] = alcanzados
+        if podar:
+            resultado['nodos_podados'] = frontera.num_podados
+        if ventana is not None:
+            resultado['pasos_totales'] = frontera.num_pasos
+        marcar_estado(resultado, motivo, frontera.frontera_actual() if motivo else ())
+        for observador in observadores:
+            observador.al_terminar(resultado)
+        return resultado
+    
+    def dfs_iterativo(self, sintoma_inicial, registrar_pasos=True):
+        """
+        DFS iterativo con pila de iteradores y UN camino compartido
+        
+        Produce el mismo orden de visita y el mismo camino_final que `dfs`,
+        pero en lugar de apilar una copia del camino por cada vecino mantiene:
+        - camino: lista única que crece al descender y se acorta al retroceder
+        - marcos: por cada nodo del camino, sus hijos pendientes y un índice
+        
+        Memoria del camino O(profundidad) en vez de O(V·profundidad). Con
+        registrar_pasos=False no se guarda la traza (útil en grafos enormes).
+        Con varios diagnósticos se detiene en el primero que alcanza.
         """
         if not sintoma_inicial or sintoma_inicial not in self.grafo:
             return self._resultado_vacio()
         
+        grafo = self.instantanea().grafo
+        objetivos = frozenset(self.objetivos)
         inicio = time.time()
-        cola = deque([(sintoma_inicial, [sintoma_inicial])])
+        camino = [sintoma_inicial]
+        marcos = []  # [hijos, índice del próximo hijo] por cada nodo del camino
         visitados = {sintoma_inicial}
         pasos = []
         paso_num = 0
         camino_a_otitis = None
         
-        while cola:
-            # Guardar estado ANTES de desencolar (para mostrar todo incluyendo el que va a salir)
+        while camino:
             paso_num += 1
-            cola_visual = [n for n, _ in cola]
-            nodo_actual, camino = cola[0]  # Ver qué está en el frente sin sacarlo
+            nodo_actual = camino[-1]
             
-            pasos.append({
-                'paso': paso_num,
-                'nodo_actual': nodo_actual,
-                'cola': cola_visual.copy(),
-                'visitados': visitados.copy(),
-                'camino': camino.copy(),
-                'en_camino': False
-            })
-            
-            # Ahora sí desencolar
-            cola.popleft()
+            if registrar_pasos:
+                # La pila equivalente: hijos pendientes de cada marco + el TOPE
+                pila_visual = [h for hijos, i in marcos for h in reversed(hijos[i:])]
+                pila_visual.append(nodo_actual)
+                pasos.append({
+                    'paso': paso_num,
+                    'nodo_actual': nodo_actual,
+                    'pila': pila_visual,
+                    'visitados': visitados.copy(),
+                    'camino': list(camino),
+                    'en_camino': False
+                })
             
-            # Si llegamos a OTITIS
-            if nodo_actual == "OTITIS":
-                camino_a_otitis = camino
+            # Si llegamos a un diagnóstico (el primero que aparezca)
+            if nodo_actual in objetivos:
+                camino_a_otitis = list(camino)
                 break
             
-            # Explorar vecinos y agregarlos a la cola
-            vecinos = list(self.grafo.get(nodo_actual, []))
-            for vecino in vecinos:
-                if vecino not in visitados:
-                    visitados.add(vecino)
-                    nuevo_camino = camino + [vecino]
-                    cola.append((vecino, nuevo_camino))
+            # Marcar TODOS los hijos al expandir (igual que dfs al apilarlos)
+            hijos = [v for v in grafo.get(nodo_actual, []) if v not in visitados]
+            visitados.update(hijos)
+            marcos.append([hijos, 0])
+            
+            # Descender al siguiente hijo pendiente o retroceder
+            while marcos:
+                marco = marcos[-1]
+                if marco[1] < len(marco[0]):
+                    camino.append(marco[0][marco[1]])
+                    marco[1] += 1
+                    break
+                marcos.pop()
+                camino.pop()
         
         tiempo_ms = (time.time() - inicio) * 1000
         
-        # Determinar resultado
         if camino_a_otitis:
-            # Marcar nodos en el camino FINAL
             for paso in pasos:
                 if paso['nodo_actual'] in camino_a_otitis:
                     paso['en_camino'] = True
@@ -138,14 +930,13 @@ class AgenteOtitis:
             return {
                 'encontrado': True,
                 'tiene_otitis': True,
-                'probabilidad': 0.8,
+                'probabilidad': self._calcular_probabilidad([sintoma_inicial]),
                 'camino_final': camino_a_otitis,
                 'pasos': pasos,
                 'tiempo_ms': tiempo_ms,
                 'nodos_explorados': len(visitados)
             }
         else:
-            # NO llegó a OTITIS = Paciente SANO
             return {
                 'encontrado': False,
                 'tiene_otitis': False,
@@ -156,90 +947,377 @@ class AgenteOtitis:
                 'nodos_explorados': len(visitados)
             }
     
-    def dfs(self, sintoma_inicial):
+    def iddfs(self, sintoma_inicial, registrar_pasos=True, limite_maximo=None,
+              max_nodos=None, tiempo_limite=None, token=None, observadores=None):
         """
-        DFS - Búsqueda en profundidad desde UN síntoma inicial
-        Explora en profundidad usando pila (LIFO)
-        Retorna todos los pasos de la exploración
+        IDDFS - Búsqueda en profundidad iterativa (límite de profundidad creciente)
+        
+        Repite un DFS limitado a profundidad 0, 1, 2, ... Encuentra el MISMO
+        camino_final que `bfs` (el más corto) pero sólo guarda el camino
+        actual y los hijos pendientes: memoria O(profundidad · grado), sin la
+        cola de BFS ni el set de visitados (los ciclos se evitan mirando el
+        camino actual).
+        
+        Retorna además 'iteraciones': nodos expandidos con cada límite.
+        Con varios diagnósticos se detiene en el primero que alcanza, que es
+        el más cercano al síntoma inicial.
+        
+        Usa las distancias a los diagnósticos que el agente ya mantiene: si
+        el síntoma inicial no llega a ninguno retorna enseguida, y no baja
+        por hijos que no llegan dentro del límite restante. Así las regiones
+        con ciclos que no llevan a un diagnóstico no se enumeran camino por
+        camino, y el camino encontrado sigue siendo el mismo.
+        
+        `max_nodos` cuenta los nodos sacados de la pila en TODAS las
+        iteraciones; al cortar, 'frontera' es la pila de la iteración en curso.
+        
+        Los `observadores` (ver flujo_pasos.py) reciben cada paso de todas
+        las iteraciones y el resultado final; con observadores la traza se
+        arma aunque registrar_pasos sea False, pero no se retorna.
         """
+        observadores = normalizar_observadores(observadores)
         if not sintoma_inicial or sintoma_inicial not in self.grafo:
-            return self._resultado_vacio()
+            resultado = marcar_estado(self._resultado_vacio())
+            resultado['iteraciones'] = []
+            for observador in observadores:
+                observador.al_terminar(resultado)
+            return resultado
         
+        # Los observadores leen el último paso de la traza
+        trazar = registrar_pasos or bool(observadores)
+        
+        control = ControlBusqueda.crear(max_nodos, tiempo_limite, token)
+        motivo = None
+        pila_pendiente = []
+        
+        grafo = self.instantanea().grafo
+        objetivos = frozenset(self.objetivos)
+        distancias = self._distancias_objetivos()
         inicio = time.time()
-        pila = [(sintoma_inicial, [sintoma_inicial])]
-        visitados = {sintoma_inicial}
-        pasos = []
+        # Fotogramas cada k pasos + diferencias: memoria acotada y acceso aleatorio
+        pasos = IndiceTraza('pila')
         paso_num = 0
+        iteraciones = []
         camino_a_otitis = None
+        limite = 0
         
-        while pila:
-            # Guardar estado ANTES de desapilar (para mostrar todo incluyendo el TOPE)
-            paso_num += 1
-            pila_visual = [n for n, _ in pila]
-            nodo_actual, camino = pila[-1]  # Ver qué está en el TOPE sin sacarlo
-            
-            pasos.append({
-                'paso': paso_num,
-                'nodo_actual': nodo_actual,
-                'pila': pila_visual.copy(),
-                'visitados': visitados.copy(),
-                'camino': camino.copy(),
-                'en_camino': False
-            })
+        # Sin camino a ningún diagnóstico no hay nada que iterar
+        while (camino_a_otitis is None and sintoma_inicial in distancias
+               and (limite_maximo is None or limite <= limite_maximo)):
+            camino = [sintoma_inicial]
+            en_camino = {sintoma_inicial}
+            marcos = []  # [hijos, índice] por cada nodo expandido del camino
+            vistos = {sintoma_inicial}  # sólo para la traza
+            expandidos = 0
+            hubo_corte = False  # ¿algún nodo quedó sin expandir por el límite?
+            cambios = None  # diferencia con el paso anterior; el primero de cada iteración va completo
             
-            # Ahora sí desapilar del TOPE
-            pila.pop()
+            while camino:
+                if control is not None:
+                    motivo = control.detener(paso_num)
+                    if motivo:
+                        pila_pendiente = [h for hijos, i in marcos for h in reversed(hijos[i:])]
+                        pila_pendiente.append(camino[-1])
+                        break
+                
+                paso_num += 1
+                nodo_actual = camino[-1]
+                
+                if trazar:
+                    if cambios is None:
+                        pasos.agregar({
+                            'paso': paso_num,
+                            'nodo_actual': nodo_actual,
+                            'pila': [nodo_actual],
+                            'visitados': vistos,
+                            'camino': camino,
+                            'en_camino': False,
+                            'limite_profundidad': limite,
+                            'iteracion': len(iteraciones) + 1
+                        })
+                    else:
+                        pasos.agregar({
+                            'paso': paso_num,
+                            'nodo_actual': nodo_actual,
+                            'limite_profundidad': limite,
+                            'iteracion': len(iteraciones) + 1
+                        }, cambios)
+                    if observadores:
+                        paso = pasos.ultimo_paso()
+                        for observador in observadores:
+                            observador.al_paso(paso)
+                
+                if nodo_actual in objetivos:
+                    camino_a_otitis = list(camino)
+                    break
+                
+                hijos = []
+                nuevos = ()
+                # Saltos que le quedan a un hijo para llegar a un diagnóstico;
+                # sólo cuentan los hijos que llegan a alguno
+                restante = limite - len(camino)
+                utiles = [v for v in grafo.get(nodo_actual, [])
+                          if v not in en_camino and v in distancias]
+                if restante >= 0:
+                    expandidos += 1
+                    hijos = [v for v in utiles if distancias[v] <= restante]
+                    if trazar:
+                        nuevos = tuple(v for v in hijos if v not in vistos)
+                        vistos.update(nuevos)
+                if len(hijos) < len(utiles):
+                    hubo_corte = True
+                marcos.append([hijos, 0])
+                
+                # Descender o retroceder sobre el camino compartido
+                retrocesos = 0
+                while marcos:
+                    marco = marcos[-1]
+                    if marco[1] < len(marco[0]):
+                        siguiente = marco[0][marco[1]]
+                        marco[1] += 1
+                        camino.append(siguiente)
+                        en_camino.add(siguiente)
+                        break
+                    marcos.pop()
+                    en_camino.discard(camino.pop())
+                    retrocesos += 1
+                
+                # La pila visual es la de un DFS: sale el tope y entran los
+                # hijos en reversa. El camino retrocede y baja al siguiente
+                if trazar:
+                    cambios = ((0, 1, hijos[::-1]), nuevos, (), (0, retrocesos, camino[-1:]))
             
-            # Si llegamos a OTITIS
-            if nodo_actual == "OTITIS":
-                camino_a_otitis = camino
+            iteraciones.append({'limite': limite, 'nodos_expandidos': expandidos})
+            if motivo:
                 break
             
-            # Explorar vecinos (en reversa para mantener orden)
-            vecinos = list(self.grafo.get(nodo_actual, []))
-            for vecino in reversed(vecinos):
-                if vecino not in visitados:
-                    visitados.add(vecino)
-                    nuevo_camino = camino + [vecino]
-                    pila.append((vecino, nuevo_camino))
+            # Si nada quedó cortado por el límite, el grafo alcanzable ya se agotó
+            if not hubo_corte:
+                break
+            limite += 1
         
         tiempo_ms = (time.time() - inicio) * 1000
+        nodos_explorados = sum(it['nodos_expandidos'] for it in iteraciones)
+        if not registrar_pasos:
+            pasos = IndiceTraza('pila')
         
-        # Determinar resultado
         if camino_a_otitis:
-            # Marcar nodos en el camino FINAL
-            for paso in pasos:
-                if paso['nodo_actual'] in camino_a_otitis:
-                    paso['en_camino'] = True
+            pasos.finalizar([camino_a_otitis])
             
-            return {
+            resultado = marcar_estado({
                 'encontrado': True,
                 'tiene_otitis': True,
-                'probabilidad': 0.8,
+                'probabilidad': self._calcular_probabilidad([sintoma_inicial]),
                 'camino_final': camino_a_otitis,
                 'pasos': pasos,
                 'tiempo_ms': tiempo_ms,
-                'nodos_explorados': len(visitados)
-            }
+                'nodos_explorados': nodos_explorados,
+                'iteraciones': iteraciones
+            })
         else:
-            # NO llegó a OTITIS = Paciente SANO
-            return {
+            resultado = marcar_estado({
                 'encontrado': False,
                 'tiene_otitis': False,
                 'probabilidad': 0.0,
                 'camino_final': [],
                 'pasos': pasos,
                 'tiempo_ms': tiempo_ms,
-                'nodos_explorados': len(visitados)
-            }
+                'nodos_explorados': nodos_explorados,
+                'iteraciones': iteraciones
+            }, motivo, pila_pendiente)
+        for observador in observadores:
+            observador.al_terminar(resultado)
+        return resultado
     
-    def _calcular_probabilidad(self, sintomas):
-        """Calcula la probabilidad promedio de OTITIS basado en síntomas"""
+    # ========================================================================
+    # CAMINOS ALTERNATIVOS (explicabilidad)
+    # ========================================================================
+    
+    def _dag_caminos_minimos(self, grafo, sintoma_inicial):
+        """
+        Construye el DAG de caminos mínimos desde el síntoma inicial.
+        
+        Un BFS calcula la distancia de cada nodo al inicio; después se recorren
+        hacia atrás los predecesores de OTITIS para quedarse sólo con las aristas
+        que forman parte de ALGÚN camino mínimo.
+        
+        Retorna un dict nodo -> sucesores útiles (en el orden del grafo), o
+        None si OTITIS no es alcanzable.
+        """
+        distancia = {sintoma_inicial: 0}
+        predecesores = {sintoma_inicial: []}
+        cola = deque([sintoma_inicial])
+        
+        while cola:
+            nodo = cola.popleft()
+            if nodo == self.objetivo:
+                # Todo lo que queda en la cola está a la misma distancia o más lejos
+                continue
+            for vecino in grafo.get(nodo, []):
+                if vecino not in distancia:
+                    distancia[vecino] = distancia[nodo] + 1
+                    predecesores[vecino] = [nodo]
+                    cola.append(vecino)
+                elif distancia[vecino] == distancia[nodo] + 1:
+                    predecesores[vecino].append(nodo)
+        
+        if self.objetivo not in distancia:
+            return None
+        
+        # Marcar los nodos que están en algún camino mínimo hacia OTITIS
+        utiles = {self.objetivo}
+        pendientes = [self.objetivo]
+        while pendientes:
+            nodo = pendientes.pop()
+            for previo in predecesores[nodo]:
+                if previo not in utiles:
+                    utiles.add(previo)
+                    pendientes.append(previo)
+        
+        dag = {}
+        for nodo in utiles:
+            dag[nodo] = [v for v in grafo.get(nodo, [])
+                         if v in utiles and distancia[v] == distancia[nodo] + 1]
+        return dag
+    
+    def caminos_minimos(self, sintoma_inicial):
+        """
+        Genera PEREZOSAMENTE todos los caminos más cortos hasta OTITIS.
+        
+        Comparte un único DAG de caminos mínimos y lo recorre con una pila de
+        iteradores y un camino compartido, así que cada camino cuesta O(longitud)
+        aunque el número total de caminos sea exponencial. El primer camino
+        generado coincide con el `camino_final` de `bfs`.
+        """
+        if not sintoma_inicial or sintoma_inicial not in self.grafo:
+            return iter(())
+        return self._generar_caminos_minimos(self.instantanea().grafo, sintoma_inicial)
+    
+    def _generar_caminos_minimos(self, grafo, sintoma_inicial):
+        """Recorrido del DAG de caminos mínimos sobre una instantánea del grafo"""
+        dag = self._dag_caminos_minimos(grafo, sintoma_inicial)
+        if dag is None:
+            return
+        
+        camino = [sintoma_inicial]
+        pila = [iter(dag[sintoma_inicial])]
+        if sintoma_inicial == self.objetivo:
+            yield list(camino)
+            return
+        
+        while pila:
+            siguiente = next(pila[-1], None)
+            if siguiente is None:
+                pila.pop()
+                camino.pop()
+                continue
+            camino.append(siguiente)
+            if siguiente == self.objetivo:
+                yield list(camino)
+                camino.pop()
+            else:
+                pila.append(iter(dag[siguiente]))
+    
+    def _camino_mas_corto_restringido(self, grafo, inicio, nodos_prohibidos, aristas_prohibidas):
+        """BFS hasta OTITIS ignorando los nodos y aristas prohibidos (usado por Yen)"""
+        padres = {inicio: None}
+        cola = deque([inicio])
+        
+        while cola:
+            nodo = cola.popleft()
+            if nodo == self.objetivo:
+                camino = []
+                while nodo is not None:
+                    camino.append(nodo)
+                    nodo = padres[nodo]
+                return camino[::-1]
+            for vecino in grafo.get(nodo, []):
+                if (vecino not in padres and vecino not in nodos_prohibidos
+                        and (nodo, vecino) not in aristas_prohibidas):
+                    padres[vecino] = nodo
+                    cola.append(vecino)
+        return None
+    
+    def iterar_caminos(self, sintoma_inicial):
+        """
+        Genera caminos simples hasta OTITIS en orden de longitud creciente.
+        
+        Primero agota los caminos mínimos del DAG compartido (sin ningún BFS
+        extra) y sólo si se piden más continúa con el algoritmo de Yen,
+        calculando los caminos de desvío bajo demanda.
+        """
+        if not sintoma_inicial or sintoma_inicial not in self.grafo:
+            return
+        grafo = self.instantanea().grafo
+        
+        encontrados = []
+        for camino in self._generar_caminos_minimos(grafo, sintoma_inicial):
+            encontrados.append(camino)
+            yield camino
+        
+        if not encontrados:
+            return
+        
+        # Yen: candidatos (longitud, camino) en un heap, sin duplicados
+        candidatos = []
+        vistos = {tuple(c) for c in encontrados}
+        procesados = 0
+        
+        while True:
+            # Generar desvíos de los caminos aceptados que aún no se procesaron
+            while procesados < len(encontrados):
+                base = encontrados[procesados]
+                procesados += 1
+                for i in range(len(base) - 1):
+                    raiz = base[:i + 1]
+                    desvio = base[i]
+                    aristas_prohibidas = {
+                        (c[i], c[i + 1]) for c in encontrados
+                        if len(c) > i + 1 and c[:i + 1] == raiz
+                    }
+                    nodos_prohibidos = set(raiz[:-1])
+                    resto = self._camino_mas_corto_restringido(
+                        grafo, desvio, nodos_prohibidos, aristas_prohibidas)
+                    if resto is None:
+                        continue
+                    candidato = raiz[:-1] + resto
+                    clave = tuple(candidato)
+                    if clave not in vistos:
+                        vistos.add(clave)
+                        heapq.heappush(candidatos, (len(candidato), candidato))
+            
+            if not candidatos:
+                return
+            _, camino = heapq.heappop(candidatos)
+            encontrados.append(camino)
+            yield camino
+    
+    def k_caminos_mas_cortos(self, sintoma_inicial, k=3):
+        """Retorna hasta k caminos simples hasta OTITIS, del más corto al más largo"""
+        caminos = []
+        for camino in self.iterar_caminos(sintoma_inicial):
+            caminos.append(camino)
+            if len(caminos) >= k:
+                break
+        return caminos
+    
+    def motor_probabilistico(self, prior=0.0):
+        """Motor noisy-OR del grafo actual (se reconstruye si el grafo cambia)"""
+        return self._derivado(
+            ('motor', prior),
+            lambda: MotorProbabilistico(self.grafo, self.pesos, self.objetivo, prior)
+        )
+    
+    def puntuar_pacientes(self, pacientes, prior=0.0):
+        """Probabilidad de OTITIS para un lote [(presentes, negados), ...] (vectorizado)"""
+        motor = self.motor_probabilistico(prior)
+        return motor.probabilidad_lote(motor.matriz_evidencia(pacientes))
+    
+    def _calcular_probabilidad(self, sintomas, negados=()):
+        """Probabilidad de OTITIS dados los síntomas presentes y los negados"""
         if not sintomas:
             return 0.0
-        
-        total = sum(self.pesos.get(s, 0) for s in sintomas)
-        return min(1.0, total / len(sintomas))
+        return self.motor_probabilistico().probabilidad(sintomas, negados)
     
     def _resultado_vacio(self):
         """Resultado cuando no hay síntomas"""
@@ -260,4 +1338,6 @@ class AgenteOtitis:
     def formatear_nombre(self, nombre):
         if nombre in ["OTITIS", "SANO"]:
             return nombre
+        if nombre in self.objetivos:
+            return nombre.replace("_", " ")
         return nombre.replace("_", " ").title()
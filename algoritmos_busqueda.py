@@ -12,7 +12,9 @@ Universidad de las Fuerzas Armadas ESPE
 """
 
 from collections import deque
-from typing import Dict, List, Set, Tuple, Optional
+from typing import Dict, Iterable, List, Set, Tuple, Optional, Union
+
+from control_busqueda import ControlBusqueda, TokenCancelacion, marcar_estado
 
 
 class AlgoritmosBusqueda:
@@ -22,24 +24,59 @@ class AlgoritmosBusqueda:
     Attributes:
         grafo: Diccionario que representa el grafo de síntomas
         objetivo: Nodo objetivo a encontrar (enfermedad a diagnosticar)
+        objetivos: Conjunto de diagnósticos buscados en un solo recorrido
     """
     
-    def __init__(self, grafo: Dict[str, List[str]], objetivo: str = "OTITIS"):
+    def __init__(self, grafo: Dict[str, List[str]],
+                 objetivo: Union[str, Iterable[str]] = "OTITIS"):
         """
         Inicializa el motor de búsqueda.
         
         Args:
             grafo: Grafo dirigido representando relaciones síntoma-enfermedad
-            objetivo: Nodo objetivo a diagnosticar (default: "OTITIS")
+            objetivo: Nodo objetivo a diagnosticar (default: "OTITIS"), o
+                una lista/tupla/conjunto de diagnósticos. Con varios, cada
+                búsqueda sigue hasta alcanzarlos todos (o agotar el grafo) y
+                reporta en 'objetivos_alcanzados' cuáles alcanzó y en qué orden
         """
         self.grafo = grafo
         self.objetivo = objetivo
+        if isinstance(objetivo, (list, tuple, set, frozenset)):
+            self.objetivos = tuple(objetivo)
+        else:
+            self.objetivos = (objetivo,)
+    
+    def _resultado(self, algoritmo: str, pasos: List[Dict], visitados: Set,
+                   alcanzados: List[Dict], motivo: Optional[str] = None,
+                   frontera: Iterable[str] = ()) -> Dict:
+        """
+        Arma el resultado de una búsqueda. El camino_final es el del PRIMER
+        objetivo alcanzado; 'objetivos_alcanzados' los lista a todos en el
+        orden en que se alcanzaron: [{'objetivo', 'camino', 'paso'}, ...]
+        
+        'estado' es 'completo', o 'inconcluso' si la búsqueda se cortó por
+        `motivo` (ver control_busqueda.py); entonces 'frontera' tiene los
+        nodos que quedaron sin explorar.
+        """
+        camino_final = alcanzados[0]['camino'] if alcanzados else []
+        return marcar_estado({
+            'encontrado': bool(alcanzados),
+            'pasos': pasos,
+            'camino_final': camino_final,
+            'nodos_visitados': len(visitados),
+            'longitud_camino': len(camino_final),
+            'algoritmo': algoritmo,
+            'objetivos_alcanzados': alcanzados
+        }, motivo, frontera)
     
     # ========================================================================
     # BÚSQUEDA EN AMPLITUD (BFS - Breadth-First Search)
     # ========================================================================
     
-    def busqueda_amplitud(self, nodo_inicial: str) -> Dict:
+    def busqueda_amplitud(self, nodo_inicial: str, registrar_pasos: bool = True,
+                          max_nodos: Optional[int] = None,
+                          tiempo_limite: Optional[float] = None,
+                          token: Optional[TokenCancelacion] = None) -> Dict:
         """
         Implementa el algoritmo de Búsqueda en Amplitud (BFS).
         
@@ -54,6 +91,10 @@ class AlgoritmosBusqueda:
         
         Args:
             nodo_inicial: Síntoma inicial del paciente
+            registrar_pasos: Si es False no se guarda la traza de pasos
+            max_nodos: Máximo de nodos a expandir (None = sin límite)
+            tiempo_limite: Segundos disponibles (None = sin límite)
+            token: TokenCancelacion para detenerla desde otro hilo
             
         Returns:
             Dict con:
@@ -61,6 +102,8 @@ class AlgoritmosBusqueda:
                 - pasos (List[Dict]): Lista de pasos del proceso
                 - camino_final (List[str]): Camino desde inicio hasta objetivo
                 - nodos_visitados (int): Total de nodos explorados
+                - objetivos_alcanzados (List[Dict]): Objetivos alcanzados, en orden
+                - estado (str): 'completo' o 'inconcluso' (con 'motivo' y 'frontera')
         """
         
         # ====================================================================
@@ -83,12 +126,26 @@ class AlgoritmosBusqueda:
         # Contador de pasos para tracking
         numero_paso = 0
         
+        # Objetivos que faltan por alcanzar y los ya alcanzados (en orden)
+        pendientes = set(self.objetivos)
+        alcanzados = []
+        
+        # Límites opcionales (presupuesto de nodos, tiempo, cancelación)
+        control = ControlBusqueda.crear(max_nodos, tiempo_limite, token)
+        
         # ====================================================================
         # BUCLE PRINCIPAL DE BFS
         # ====================================================================
         
         while cola:  # Mientras haya nodos por explorar
             
+            # Si se agotó algún límite: resultado parcial con la cola pendiente
+            if control is not None:
+                motivo = control.detener(numero_paso)
+                if motivo:
+                    return self._resultado('BFS', pasos, visitados, alcanzados,
+                                           motivo, [nodo for nodo, _ in cola])
+            
             numero_paso += 1
             
             # Extraer el PRIMERO de la cola (FIFO)
@@ -96,29 +153,28 @@ class AlgoritmosBusqueda:
             nodo_actual, camino_actual = cola.popleft()
             
             # Guardar estado actual para visualización
-            pasos.append({
-                'paso': numero_paso,
-                'nodo_actual': nodo_actual,
-                'camino': camino_actual.copy(),
-                'visitados': visitados.copy(),
-                'cola': list(cola),  # Snapshot de la cola actual
-                'accion': f'Explorando: {nodo_actual}'
-            })
+            if registrar_pasos:
+                pasos.append({
+                    'paso': numero_paso,
+                    'nodo_actual': nodo_actual,
+                    'camino': camino_actual.copy(),
+                    'visitados': visitados.copy(),
+                    'cola': list(cola),  # Snapshot de la cola actual
+                    'accion': f'Explorando: {nodo_actual}'
+                })
             
             # ================================================================
             # VERIFICACIÓN DE OBJETIVO
             # ================================================================
             
-            # ¿Hemos llegado al nodo objetivo (OTITIS)?
-            if nodo_actual == self.objetivo:
-                return {
-                    'encontrado': True,
-                    'pasos': pasos,
-                    'camino_final': camino_actual,
-                    'nodos_visitados': len(visitados),
-                    'longitud_camino': len(camino_actual),
-                    'algoritmo': 'BFS'
-                }
+            # ¿Hemos llegado a un nodo objetivo (OTITIS)?
+            if nodo_actual in pendientes:
+                pendientes.discard(nodo_actual)
+                alcanzados.append({'objetivo': nodo_actual, 'camino': camino_actual,
+                                   'paso': numero_paso})
+                # Con todos los objetivos alcanzados no hace falta seguir
+                if not pendientes:
+                    return self._resultado('BFS', pasos, visitados, alcanzados)
             
             # ================================================================
             # EXPANSIÓN DE VECINOS
@@ -149,21 +205,17 @@ class AlgoritmosBusqueda:
         # NO SE ENCONTRÓ EL OBJETIVO
         # ====================================================================
         
-        # Si salimos del bucle sin encontrar el objetivo
-        return {
-            'encontrado': False,
-            'pasos': pasos,
-            'camino_final': [],
-            'nodos_visitados': len(visitados),
-            'longitud_camino': 0,
-            'algoritmo': 'BFS'
-        }
+        # Si salimos del bucle sin encontrar todos los objetivos
+        return self._resultado('BFS', pasos, visitados, alcanzados)
     
     # ========================================================================
     # BÚSQUEDA EN PROFUNDIDAD (DFS - Depth-First Search)
     # ========================================================================
     
-    def busqueda_profundidad(self, nodo_inicial: str) -> Dict:
+    def busqueda_profundidad(self, nodo_inicial: str, registrar_pasos: bool = True,
+                             max_nodos: Optional[int] = None,
+                             tiempo_limite: Optional[float] = None,
+                             token: Optional[TokenCancelacion] = None) -> Dict:
         """
         Implementa el algoritmo de Búsqueda en Profundidad (DFS).
         
@@ -177,6 +229,10 @@ class AlgoritmosBusqueda:
         
         Args:
             nodo_inicial: Síntoma inicial del paciente
+            registrar_pasos: Si es False no se guarda la traza de pasos
+            max_nodos: Máximo de nodos a expandir (None = sin límite)
+            tiempo_limite: Segundos disponibles (None = sin límite)
+            token: TokenCancelacion para detenerla desde otro hilo
             
         Returns:
             Dict con:
@@ -184,6 +240,8 @@ class AlgoritmosBusqueda:
                 - pasos (List[Dict]): Lista de pasos del proceso
                 - camino_final (List[str]): Camino desde inicio hasta objetivo
                 - nodos_visitados (int): Total de nodos explorados
+                - objetivos_alcanzados (List[Dict]): Objetivos alcanzados, en orden
+                - estado (str): 'completo' o 'inconcluso' (con 'motivo' y 'frontera')
         """
         
         # ====================================================================
@@ -205,12 +263,26 @@ class AlgoritmosBusqueda:
         # Contador de pasos
         numero_paso = 0
         
+        # Objetivos que faltan por alcanzar y los ya alcanzados (en orden)
+        pendientes = set(self.objetivos)
+        alcanzados = []
+        
+        # Límites opcionales (presupuesto de nodos, tiempo, cancelación)
+        control = ControlBusqueda.crear(max_nodos, tiempo_limite, token)
+        
         # ====================================================================
         # BUCLE PRINCIPAL DE DFS
         # ====================================================================
         
         while pila:  # Mientras haya nodos por explorar
             
+            # Si se agotó algún límite: resultado parcial con la pila pendiente
+            if control is not None:
+                motivo = control.detener(numero_paso)
+                if motivo:
+                    return self._resultado('DFS', pasos, visitados, alcanzados,
+                                           motivo, [nodo for nodo, _ in pila])
+            
             numero_paso += 1
             
             # Extraer el ÚLTIMO de la pila (LIFO)
@@ -218,29 +290,27 @@ class AlgoritmosBusqueda:
             nodo_actual, camino_actual = pila.pop()
             
             # Guardar estado actual para visualización
-            pasos.append({
-                'paso': numero_paso,
-                'nodo_actual': nodo_actual,
-                'camino': camino_actual.copy(),
-                'visitados': visitados.copy(),
-                'pila': list(pila),  # Snapshot de la pila actual
-                'accion': f'Explorando: {nodo_actual}'
-            })
+            if registrar_pasos:
+                pasos.append({
+                    'paso': numero_paso,
+                    'nodo_actual': nodo_actual,
+                    'camino': camino_actual.copy(),
+                    'visitados': visitados.copy(),
+                    'pila': list(pila),  # Snapshot de la pila actual
+                    'accion': f'Explorando: {nodo_actual}'
+                })
             
             # ================================================================
             # VERIFICACIÓN DE OBJETIVO
             # ================================================================
             
-            # ¿Hemos llegado al nodo objetivo (OTITIS)?
-            if nodo_actual == self.objetivo:
-                return {
-                    'encontrado': True,
-                    'pasos': pasos,
-                    'camino_final': camino_actual,
-                    'nodos_visitados': len(visitados),
-                    'longitud_camino': len(camino_actual),
-                    'algoritmo': 'DFS'
-                }
+            # ¿Hemos llegado a un nodo objetivo (OTITIS)?
+            if nodo_actual in pendientes:
+                pendientes.discard(nodo_actual)
+                alcanzados.append({'objetivo': nodo_actual, 'camino': camino_actual,
+                                   'paso': numero_paso})
+                if not pendientes:
+                    return self._resultado('DFS', pasos, visitados, alcanzados)
             
             # ================================================================
             # EXPANSIÓN DE VECINOS
@@ -268,17 +338,247 @@ class AlgoritmosBusqueda:
                     pila.append((vecino, nuevo_camino))
         
         # ====================================================================
-        # NO SE ENCONTRÓ EL OBJETIVO
+        # NO SE ENCONTRARON TODOS LOS OBJETIVOS
         # ====================================================================
         
+        return self._resultado('DFS', pasos, visitados, alcanzados)
+
+
+    # ========================================================================
+    # DFS ITERATIVO CON CAMINO COMPARTIDO
+    # ========================================================================
+    
+    def busqueda_profundidad_iterativa(self, nodo_inicial: str,
+                                       registrar_pasos: bool = True,
+                                       max_nodos: Optional[int] = None,
+                                       tiempo_limite: Optional[float] = None,
+                                       token: Optional[TokenCancelacion] = None) -> Dict:
+        """
+        DFS iterativo con una pila de iteradores y UN SOLO camino compartido.
+        
+        `busqueda_profundidad` apila (vecino, camino + [vecino]) por cada
+        vecino: cada entrada de la pila lleva su propia copia del camino, así
+        que la memoria crece como O(V·profundidad) y construir los caminos es
+        cuadrático en cadenas profundas.
+        
+        Esta versión mantiene:
+        - camino: una única lista (append al descender, pop al retroceder)
+        - marcos: por cada nodo del camino, sus hijos pendientes y un índice
+        
+        Visita los nodos en el MISMO orden y devuelve el MISMO camino_final
+        que `busqueda_profundidad`; la memoria del camino es O(profundidad).
+        
+        Args:
+            nodo_inicial: Síntoma inicial del paciente
+            registrar_pasos: Si es False no se guarda la traza de pasos
+            max_nodos: Máximo de nodos a expandir (None = sin límite)
+            tiempo_limite: Segundos disponibles (None = sin límite)
+            token: TokenCancelacion para detenerla desde otro hilo
+            
+        Returns:
+            Dict con el mismo formato que `busqueda_profundidad` (la 'pila' de
+            cada paso contiene sólo nombres de nodos, sin caminos)
+        """
+        
+        # Camino compartido y pila de marcos [hijos, índice del próximo hijo]
+        camino = [nodo_inicial]
+        marcos: List[List] = []
+        
+        # Set de nodos visitados: se marcan al descubrirlos, como en DFS
+        visitados = {nodo_inicial}
+        
+        pasos = []
+        numero_paso = 0
+        pendientes = set(self.objetivos)
+        alcanzados = []
+        control = ControlBusqueda.crear(max_nodos, tiempo_limite, token)
+        
+        while camino:  # Mientras quede algún nodo en el camino
+            
+            if control is not None:
+                motivo = control.detener(numero_paso)
+                if motivo:
+                    pila_pendiente = [h for hijos, i in marcos for h in reversed(hijos[i:])]
+                    pila_pendiente.append(camino[-1])
+                    return self._resultado('DFS', pasos, visitados, alcanzados,
+                                           motivo, pila_pendiente)
+            
+            numero_paso += 1
+            nodo_actual = camino[-1]
+            
+            if registrar_pasos:
+                # Pila equivalente (sin el nodo actual): hijos pendientes
+                # de cada marco, el último en salir abajo
+                pila_visual = [h for hijos, i in marcos for h in reversed(hijos[i:])]
+                pasos.append({
+                    'paso': numero_paso,
+                    'nodo_actual': nodo_actual,
+                    'camino': list(camino),
+                    'visitados': visitados.copy(),
+                    'pila': pila_visual,
+                    'accion': f'Explorando: {nodo_actual}'
+                })
+            
+            # ¿Hemos llegado a un nodo objetivo?
+            if nodo_actual in pendientes:
+                pendientes.discard(nodo_actual)
+                alcanzados.append({'objetivo': nodo_actual, 'camino': list(camino),
+                                   'paso': numero_paso})
+                if not pendientes:
+                    return self._resultado('DFS', pasos, visitados, alcanzados)
+            
+            # Marcar TODOS los hijos no visitados al expandir (equivale a
+            # marcarlos al apilarlos en la versión clásica)
+            hijos = [v for v in self.grafo.get(nodo_actual, []) if v not in visitados]
+            visitados.update(hijos)
+            marcos.append([hijos, 0])
+            
+            # Descender al siguiente hijo pendiente, o retroceder (pop) si
+            # el marco del tope ya no tiene hijos
+            while marcos:
+                marco = marcos[-1]
+                if marco[1] < len(marco[0]):
+                    camino.append(marco[0][marco[1]])
+                    marco[1] += 1
+                    break
+                marcos.pop()
+                camino.pop()
+        
+        return self._resultado('DFS', pasos, visitados, alcanzados)
+
+    # ========================================================================
+    # BARRIDO: TODOS LOS SÍNTOMAS INICIALES DE UNA VEZ
+    # ========================================================================
+    
+    def barrido(self) -> Dict:
+        """
+        Resultado de BFS para CADA síntoma inicial en O(V + E) total, en vez
+        de una búsqueda por síntoma.
+        
+        Un único BFS INVERSO desde los objetivos da la distancia de cada nodo
+        al objetivo más cercano. El camino de BFS desde x es el primero (en
+        el orden de las listas de vecinos) entre los más cortos, así que
+        basta con ir siempre al PRIMER vecino que está un salto más cerca:
+        'siguiente_bfs'. Es el mismo camino_final que `busqueda_amplitud`
+        para todo x.
+        
+        DFS no entra en el barrido: `busqueda_profundidad` marca los nodos al
+        APILARLOS, así que la rama que sigue un hijo depende de lo que ese
+        inicio ya apiló (con s → [x, y] e y → [x], desde s la rama de y no
+        puede volver a x; desde y sí). No hay una DP por nodo que lo
+        reproduzca. Tampoco los nodos explorados, que dependen del orden de
+        visita de cada inicio. Para ambos está `tabla_comparativa(ejecutar=True)`.
+        
+        Returns:
+            Dict con:
+                - longitud_bfs (Dict): nodos del camino de cada inicio (como
+                  'longitud_camino'); sólo los que llegan
+                - siguiente_bfs (Dict): próximo nodo del camino
+                - objetivo_bfs (Dict): objetivo al que llega el camino
+        """
+        
+        # Todos los nodos, incluidos los que sólo aparecen como vecinos
+        nodos = list(self.grafo)
+        conocidos = set(nodos)
+        for vecinos in self.grafo.values():
+            for vecino in vecinos:
+                if vecino not in conocidos:
+                    conocidos.add(vecino)
+                    nodos.append(vecino)
+        
+        # ====================================================================
+        # BFS INVERSO MULTI-FUENTE DESDE LOS OBJETIVOS
+        # ====================================================================
+        
+        inversos: Dict = {nodo: [] for nodo in nodos}
+        for nodo, vecinos in self.grafo.items():
+            for vecino in vecinos:
+                inversos[vecino].append(nodo)
+        
+        # La cola es una lista que sólo crece: al terminar queda con todos
+        # los nodos alcanzados en orden de distancia
+        distancia: Dict = {}
+        objetivo_bfs: Dict = {}
+        cola = []
+        for objetivo in self.objetivos:
+            if objetivo in inversos and objetivo not in distancia:
+                distancia[objetivo] = 0
+                objetivo_bfs[objetivo] = objetivo
+                cola.append(objetivo)
+        for nodo in cola:
+            for previo in inversos[nodo]:
+                if previo not in distancia:
+                    distancia[previo] = distancia[nodo] + 1
+                    cola.append(previo)
+        
+        # Primer vecino un salto más cerca: el camino que elegiría BFS.
+        # En orden de distancia, así el objetivo del siguiente ya está
+        siguiente_bfs: Dict = {}
+        for nodo in cola:
+            if distancia[nodo] == 0:
+                continue
+            for vecino in self.grafo[nodo]:
+                if distancia.get(vecino) == distancia[nodo] - 1:
+                    siguiente_bfs[nodo] = vecino
+                    objetivo_bfs[nodo] = objetivo_bfs[vecino]
+                    break
+        longitud_bfs = {nodo: d + 1 for nodo, d in distancia.items()}
+        
         return {
-            'encontrado': False,
-            'pasos': pasos,
-            'camino_final': [],
-            'nodos_visitados': len(visitados),
-            'longitud_camino': 0,
-            'algoritmo': 'DFS'
+            'longitud_bfs': longitud_bfs,
+            'siguiente_bfs': siguiente_bfs,
+            'objetivo_bfs': objetivo_bfs
         }
+    
+    @staticmethod
+    def camino_barrido(siguiente: Dict, nodo_inicial) -> List:
+        """Camino desde nodo_inicial siguiendo el 'siguiente_bfs' de un barrido"""
+        camino = [nodo_inicial]
+        while camino[-1] in siguiente:
+            camino.append(siguiente[camino[-1]])
+        return camino
+    
+    def tabla_comparativa(self, barrido: Optional[Dict] = None,
+                          nodos: Optional[Iterable] = None,
+                          ejecutar: bool = False) -> str:
+        """
+        Tabla de texto con BFS vs DFS para todos los síntomas iniciales
+        (o los `nodos` dados): longitud de cada camino, cuántos nodos más
+        recorre el de DFS y cuántos nodos explora cada búsqueda.
+        
+        La columna BFS sale del barrido. DFS, Extra y los nodos explorados
+        no (ver `barrido`): con ejecutar=True se corren `busqueda_amplitud`
+        y `busqueda_profundidad` sin traza desde cada inicio; si no, quedan
+        en 'n/a' y la tabla lo explica al pie.
+        """
+        if barrido is None:
+            barrido = self.barrido()
+        longitud_bfs = barrido['longitud_bfs']
+        if nodos is None:
+            nodos = sorted((n for n in barrido['siguiente_bfs']), key=str)
+        
+        lineas = [f"{'Síntoma inicial':<24} | {'Objetivo':<16} | {'BFS':>4} | {'DFS':>4} | "
+                  f"{'Extra':>5} | {'Nodos BFS':>9} | {'Nodos DFS':>9}",
+                  "-" * 90]
+        for nodo in nodos:
+            objetivo = barrido['objetivo_bfs'].get(nodo, '(no llega)')
+            bfs = longitud_bfs.get(nodo, '-')
+            if ejecutar:
+                resultado_bfs = self.busqueda_amplitud(nodo, registrar_pasos=False)
+                resultado_dfs = self.busqueda_profundidad(nodo, registrar_pasos=False)
+                dfs = resultado_dfs['longitud_camino'] if resultado_dfs['encontrado'] else '-'
+                extra = dfs - bfs if resultado_dfs['encontrado'] and nodo in longitud_bfs else '-'
+                nodos_bfs = resultado_bfs['nodos_visitados']
+                nodos_dfs = resultado_dfs['nodos_visitados']
+            else:
+                dfs = extra = nodos_bfs = nodos_dfs = 'n/a'
+            lineas.append(f"{str(nodo):<24} | {str(objetivo):<16} | {bfs:>4} | {dfs:>4} | "
+                          f"{extra:>5} | {nodos_bfs:>9} | {nodos_dfs:>9}")
+        if not ejecutar:
+            lineas.append("")
+            lineas.append("n/a: DFS y los nodos explorados dependen del orden de visita de "
+                          "cada inicio y necesitan una búsqueda por síntoma (ejecutar=True)")
+        return "\n".join(lineas)
 
 
 # ============================================================================
@@ -349,6 +649,72 @@ def ejemplo_uso():
         print("\n✅ BFS encontró un camino más corto o igual")
     else:
         print("\n⚠️ DFS encontró un camino más corto (poco común)")
+    
+    print("\n" + "="*70)
+    print("BARRIDO: TODOS LOS SÍNTOMAS INICIALES")
+    print("="*70 + "\n")
+    
+    # BFS de todos los síntomas con un BFS inverso; DFS y nodos explorados
+    # necesitan una búsqueda por síntoma (ejecutar=True)
+    print(motor.tabla_comparativa(nodos=[n for n in grafo_otitis if n != "OTITIS"],
+                                  ejecutar=True))
+
+
+# ============================================================================
+# BENCHMARK DE MEMORIA: DFS CLÁSICO vs DFS ITERATIVO
+# ============================================================================
+
+def _grafo_peine(n: int) -> Dict[int, List[int]]:
+    """
+    Cadena de n nodos donde cada eslabón tiene además una hoja:
+        i → [i+1, hoja_i]   ...   n-1 → [objetivo]
+    El DFS clásico deja en la pila todas las hojas, cada una con una copia
+    del camino hasta ella: memoria O(n²). Los nodos son enteros (hojas
+    negativas) y el objetivo es -n-1, para que el grafo ocupe poco.
+    """
+    grafo = {i: [i + 1, -(i + 1)] for i in range(n - 1)}
+    grafo[n - 1] = [-(n + 1)]
+    return grafo
+
+
+def benchmark_memoria_dfs(n_grande: int = 10**6,
+                          tamanos_clasico: Tuple[int, ...] = (1000, 2000, 4000)):
+    """
+    Compara la memoria pico (tracemalloc) de ambos DFS sin registrar pasos.
+    
+    El DFS clásico es cuadrático en memoria y tiempo, así que sólo se mide
+    en cadenas pequeñas; el iterativo se mide también con n_grande nodos.
+    """
+    import time
+    import tracemalloc
+    
+    def medir(metodo):
+        tracemalloc.start()
+        inicio = time.perf_counter()
+        resultado = metodo(0, registrar_pasos=False)
+        segundos = time.perf_counter() - inicio
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert resultado['encontrado']
+        return pico / 2**20, segundos
+    
+    print("=" * 70)
+    print("BENCHMARK DE MEMORIA DFS (cadena con hojas, sin traza)")
+    print("=" * 70)
+    print(f"{'Eslabones':>10} | {'Clásico MiB':>12} | {'Iterativo MiB':>14} | "
+          f"{'Clásico s':>10} | {'Iterativo s':>11}")
+    
+    for n in tamanos_clasico:
+        grafo = _grafo_peine(n)
+        motor = AlgoritmosBusqueda(grafo, objetivo=-(n + 1))
+        mem_c, t_c = medir(motor.busqueda_profundidad)
+        mem_i, t_i = medir(motor.busqueda_profundidad_iterativa)
+        print(f"{n:>10} | {mem_c:>12.2f} | {mem_i:>14.2f} | {t_c:>10.3f} | {t_i:>11.3f}")
+    
+    grafo = _grafo_peine(n_grande)
+    motor = AlgoritmosBusqueda(grafo, objetivo=-(n_grande + 1))
+    mem_i, t_i = medir(motor.busqueda_profundidad_iterativa)
+    print(f"{n_grande:>10} | {'(inviable)':>12} | {mem_i:>14.2f} | {'-':>10} | {t_i:>11.3f}")
 
 
 # ============================================================================
@@ -419,5 +785,11 @@ PARA DIAGNÓSTICO MÉDICO:
 
 
 if __name__ == "__main__":
-    # Ejecutar ejemplo
-    ejemplo_uso()
+    import sys
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        # python algoritmos_busqueda.py benchmark
+        benchmark_memoria_dfs()
+    else:
+        # Ejecutar ejemplo
+        ejemplo_uso()
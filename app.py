@@ -3,15 +3,30 @@ Interfaz Gráfica Mejorada - Diagnóstico de Otitis
 Muestra el proceso completo de BFS y DFS paso a paso
 """
 
+import threading
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 from agente_otitis import AgenteOtitis
-import matplotlib.pyplot as plt
+from politica_preguntas import PoliticaPreguntas
+from sesion_interactiva import SesionInteractiva
+from registro_sesiones import RegistroSesiones
+from flujo_pasos import MetricasPasos
+from control_busqueda import TokenCancelacion, INCONCLUSO
+from render_grafo import RenderizadorGrafo, layout_por_niveles
+from panel_estructura import PanelEstructura
+from selector_sintomas import SelectorSintomas
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.colors import to_rgba
 import networkx as nx
+import numpy as np
 
 class App:
     
+    # Número de caminos alternativos superpuestos y sus colores
+    MAX_CAMINOS_ALTERNATIVOS = 3
+    COLORES_ALTERNATIVOS = ['#8e44ad', '#d35400', '#2980b9']
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Diagnóstico de Otitis - BFS y DFS Paso a Paso")
@@ -22,6 +37,29 @@ class App:
         self.sintoma_seleccionado = tk.StringVar(value="")  # Para radio buttons
         self.resultado = None
         self.paso_actual = 0
+        self.caminos_alternativos = []  # Caminos extra superpuestos en el grafo
+        
+        # Posiciones de dibujo: se amplían al agregar síntomas, nunca se recalculan
+        self._posiciones = self._layout_jerarquico()
+        self._version_layout = -1
+        
+        # Sesión del modo interactivo (SesionInteractiva) o None
+        self.estado_interactivo = None
+        self.id_sesion_interactiva = None
+        
+        # Búsqueda automática en curso: (hilo, MetricasPasos, TokenCancelacion,
+        # salida, método, síntoma) o None
+        self._busqueda_en_curso = None
+        
+        # Log de las respuestas interactivas (para reproducir sesiones)
+        self.registro_sesiones = RegistroSesiones()
+        self.root.protocol("WM_DELETE_WINDOW", self._cerrar)
+        
+        # Figura del grafo: se construye una vez y cada paso sólo recolorea nodos
+        self._figura = None
+        self._clave_figura = None
+        self._renderizador = None  # RenderizadorGrafo en grafos grandes
+        self._layout_grande = None  # (versión, posiciones por niveles)
         
         self._crear_interfaz()
     
@@ -62,7 +100,7 @@ class App:
         
         tk.Label(
             panel_superior,
-            text="Seleccione UN síntoma inicial:",
+            text="Busque y seleccione UN síntoma inicial:",
             font=("Arial", 9, "italic"),
             bg="#ecf0f1",
             fg="#34495e",
@@ -70,44 +108,17 @@ class App:
         ).pack(fill=tk.X)
         
         # Frame principal que contiene síntomas Y botones lado a lado
-        frame_principal_horizontal = tk.Frame(panel_superior, bg="white", height=210)  # Altura aumentada para ver todos los botones
+        frame_principal_horizontal = tk.Frame(panel_superior, bg="white", height=260)  # Altura aumentada para ver todos los botones
         frame_principal_horizontal.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         frame_principal_horizontal.pack_propagate(False)  # Mantener altura fija
         
-        # IZQUIERDA: Frame para síntomas en DOS COLUMNAS
-        frame_sintomas_container = tk.Frame(frame_principal_horizontal, bg="white")
-        frame_sintomas_container.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
-        
-        # Columna izquierda de síntomas
-        frame_col_izq = tk.Frame(frame_sintomas_container, bg="white")
-        frame_col_izq.grid(row=0, column=0, sticky="nsew", padx=(0, 5))
-        
-        # Columna derecha de síntomas
-        frame_col_der = tk.Frame(frame_sintomas_container, bg="white")
-        frame_col_der.grid(row=0, column=1, sticky="nsew", padx=(5, 0))
-        
-        # Configurar pesos para que sean del mismo tamaño
-        frame_sintomas_container.grid_columnconfigure(0, weight=1)
-        frame_sintomas_container.grid_columnconfigure(1, weight=1)
-        frame_sintomas_container.grid_rowconfigure(0, weight=1)
-        
-        # Distribuir síntomas en dos columnas
-        sintomas = self.agente.obtener_sintomas()
-        mitad = (len(sintomas) + 1) // 2  # Redondear hacia arriba
-        
-        for i, sintoma in enumerate(sintomas):
-            columna = frame_col_izq if i < mitad else frame_col_der
-            tk.Radiobutton(
-                columna,
-                text=self.agente.formatear_nombre(sintoma),
-                variable=self.sintoma_seleccionado,
-                value=sintoma,
-                font=("Arial", 9),
-                bg="white",
-                padx=3,
-                pady=2,
-                anchor="w"
-            ).pack(anchor="w", padx=3, pady=1)
+        # IZQUIERDA: buscador + lista virtualizada (sólo widgets para las filas visibles)
+        self.selector_sintomas = SelectorSintomas(
+            frame_principal_horizontal,
+            lambda: self.agente.catalogo(),
+            self.sintoma_seleccionado
+        )
+        self.selector_sintomas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
         
         # DERECHA: Frame para Modo y Botones
         frame_controles_derecha = tk.Frame(frame_principal_horizontal, bg="white", width=150)
@@ -140,6 +151,26 @@ class App:
             command=self._cambiar_modo
         ).pack(anchor=tk.W, padx=3, pady=1)
         
+        # En modo interactivo: elegir preguntas por ganancia de información
+        self.minimizar_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            frame_modo,
+            text="Mín. preguntas",
+            variable=self.minimizar_var,
+            bg="white",
+            font=("Arial", 7)
+        ).pack(anchor=tk.W, padx=3, pady=1)
+        
+        # En BFS/DFS: no explorar ramas que nunca llegan a OTITIS
+        self.podar_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            frame_modo,
+            text="Podar ramas",
+            variable=self.podar_var,
+            bg="white",
+            font=("Arial", 7)
+        ).pack(anchor=tk.W, padx=3, pady=1)
+        
         # Botones de acción
         frame_botones = tk.Frame(frame_controles_derecha, bg="white")
         frame_botones.pack(fill=tk.BOTH, expand=True)
@@ -171,6 +202,32 @@ class App:
         )
         self.btn_dfs.pack(fill=tk.X, pady=3)
         
+        self.btn_iddfs = tk.Button(
+            frame_botones,
+            text="🔍 IDDFS",
+            command=lambda: self._diagnosticar("IDDFS"),
+            font=("Arial", 9, "bold"),
+            bg="#8e44ad",
+            fg="white",
+            pady=10,
+            cursor="hand2"
+        )
+        self.btn_iddfs.pack(fill=tk.X, pady=3)
+        
+        # Detiene la búsqueda automática en curso (resultado inconcluso)
+        self.btn_cancelar = tk.Button(
+            frame_botones,
+            text="⏹ Cancelar búsqueda",
+            command=self._cancelar_busqueda,
+            font=("Arial", 9),
+            bg="#e67e22",
+            fg="white",
+            pady=8,
+            state=tk.DISABLED,
+            cursor="hand2"
+        )
+        self.btn_cancelar.pack(fill=tk.X, pady=3)
+        
         tk.Button(
             frame_botones,
             text="🔄 Limpiar",
@@ -189,16 +246,89 @@ class App:
         panel_inferior = tk.Frame(panel_izq, bg="white")
         panel_inferior.pack(side=tk.BOTTOM, fill=tk.BOTH, expand=True)
         
-        # Controles de navegación
+        # Panel de pregunta del modo interactivo: se crea UNA vez y sólo se
+        # muestra/oculta; cada respuesta actualiza sus textos
+        self.panel_pregunta = tk.Frame(panel_inferior, bg="white", relief=tk.RAISED, bd=2)
+
+        self.label_pregunta_titulo = tk.Label(
+            self.panel_pregunta,
+            text="",
+            font=("Arial", 11, "bold"),
+            bg="#3498db",
+            fg="white",
+            pady=6
+        )
+        self.label_pregunta_titulo.pack(fill=tk.X)
+
         tk.Label(
+            self.panel_pregunta,
+            text="¿Presenta este síntoma?",
+            font=("Arial", 10, "bold"),
+            bg="white",
+            pady=4
+        ).pack()
+
+        self.label_pregunta_sintoma = tk.Label(
+            self.panel_pregunta,
+            text="",
+            font=("Arial", 13, "bold"),
+            bg="#ffffcc",
+            fg="#d35400",
+            pady=8,
+            relief=tk.RAISED,
+            bd=2
+        )
+        self.label_pregunta_sintoma.pack(fill=tk.X, padx=20)
+
+        frame_respuestas = tk.Frame(self.panel_pregunta, bg="white")
+        frame_respuestas.pack(pady=8)
+
+        tk.Button(
+            frame_respuestas,
+            text="✅ SÍ",
+            command=lambda: self._respuesta_interactiva(True),
+            font=("Arial", 11, "bold"),
+            bg="#27ae60",
+            fg="white",
+            width=10,
+            cursor="hand2"
+        ).pack(side=tk.LEFT, padx=10)
+
+        tk.Button(
+            frame_respuestas,
+            text="❌ NO",
+            command=lambda: self._respuesta_interactiva(False),
+            font=("Arial", 11, "bold"),
+            bg="#e74c3c",
+            fg="white",
+            width=10,
+            cursor="hand2"
+        ).pack(side=tk.LEFT, padx=10)
+
+        self.btn_deshacer = tk.Button(
+            frame_respuestas,
+            text="↩️ Deshacer",
+            command=self._deshacer_interactivo,
+            font=("Arial", 10),
+            bg="#95a5a6",
+            fg="white",
+            width=10,
+            cursor="hand2",
+            state=tk.DISABLED
+        )
+        self.btn_deshacer.pack(side=tk.LEFT, padx=10)
+
+        # Controles de navegación
+        self.titulo_navegacion = tk.Label(
             panel_inferior,
             text="⏯️ Navegación Paso a Paso",
             font=("Arial", 11, "bold"),
             bg="#34495e",
             fg="white",
             pady=6
-        ).pack(fill=tk.X)
-        
+        )
+        self.titulo_navegacion.pack(fill=tk.X)
+
         nav = tk.Frame(panel_inferior, bg="white")
         nav.pack(fill=tk.X, padx=10, pady=8)
         
@@ -236,6 +366,30 @@ class App:
         )
         self.btn_siguiente.pack(side=tk.RIGHT, padx=2)
         
+        # Línea de tiempo: salta a cualquier paso (la traza tiene acceso aleatorio)
+        self.linea_tiempo = tk.Scale(
+            panel_inferior,
+            from_=1,
+            to=1,
+            orient=tk.HORIZONTAL,
+            showvalue=False,
+            command=self._ir_a_paso,
+            bg="white",
+            highlightthickness=0,
+            state=tk.DISABLED
+        )
+        self.linea_tiempo.pack(fill=tk.X, padx=10)
+        
+        # Progreso de la búsqueda automática (se actualiza mientras corre)
+        self.label_progreso = tk.Label(
+            panel_inferior,
+            text="",
+            font=("Arial", 9),
+            bg="white",
+            fg="#7f8c8d"
+        )
+        self.label_progreso.pack(fill=tk.X, padx=10)
+        
         # Visualización de Cola/Pila
         tk.Label(
             panel_inferior,
@@ -264,6 +418,12 @@ class App:
         self.canvas_estructura.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Los ítems del canvas persisten entre pasos; sólo se aplica la diferencia
+        self.panel_estructura = PanelEstructura(
+            self.canvas_estructura,
+            lambda nodo: self.agente.formatear_nombre(nodo)
+        )
+        
         # Panel derecho - Visualización
         panel_der = tk.Frame(main, bg="white", relief=tk.RAISED, bd=2)
         panel_der.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(5,0))
@@ -296,6 +456,21 @@ class App:
         )
         self.btn_historial.pack(side=tk.RIGHT, padx=10, pady=5)
         
+        # Botón para superponer caminos alternativos hacia OTITIS
+        self.btn_alternativos = tk.Button(
+            header_frame,
+            text="🔀 Caminos Alternativos",
+            command=self._alternar_caminos_alternativos,
+            font=("Arial", 10, "bold"),
+            bg="#e67e22",
+            fg="white",
+            cursor="hand2",
+            state=tk.DISABLED,
+            pady=8,
+            padx=15
+        )
+        self.btn_alternativos.pack(side=tk.RIGHT, padx=10, pady=5)
+        
         # Frame para grafo (ocupa TODO el espacio)
         self.frame_grafo = tk.Frame(panel_der, bg="white")
         self.frame_grafo.pack(fill=tk.BOTH, expand=False, padx=0, pady=0)
@@ -327,218 +502,239 @@ class App:
         
         sintoma_inicial = sintoma
         
+        if metodo == "IDDFS" and modo != "automatico":
+            messagebox.showwarning("Advertencia", "IDDFS sólo está disponible en modo automático")
+            return
+        
         if modo == "automatico":
             # MODO 1: Recorrido automático completo
-            if metodo == "BFS":
-                self.resultado = self.agente.bfs(sintoma_inicial)
-            else:
-                self.resultado = self.agente.dfs(sintoma_inicial)
-            
-            self.paso_actual = 0
-            self.metodo_usado = metodo
-            self.sintomas_seleccionados = [sintoma]
-            self._habilitar_navegacion()
-            self._actualizar_paso()
-            self.btn_historial.config(state=tk.NORMAL)
+            self._cancelar_interactivo()
+            self._iniciar_busqueda(metodo, sintoma_inicial)
         
         else:
             # MODO 2: Diagnóstico interactivo - usa el mismo botón BFS/DFS
             self._iniciar_modo_interactivo(metodo, sintoma_inicial)
     
+    def _iniciar_busqueda(self, metodo, sintoma_inicial):
+        """
+        Corre la búsqueda automática en un hilo para que la ventana siga
+        respondiendo; un MetricasPasos recibe cada paso y la GUI lo consulta
+        cada 50 ms para mostrar el progreso.
+        
+        El hilo no toca self.agente: el Tk sigue usándolo (catálogo,
+        puntajes, caches derivados, modificaciones del grafo) sin bloqueos.
+        La búsqueda corre sobre un agente propio armado con la instantánea
+        copy-on-write del grafo, tomada acá en O(1).
+        """
+        if self._busqueda_en_curso is not None:
+            return  # ya hay una búsqueda corriendo
+        
+        metricas = MetricasPasos()
+        token = TokenCancelacion()
+        salida = {}
+        instantanea = self.agente.instantanea()
+        objetivos = self.agente.objetivos
+        podar = self.podar_var.get()  # las variables de Tk sólo se leen en su hilo
+        
+        def correr():
+            agente = AgenteOtitis(instantanea.grafo, instantanea.pesos, objetivos)
+            if metodo == "BFS":
+                salida['resultado'] = agente.bfs(sintoma_inicial, podar=podar,
+                                                 observadores=[metricas], token=token)
+            elif metodo == "IDDFS":
+                salida['resultado'] = agente.iddfs(sintoma_inicial, observadores=[metricas],
+                                                   token=token)
+            else:
+                salida['resultado'] = agente.dfs(sintoma_inicial, podar=podar,
+                                                 observadores=[metricas], token=token)
+        
+        hilo = threading.Thread(target=correr, daemon=True)
+        self._busqueda_en_curso = (hilo, metricas, token, salida, metodo, sintoma_inicial)
+        self.btn_cancelar.config(state=tk.NORMAL)
+        hilo.start()
+        self._sondear_busqueda()
+    
+    def _cancelar_busqueda(self, descartar=False):
+        """
+        Pide a la búsqueda en curso que se detenga. Termina con un resultado
+        inconcluso que se muestra igual, salvo con descartar=True (Limpiar).
+        """
+        if self._busqueda_en_curso is None:
+            return
+        _, _, token, salida, _, _ = self._busqueda_en_curso
+        if descartar:
+            salida['descartada'] = True
+        token.cancelar()
+    
+    def _sondear_busqueda(self):
+        """Actualiza el progreso y, cuando el hilo termina, muestra el resultado"""
+        hilo, metricas, _, salida, metodo, sintoma_inicial = self._busqueda_en_curso
+        if hilo.is_alive():
+            self.label_progreso.config(
+                text=f"⏳ {metodo}: {metricas.pasos} pasos · {metricas.visitados} visitados · "
+                     f"frontera {metricas.frontera} · {metricas.pasos_por_segundo():.0f} pasos/s"
+            )
+            self.root.after(50, self._sondear_busqueda)
+            return
+        
+        self._busqueda_en_curso = None
+        self.btn_cancelar.config(state=tk.DISABLED)
+        if salida.get('descartada'):
+            return
+        if 'resultado' not in salida:
+            self.label_progreso.config(text="❌ La búsqueda terminó con un error")
+            return
+        resultado = salida['resultado']
+        if resultado['estado'] == INCONCLUSO:
+            self.label_progreso.config(
+                text=f"⚠️ {metodo} inconcluso ({resultado['motivo']}): "
+                     f"{len(resultado['pasos'])} pasos, "
+                     f"{len(resultado['frontera'])} nodos sin explorar"
+            )
+        else:
+            self.label_progreso.config(
+                text=f"✔ {metodo}: {metricas.pasos} pasos en {metricas.segundos * 1000:.1f} ms"
+            )
+        self._mostrar_resultado(metodo, sintoma_inicial, resultado)
+    
+    def _mostrar_resultado(self, metodo, sintoma_inicial, resultado):
+        """Carga el resultado de una búsqueda automática en la navegación"""
+        self.resultado = resultado
+        self.paso_actual = 0
+        self.metodo_usado = metodo
+        self.sintomas_seleccionados = [sintoma_inicial]
+        self.caminos_alternativos = []
+        self._habilitar_navegacion()
+        self._actualizar_paso()
+        self.btn_historial.config(state=tk.NORMAL)
+        self.btn_alternativos.config(state=tk.NORMAL if self.resultado['encontrado'] else tk.DISABLED)
+    
     def _iniciar_modo_interactivo(self, algoritmo, sintoma_inicial):
         """Inicia el modo interactivo con el algoritmo ya seleccionado (BFS o DFS)"""
-        # Inicializar estado del algoritmo
-        self.estado_interactivo = {
-            'algoritmo': algoritmo,
-            'camino': [sintoma_inicial],
-            'visitados': {sintoma_inicial},
-            'paso': 1,
-            'encontro_otitis': False
-        }
+        # La sesión anterior, si quedó a medias, se reemplaza: queda abandonada
+        self._cancelar_interactivo()
+        politica = PoliticaPreguntas(self.agente) if self.minimizar_var.get() else None
+        self.estado_interactivo = SesionInteractiva(self.agente, algoritmo, sintoma_inicial, politica)
+        self.id_sesion_interactiva = self.registro_sesiones.iniciar(self.estado_interactivo)
         
-        if algoritmo == "BFS":
-            from collections import deque
-            self.estado_interactivo['cola'] = deque([(sintoma_inicial, [sintoma_inicial])])
-        else:  # DFS
-            self.estado_interactivo['pila'] = [(sintoma_inicial, [sintoma_inicial])]
+        color = "#9b59b6" if algoritmo == "DFS" else "#3498db"
+        self.label_pregunta_titulo.config(bg=color)
+        self.panel_pregunta.pack(fill=tk.X, padx=10, pady=5, before=self.titulo_navegacion)
         
         # Mostrar primer paso
-        self._preguntar_sintoma_interactivo()
+        self._mostrar_pregunta_interactiva()
     
-    def _preguntar_sintoma_interactivo(self):
-        """Pregunta al usuario si tiene el siguiente síntoma según BFS/DFS"""
-        estado = self.estado_interactivo
-        
-        # Obtener siguiente nodo según el algoritmo
-        if estado['algoritmo'] == "BFS":
-            if not estado['cola']:
-                self._finalizar_interactivo(False)
-                return
-            nodo_actual, camino = estado['cola'][0]
-        else:  # DFS
-            if not estado['pila']:
-                self._finalizar_interactivo(False)
-                return
-            nodo_actual, camino = estado['pila'][-1]
-        
-        # Si llegamos a OTITIS, mostrar diagnóstico directamente
-        if nodo_actual == "OTITIS":
-            self._finalizar_interactivo(True)
+    def _mostrar_pregunta_interactiva(self):
+        """Muestra la pregunta pendiente de la sesión (o el diagnóstico si terminó)"""
+        sesion = self.estado_interactivo
+        
+        if sesion.finalizada:
+            self._finalizar_interactivo(sesion.tiene_otitis)
             return
         
-        # Actualizar visualización en la VENTANA PRINCIPAL
-        paso_visual = {
-            'paso': estado['paso'],
-            'nodo_actual': nodo_actual,
-            'camino': camino,
-            'visitados': estado['visitados'],
-            'pila' if estado['algoritmo'] == "DFS" else 'cola': camino
-        }
+        nodo_actual, _ = sesion.pregunta
+        self.label_pregunta_titulo.config(text=f"PASO {sesion.paso} - {sesion.algoritmo}")
+        self.btn_deshacer.config(state=tk.NORMAL if sesion.puede_deshacer else tk.DISABLED)
+        self.label_pregunta_sintoma.config(text=self.agente.formatear_nombre(nodo_actual))
         
-        # Mostrar en panel izquierdo (pila/cola)
+        # Actualizar visualización en la VENTANA PRINCIPAL
+        paso_visual = sesion.paso_visual()
         self._mostrar_detalle_paso(paso_visual)
-        
-        # Mostrar grafo actualizado
         self._dibujar_grafo(paso_visual)
+    
+    def _respuesta_interactiva(self, tiene_sintoma):
+        """
+        Procesa la respuesta del usuario en modo interactivo.
         
-        # Ventana PEQUEÑA solo para la pregunta
-        ventana = tk.Toplevel(self.root)
-        ventana.title(f"Paso {estado['paso']} - {estado['algoritmo']}")
-        ventana.geometry("450x280")
-        ventana.configure(bg="white")
-        ventana.grab_set()
-        ventana.transient(self.root)  # Mantener encima de la ventana principal
-        
-        # Centrar ventana
-        ventana.update_idletasks()
-        x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (450 // 2)
-        y = self.root.winfo_y() + (self.root.winfo_height() // 2) - (280 // 2)
-        ventana.geometry(f"450x280+{x}+{y}")
-        
-        # Encabezado
-        tk.Label(
-            ventana,
-            text=f"PASO {estado['paso']} - {estado['algoritmo']}",
-            font=("Arial", 13, "bold"),
-            bg="#9b59b6" if estado['algoritmo'] == "DFS" else "#3498db",
-            fg="white",
-            pady=15
-        ).pack(fill=tk.X)
-        
-        # Pregunta
-        tk.Label(
-            ventana,
-            text="¿Presenta este síntoma?",
-            font=("Arial", 12, "bold"),
-            bg="white",
-            pady=20
-        ).pack()
-        
-        tk.Label(
-            ventana,
-            text=self.agente.formatear_nombre(nodo_actual),
-            font=("Arial", 16, "bold"),
-            bg="#ffffcc",
-            fg="#d35400",
-            pady=20,
-            relief=tk.RAISED,
-            bd=3
-        ).pack(fill=tk.X, padx=40)
-        
-        # Botones
-        frame_botones = tk.Frame(ventana, bg="white")
-        frame_botones.pack(pady=25)
+        Es un manejador de evento: aplica la respuesta a la sesión, refresca
+        el panel y retorna. No abre ventanas ni se llama a sí mismo, así que
+        la pila no crece con la duración de la sesión.
+        """
+        sesion = self.estado_interactivo
+        if sesion is None or sesion.finalizada:
+            return
         
-        tk.Button(
-            frame_botones,
-            text="✅ SÍ",
-            command=lambda: self._respuesta_interactiva(ventana, True, nodo_actual, camino),
-            font=("Arial", 12, "bold"),
-            bg="#27ae60",
-            fg="white",
-            width=12,
-            pady=12,
-            cursor="hand2"
-        ).pack(side=tk.LEFT, padx=15)
+        nodo_actual = sesion.pregunta[0]
+        sesion.responder(tiene_sintoma)
+        self.registro_sesiones.registrar_respuesta(
+            self.id_sesion_interactiva, nodo_actual, tiene_sintoma, sesion.tamano_frontera())
+        self._mostrar_pregunta_interactiva()
+    
+    def _deshacer_interactivo(self):
+        """Vuelve a la pregunta anterior (la sesión guarda sus versiones previas)"""
+        sesion = self.estado_interactivo
+        if sesion is None or sesion.finalizada or not sesion.puede_deshacer:
+            return
         
-        tk.Button(
-            frame_botones,
-            text="❌ NO",
-            command=lambda: self._respuesta_interactiva(ventana, False, nodo_actual, camino),
-            font=("Arial", 12, "bold"),
-            bg="#e74c3c",
-            fg="white",
-            width=12,
-            pady=12,
-            cursor="hand2"
-        ).pack(side=tk.LEFT, padx=15)
+        nodo, tiene_sintoma = sesion.deshacer()
+        self.registro_sesiones.registrar_deshacer(
+            self.id_sesion_interactiva, nodo, tiene_sintoma, sesion.tamano_frontera())
+        self._mostrar_pregunta_interactiva()
     
-    def _respuesta_interactiva(self, ventana, tiene_sintoma, nodo_actual, camino):
-        """Procesa la respuesta del usuario en modo interactivo"""
-        ventana.destroy()
-        estado = self.estado_interactivo
-        
-        # Desencolar/desapilar
-        if estado['algoritmo'] == "BFS":
-            estado['cola'].popleft()
-        else:
-            estado['pila'].pop()
-        
-        if tiene_sintoma:
-            # Usuario SÍ tiene el síntoma
-            if nodo_actual == "OTITIS":
-                estado['encontro_otitis'] = True
-                estado['camino'] = camino
-                self._finalizar_interactivo(True)
-                return
-            
-            # Agregar a camino y explorar vecinos
-            estado['camino'] = camino
-            vecinos = self.agente.obtener_vecinos(nodo_actual)
-            
-            # Para DFS: agregar en orden REVERSO (igual que en agente_otitis.py)
-            if estado['algoritmo'] == "DFS":
-                vecinos = list(reversed(vecinos))
-            
-            for vecino in vecinos:
-                if vecino not in estado['visitados']:
-                    estado['visitados'].add(vecino)
-                    nuevo_camino = camino + [vecino]
-                    
-                    if estado['algoritmo'] == "BFS":
-                        estado['cola'].append((vecino, nuevo_camino))
-                    else:  # DFS
-                        estado['pila'].append((vecino, nuevo_camino))
-            
-            estado['paso'] += 1
-            self._preguntar_sintoma_interactivo()
-        else:
-            # Usuario NO tiene el síntoma - continuar con siguiente en la estructura
-            estado['paso'] += 1
-            self._preguntar_sintoma_interactivo()
+    def _cancelar_interactivo(self):
+        """Descarta la sesión interactiva en curso (queda abandonada en el registro) y oculta su panel"""
+        if self.id_sesion_interactiva is not None:
+            self.registro_sesiones.abandonar(self.id_sesion_interactiva)
+        self.estado_interactivo = None
+        self.id_sesion_interactiva = None
+        self.panel_pregunta.pack_forget()
     
     def _finalizar_interactivo(self, tiene_otitis):
         """Muestra el resultado final del diagnóstico interactivo"""
-        estado = self.estado_interactivo
+        sesion = self.estado_interactivo
+        self.panel_pregunta.pack_forget()
+        self.registro_sesiones.finalizar(self.id_sesion_interactiva, tiene_otitis)
         
-        if tiene_otitis:
+        # El grafo queda con el estado final (camino confirmado)
+        paso_visual = sesion.paso_visual()
+        self._mostrar_detalle_paso(paso_visual)
+        self._dibujar_grafo(paso_visual)
+        
+        if sesion.politica is not None:
+            politica = sesion.politica
+            _, probabilidad = politica.decidir(sesion.presentes, sesion.negados)
+            comparacion = politica.comparar(sesion.sintoma_inicial, n_pacientes=200)
+            messagebox.showinfo(
+                "Diagnóstico Final",
+                f"{'🔴 DIAGNÓSTICO: OTITIS' if tiene_otitis else '✅ DIAGNÓSTICO: PACIENTE SANO'}\n\n"
+                f"Probabilidad de OTITIS: {probabilidad:.1%}\n"
+                f"Preguntas realizadas: {sesion.num_preguntas()}\n"
+                f"Síntomas presentes: {', '.join(self.agente.formatear_nombre(n) for n in sesion.presentes)}\n\n"
+                f"Preguntas esperadas (simulación):\n"
+                + "\n".join(f"  {nombre}: {datos['preguntas_promedio']:.2f}"
+                            for nombre, datos in comparacion.items())
+            )
+        elif tiene_otitis:
             messagebox.showinfo(
                 "Diagnóstico Final",
-                f"🔴 DIAGNÓSTICO: OTITIS\n\n"
-                f"Algoritmo: {estado['algoritmo']}\n"
-                f"Pasos realizados: {estado['paso']}\n"
-                f"Nodos explorados: {len(estado['visitados'])}\n\n"
-                f"Camino: {' → '.join([self.agente.formatear_nombre(n) for n in estado['camino']])}"
+                f"🔴 DIAGNÓSTICO: {self.agente.formatear_nombre(sesion.camino[-1])}\n\n"
+                f"Algoritmo: {sesion.algoritmo}\n"
+                f"Pasos realizados: {sesion.paso}\n"
+                f"Nodos explorados: {len(sesion.visitados)}\n\n"
+                f"Camino: {' → '.join([self.agente.formatear_nombre(n) for n in sesion.camino])}"
             )
         else:
             messagebox.showinfo(
                 "Diagnóstico Final",
                 f"✅ DIAGNÓSTICO: PACIENTE SANO\n\n"
-                f"Algoritmo: {estado['algoritmo']}\n"
-                f"Pasos realizados: {estado['paso']}\n"
+                f"Algoritmo: {sesion.algoritmo}\n"
+                f"Pasos realizados: {sesion.paso}\n"
                 f"No se encontró un camino a OTITIS"
             )
     
+    def _alternar_caminos_alternativos(self):
+        """Muestra u oculta los k caminos más cortos hacia OTITIS sobre el grafo"""
+        if not self.resultado:
+            return
+        
+        if self.caminos_alternativos:
+            self.caminos_alternativos = []
+        else:
+            self.caminos_alternativos = self.agente.k_caminos_mas_cortos(
+                self.sintomas_seleccionados[0], k=self.MAX_CAMINOS_ALTERNATIVOS)
+        
+        self._actualizar_paso()
+    
     def _mostrar_opciones_interactivas(self, nodo_actual, vecinos, camino_recorrido):
         """DEPRECATED - Método antiguo del modo manual"""
         pass
@@ -620,7 +816,11 @@ class App:
                 else:
                     output += "  (Cola vacía)\n"
             elif 'pila' in paso:
-                output += "📚 PILA (DFS - LIFO):\n"
+                if 'limite_profundidad' in paso:
+                    output += (f"📚 PILA (IDDFS - LIFO) · Iteración {paso['iteracion']}, "
+                               f"límite de profundidad {paso['limite_profundidad']}:\n")
+                else:
+                    output += "📚 PILA (DFS - LIFO):\n"
                 if paso['pila']:
                     pila_visual = list(reversed(paso['pila']))
                     output += "  [TOPE]\n"
@@ -632,6 +832,9 @@ class App:
                     output += "  (Pila vacía)\n"
             
             output += f"\n✓ Nodos visitados hasta ahora: {len(paso['visitados'])}\n"
+            if paso.get('podados'):
+                output += "✂️ Podados (no llegan a OTITIS): "
+                output += ", ".join(self.agente.formatear_nombre(n) for n in sorted(paso['podados'])) + "\n"
             output += "\n\n"
         
         # Resultado final
@@ -640,17 +843,49 @@ class App:
         output += "═" * 80 + "\n\n"
         
         if self.resultado['tiene_otitis']:
-            output += "🔴 DIAGNÓSTICO: OTITIS DETECTADA\n\n"
+            diagnostico = self.resultado.get('diagnostico') or self.agente.objetivo
+            output += f"🔴 DIAGNÓSTICO: {self.agente.formatear_nombre(diagnostico)} DETECTADA\n\n"
             output += "Camino final:\n  "
             output += " → ".join([self.agente.formatear_nombre(n) for n in self.resultado['camino_final']])
             output += "\n"
+            
+            # Varios diagnósticos alcanzados en el mismo recorrido, en orden
+            alcanzados = self.resultado.get('objetivos_alcanzados', [])
+            if len(alcanzados) > 1:
+                output += "\nDiagnósticos alcanzados (en orden):\n"
+                for alcanzado in alcanzados:
+                    output += (f"  Paso {alcanzado['paso']}: "
+                               f"{self.agente.formatear_nombre(alcanzado['objetivo'])} ← "
+                               + " → ".join(self.agente.formatear_nombre(n) for n in alcanzado['camino'])
+                               + "\n")
+            output += f"\nProbabilidad estimada (noisy-OR): {self.resultado['probabilidad']:.1%}\n"
+            explicacion = self.agente.explicar_diagnostico(self.sintomas_seleccionados[0], diagnostico)
+            output += f"🚪 {explicacion['explicacion']}\n"
+        elif self.resultado.get('estado') == INCONCLUSO:
+            output += f"⚠️ BÚSQUEDA INCONCLUSA ({self.resultado['motivo']})\n\n"
+            output += "La búsqueda se detuvo antes de llegar a un diagnóstico: no se puede\n"
+            output += "afirmar que el paciente esté sano.\n"
         else:
             output += "✅ DIAGNÓSTICO: PACIENTE SANO\n\n"
             output += "No se encontró un camino que llegue a OTITIS.\n"
             output += "El algoritmo exploró todos los nodos posibles sin llegar al diagnóstico.\n"
+            explicacion = self.agente.explicar_diagnostico(self.sintomas_seleccionados[0])
+            output += f"❔ {explicacion['explicacion']}.\n"
+        
+        if self.resultado.get('estado') == INCONCLUSO:
+            frontera = self.resultado['frontera']
+            output += f"\n⏸️ Nodos sin explorar ({len(frontera)}): "
+            output += ", ".join(self.agente.formatear_nombre(n) for n in frontera[:20])
+            output += " …\n" if len(frontera) > 20 else "\n"
         
         output += f"\n⏱️ Tiempo total: {self.resultado['tiempo_ms']:.3f} ms\n"
         
+        # IDDFS: nodos expandidos en cada iteración
+        if 'iteraciones' in self.resultado:
+            output += "\n🔁 Iteraciones IDDFS:\n"
+            for it in self.resultado['iteraciones']:
+                output += f"  Límite {it['limite']}: {it['nodos_expandidos']} nodos expandidos\n"
+        
         texto.insert(tk.END, output)
         texto.config(state=tk.DISABLED)
         
@@ -682,6 +917,15 @@ class App:
             self.paso_actual += 1
             self._actualizar_paso()
     
+    def _ir_a_paso(self, valor):
+        """Mueve la navegación al paso elegido en la línea de tiempo"""
+        if not self.resultado or not self.resultado['pasos']:
+            return
+        indice = int(float(valor)) - 1
+        if indice != self.paso_actual and 0 <= indice < len(self.resultado['pasos']):
+            self.paso_actual = indice
+            self._actualizar_paso()
+    
     def _actualizar_paso(self):
         if not self.resultado or not self.resultado['pasos']:
             return
@@ -693,6 +937,8 @@ class App:
         self.btn_anterior.config(state=tk.NORMAL if self.paso_actual > 0 else tk.DISABLED)
         self.btn_siguiente.config(state=tk.NORMAL if self.paso_actual < total - 1 else tk.DISABLED)
         self.label_paso.config(text=f"Paso: {self.paso_actual + 1}/{total}")
+        self.linea_tiempo.config(to=total, state=tk.NORMAL)
+        self.linea_tiempo.set(self.paso_actual + 1)
         
         paso = pasos[self.paso_actual]
         self._mostrar_detalle_paso(paso)
@@ -700,311 +946,182 @@ class App:
     
     def _mostrar_detalle_paso(self, paso):
         """Dibuja el CAMINO ACUMULADO y la FRONTERA (cola/pila) de exploración"""
-        self.canvas_estructura.delete("all")
-        
-        # Título del paso
-        self.canvas_estructura.create_text(
-            175, 12, 
-            text=f"PASO {paso['paso']}", 
-            font=("Arial", 11, "bold"),
-            fill="#2c3e50"
-        )
-        
-        # 1. CAMINO ACUMULADO (lo que se ha recorrido) - MÁS GRANDE
-        self.canvas_estructura.create_rectangle(
-            5, 28, 345, 178,
-            fill="#ecf0f1", outline="#34495e", width=2
-        )
-        self.canvas_estructura.create_text(
-            175, 40,
-            text="🗺️ CAMINO RECORRIDO (Memoria)",
-            font=("Arial", 10, "bold"),
-            fill="#16a085"
-        )
-        
-        # Dibujar el camino como cadena de nodos
-        camino = paso.get('camino', [])
-        if camino:
-            y_pos = 60
-            x_start = 15
-            max_width = 310
-            espacio_x = 65
-            
-            # Dibujar nodos del camino
-            for i, nodo in enumerate(camino):
-                nombre = self.agente.formatear_nombre(nodo)[:9]
-                x = x_start + (i * espacio_x) % max_width
-                
-                # Saltar a nueva línea si es necesario
-                if i > 0 and (i * espacio_x) % max_width < ((i-1) * espacio_x) % max_width:
-                    y_pos += 45
-                
-                # Color según si es el nodo actual
-                color = "#e74c3c" if nodo == paso['nodo_actual'] else "#16a085"
-                
-                # Círculo del nodo MÁS GRANDE
-                radio = 16
-                self.canvas_estructura.create_oval(
-                    x, y_pos, x + radio*2, y_pos + radio*2,
-                    fill=color, outline="black", width=2
-                )
-                
-                # Número de paso
-                self.canvas_estructura.create_text(
-                    x + radio, y_pos + radio,
-                    text=str(i+1),
-                    font=("Arial", 10, "bold"),
-                    fill="white"
-                )
-                
-                # Nombre debajo MÁS GRANDE
-                self.canvas_estructura.create_text(
-                    x + radio, y_pos + radio*2 + 10,
-                    text=nombre,
-                    font=("Arial", 8),
-                    fill="#2c3e50"
-                )
-                
-                # Flecha al siguiente
-                if i < len(camino) - 1:
-                    next_x = x_start + ((i+1) * espacio_x) % max_width
-                    # Solo dibujar flecha si está en la misma línea
-                    if (i * espacio_x) % max_width < ((i+1) * espacio_x) % max_width:
-                        self.canvas_estructura.create_line(
-                            x + radio*2, y_pos + radio, 
-                            next_x, y_pos + radio,
-                            arrow=tk.LAST, fill="#34495e", width=2
-                        )
-        
-        # 2. FRONTERA (Cola/Pila) - Nodos por explorar
-        y_frontera = 185
-        if 'cola' in paso:
-            self._dibujar_cola_fifo(paso, y_frontera)
-        elif 'pila' in paso:
-            self._dibujar_pila_lifo(paso, y_frontera)
-        
-        # Información de nodos visitados
-        self.canvas_estructura.create_text(
-            175, 338,
-            text=f"✓ Total Visitados: {len(paso['visitados'])}",
-            font=("Arial", 9),
-            fill="#27ae60"
-        )
+        self.panel_estructura.mostrar(paso)
     
-    def _dibujar_cola_fifo(self, paso, y_inicio=185):
-        """Dibuja COLA (FIFO) - Mostrando TODOS los visitados acumulados"""
-        # Título
-        self.canvas_estructura.create_rectangle(
-            10, y_inicio, 340, y_inicio + 30,
-            fill="#3498db", outline="black", width=2
-        )
-        self.canvas_estructura.create_text(
-            175, y_inicio + 15,
-            text="📋 COLA ACUMULADA (BFS - FIFO)",
-            font=("Arial", 10, "bold"),
-            fill="white"
-        )
-        
-        # Indicadores
-        self.canvas_estructura.create_text(
-            50, y_inicio + 45,
-            text="INICIO ←",
-            font=("Arial", 8, "bold"),
-            fill="#16a085"
-        )
-        self.canvas_estructura.create_text(
-            300, y_inicio + 45,
-            text="→ ACTUAL",
-            font=("Arial", 8, "bold"),
-            fill="#e74c3c"
-        )
+    def _dibujar_grafo(self, paso):
+        """
+        Muestra un paso sobre el grafo.
         
-        # Obtener el CAMINO como cola acumulada
-        cola_acumulada = paso.get('camino', [])
+        La figura (aristas, etiquetas, leyenda) sólo se construye cuando cambia
+        el grafo o la superposición de caminos; entre pasos se recolorean
+        únicamente los nodos cuyo estado cambió y se pide un draw_idle.
+        """
+        podados = paso.get('podados', ())
+        clave = (self.agente.version, tuple(map(tuple, self.caminos_alternativos)), bool(podados))
+        if self._figura is None or clave != self._clave_figura:
+            self._construir_figura(bool(podados))
+            self._clave_figura = clave
         
-        # Dibujar elementos
-        if cola_acumulada:
-            x_inicio = 40
-            ancho = 45
-            altura = 30
-            y = y_inicio + 65
-            
-            for i, nodo in enumerate(cola_acumulada[:6]):
-                nombre = self.agente.formatear_nombre(nodo)[:6]
-                x = x_inicio + (i * (ancho + 3))
-                
-                # Color: primero verde (inicio), último rojo (actual)
-                if i == 0:
-                    color = "#16a085"  # Verde - primero
-                elif i == len(cola_acumulada)-1:
-                    color = "#e74c3c"  # Rojo - actual
-                else:
-                    color = "#95a5a6"  # Gris
-                
-                self.canvas_estructura.create_rectangle(
-                    x, y, x + ancho, y + altura,
-                    fill=color, outline="black", width=2
-                )
-                self.canvas_estructura.create_text(
-                    x + ancho/2, y + altura/2,
-                    text=f"{i+1}",
-                    font=("Arial", 9, "bold"),
-                    fill="white"
-                )
-                self.canvas_estructura.create_text(
-                    x + ancho/2, y + altura + 8,
-                    text=nombre,
-                    font=("Arial", 7),
-                    fill="#2c3e50"
-                )
-                
-                if i < len(cola_acumulada) - 1 and i < 5:
-                    self.canvas_estructura.create_text(
-                        x + ancho + 1, y + altura/2,
-                        text="→",
-                        font=("Arial", 10),
-                        fill="#34495e"
-                    )
-            
-            if len(cola_acumulada) > 6:
-                self.canvas_estructura.create_text(
-                    175, y + altura + 20,
-                    text=f"+{len(cola_acumulada) - 6} más",
-                    font=("Arial", 7, "italic"),
-                    fill="#7f8c8d"
-                )
+        nodo_actual = paso['nodo_actual']
+        self._titulo_grafo.set_text(
+            f"Paso {paso['paso']}: Explorando '{self.agente.formatear_nombre(nodo_actual)}'")
+        if self._renderizador is not None:
+            # Grafo grande: sólo se redibuja lo que cambia (blitting)
+            self._renderizador.mostrar_paso(paso)
+            self._renderizador.redibujar()
         else:
-            self.canvas_estructura.create_text(
-                175, y_inicio + 70,
-                text="(Vacía)",
-                font=("Arial", 9, "italic"),
-                fill="#7f8c8d"
-            )
+            self._recolorear_nodos(paso)
+            self._canvas_grafo.draw_idle()  # Usar draw_idle en lugar de draw para evitar bloqueos
     
-    def _dibujar_pila_lifo(self, paso, y_inicio=185):
-        """Dibuja PILA (LIFO) - Mostrando TODOS los visitados acumulados"""
-        # Título
-        self.canvas_estructura.create_rectangle(
-            10, y_inicio, 340, y_inicio + 30,
-            fill="#9b59b6", outline="black", width=2
-        )
-        self.canvas_estructura.create_text(
-            175, y_inicio + 15,
-            text="📚 PILA ACUMULADA (DFS - LIFO)",
-            font=("Arial", 10, "bold"),
-            fill="white"
-        )
-        
-        # Indicador
-        self.canvas_estructura.create_text(
-            175, y_inicio + 40,
-            text="↑ TOPE (último visitado) ↑",
-            font=("Arial", 8, "bold"),
-            fill="#e74c3c"
-        )
-        
-        # Obtener el CAMINO como pila acumulada (todos los nodos visitados en orden)
-        pila_acumulada = paso.get('camino', [])
-        
-        # Dibujar elementos verticalmente
-        if pila_acumulada:
-            pila_invertida = list(reversed(pila_acumulada))  # TOPE arriba
-            
-            ancho = 180
-            altura = 25
-            x = 175 - ancho/2
-            y = y_inicio + 60
-            
-            for i, nodo in enumerate(pila_invertida[:5]):
-                nombre = self.agente.formatear_nombre(nodo)
-                y_actual = y + (i * (altura + 3))
-                
-                # Color: TOPE (último visitado) en rojo, BASE (primero) oscuro
-                if i == 0:
-                    color = "#e74c3c"  # Rojo - TOPE (actual)
-                elif i == len(pila_invertida)-1:
-                    color = "#34495e"  # Oscuro - BASE (inicial)
-                else:
-                    color = "#95a5a6"  # Gris
-                
-                self.canvas_estructura.create_rectangle(
-                    x, y_actual, x + ancho, y_actual + altura,
-                    fill=color, outline="black", width=2
-                )
-                self.canvas_estructura.create_text(
-                    175, y_actual + altura/2,
-                    text=f"{len(pila_acumulada)-i}. {nombre}",
-                    font=("Arial", 8, "bold"),
-                    fill="white"
-                )
-            
-            if len(pila_acumulada) > 5:
-                self.canvas_estructura.create_text(
-                    175, y + (5 * (altura + 3)) + 10,
-                    text=f"+{len(pila_acumulada) - 5} más abajo",
-                    font=("Arial", 7, "italic"),
-                    fill="#7f8c8d"
-                )
-        else:
-            self.canvas_estructura.create_text(
-                175, y_inicio + 70,
-                text="(Vacía)",
-                font=("Arial", 9, "italic"),
-                fill="#7f8c8d"
-            )
+    def _recolorear_nodos(self, paso):
+        """Actualiza los nodos dibujados con networkx (grafos chicos)"""
+        nodo_actual = paso['nodo_actual']
+        camino = set(paso['camino'])
+        visitados = paso['visitados']
+        podados = paso.get('podados', ())
+        
+        # Sólo pueden cambiar los nodos resaltados ahora o en el paso anterior
+        resaltados = {nodo_actual} | camino | set(visitados) | set(podados)
+        cambios = False
+        for node in resaltados | self._nodos_resaltados:
+            i = self._indice_nodos.get(node)
+            if i is None:
+                continue
+            estilo = self._estilo_nodo(node, nodo_actual, camino, visitados, podados)
+            if estilo == self._estilo_nodos[node]:
+                continue
+            color, tamano, podado = estilo
+            self._colores_nodos[i] = to_rgba(color)
+            self._bordes_nodos[i] = to_rgba('#b2bec3' if podado else 'black')
+            self._tamanos_nodos[i] = tamano
+            self._etiquetas_nodos[node].set_color('#95a5a6' if podado else 'black')
+            self._estilo_nodos[node] = estilo
+            cambios = True
+        self._nodos_resaltados = resaltados
+        
+        if cambios:
+            self._coleccion_nodos.set_facecolor(self._colores_nodos)
+            self._coleccion_nodos.set_edgecolor(self._bordes_nodos)
+            self._coleccion_nodos.set_sizes(self._tamanos_nodos)
     
-    def _dibujar_grafo(self, paso):
+    def _estilo_nodo(self, node, nodo_actual=None, camino=(), visitados=(), podados=()):
+        """(color, tamaño, podado) de un nodo en el paso actual"""
+        if node in podados:
+            return ('#dfe6e9', 3500, True)  # Gris muy claro - podado
+        if node == nodo_actual:
+            return ('#f39c12', 5000, False)  # Naranja - explorando
+        if node in camino:
+            return ('#27ae60', 4500, False)  # Verde - en camino
+        if node in visitados:
+            return ('#95a5a6', 4000, False)  # Gris - visitado
+        if node in self.agente.objetivos:
+            return ('#e74c3c', 5500, False)  # Rojo - objetivo (diagnóstico)
+        return ('#ecf0f1', 4000, False)  # Gris claro - no visitado
+    
+    def _construir_figura(self, con_podados):
+        """Construye la figura del grafo con todos los nodos en su estado base"""
         # Limpiar SOLO los widgets de grafo, sin destruir el frame
         for widget in self.frame_grafo.winfo_children():
             widget.destroy()
         
         # Crear figura sin bordes ni espacios
-        fig = plt.figure(figsize=(14, 11), dpi=80)
+        fig = Figure(figsize=(14, 11), dpi=80)
         fig.patch.set_facecolor('white')
         ax = fig.add_subplot(111)
         
         # Márgenes ajustados para centrar bien el grafo
         fig.subplots_adjust(left=0.05, right=0.95, top=0.98, bottom=0.05)
         
+        from matplotlib.lines import Line2D
+        grafo = self.agente.obtener_grafo()
+        if len(grafo) > RenderizadorGrafo.UMBRAL_NODOS:
+            # Grafo grande: colecciones de matplotlib y etiquetas sólo donde importan
+            self._renderizador = RenderizadorGrafo(
+                ax, grafo, self._posiciones_grandes(), self._estilo_nodo,
+                self.agente.formatear_nombre)
+            self._renderizador.mostrar_caminos_alternativos(
+                self.caminos_alternativos, self.COLORES_ALTERNATIVOS)
+            leyenda_alternativos = [
+                Line2D([0], [0], color=self.COLORES_ALTERNATIVOS[i % len(self.COLORES_ALTERNATIVOS)],
+                       linewidth=3, linestyle='--',
+                       label=f'Alternativa {i + 1} ({len(alternativo) - 1} saltos)')
+                for i, alternativo in enumerate(self.caminos_alternativos)
+            ]
+        else:
+            self._renderizador = None
+            leyenda_alternativos = self._dibujar_con_networkx(ax)
+        
+        # Leyenda
+        from matplotlib.patches import Patch
+        legend = [
+            Patch(facecolor='#f39c12', edgecolor='black', label='Explorando ahora'),
+            Patch(facecolor='#27ae60', edgecolor='black', label='En camino actual'),
+            Patch(facecolor='#95a5a6', edgecolor='black', label='Visitado'),
+            Patch(facecolor='#ecf0f1', edgecolor='black', label='No visitado'),
+            Patch(facecolor='#e74c3c', edgecolor='black',
+                  label='OTITIS (objetivo)' if len(self.agente.objetivos) == 1 else 'Diagnósticos (objetivos)')
+        ] + leyenda_alternativos
+        if con_podados:
+            legend.append(Patch(facecolor='#dfe6e9', edgecolor='#b2bec3', label='Podado (sin salida)'))
+        if self._renderizador is None:
+            ax.legend(handles=legend, loc='upper right', fontsize=10, framealpha=0.95,
+                     edgecolor='black', fancybox=True, shadow=True)
+        else:
+            # Debajo del grafo: queda en el fondo estático sin tapar nodos
+            fig.subplots_adjust(bottom=0.1)
+            ax.legend(handles=legend, loc='upper center', bbox_to_anchor=(0.5, -0.01),
+                      ncol=4, fontsize=9, edgecolor='black')
+        
+        self._titulo_grafo = ax.set_title("", fontsize=15, fontweight='bold', pad=20, color='#2c3e50')
+        ax.axis('off')
+        
+        # Embed en tkinter: el canvas se reutiliza hasta la próxima reconstrucción
+        self._figura = fig
+        self._canvas_grafo = FigureCanvasTkAgg(fig, master=self.frame_grafo)
+        self._canvas_grafo.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        if self._renderizador is not None:
+            self._renderizador.agregar_animado(self._titulo_grafo)
+            self._renderizador.conectar(self._canvas_grafo)
+    
+    def _posiciones_grandes(self):
+        """Layout por niveles de un grafo grande (se recalcula por versión)"""
+        if self._layout_grande is None or self._layout_grande[0] != self.agente.version:
+            self._layout_grande = (self.agente.version,
+                                   layout_por_niveles(self.agente.obtener_grafo(), self.agente.objetivos))
+        return self._layout_grande[1]
+    
+    def _dibujar_con_networkx(self, ax):
+        """
+        Dibujo detallado de un grafo chico (nodos grandes, todas las
+        etiquetas y flechas). Retorna la leyenda de los caminos alternativos.
+        """
+        from matplotlib.lines import Line2D
         G = nx.DiGraph()
+        G.add_nodes_from(self.agente.obtener_grafo())
         for nodo, vecinos in self.agente.obtener_grafo().items():
             for vecino in vecinos:
                 G.add_edge(nodo, vecino)
         
-        pos = self._layout_jerarquico()
+        pos = self._posiciones_nodos()
+        nodos = list(G.nodes())
         
-        # Colores
-        node_colors = []
-        node_sizes = []
-        
-        nodo_actual = paso['nodo_actual']
-        visitados = paso['visitados']
-        camino = paso['camino']
-        
-        for node in G.nodes():
-            if node == nodo_actual:
-                node_colors.append('#f39c12')  # Naranja - explorando
-                node_sizes.append(5000)
-            elif node in camino:
-                node_colors.append('#27ae60')  # Verde - en camino
-                node_sizes.append(4500)
-            elif node in visitados:
-                node_colors.append('#95a5a6')  # Gris - visitado
-                node_sizes.append(4000)
-            elif node == "OTITIS":
-                node_colors.append('#e74c3c')  # Rojo - objetivo
-                node_sizes.append(5500)
-            else:
-                node_colors.append('#ecf0f1')  # Gris claro - no visitado
-                node_sizes.append(4000)
+        # Estado base de cada nodo; los pasos lo modifican en el lugar
+        self._indice_nodos = {node: i for i, node in enumerate(nodos)}
+        self._estilo_nodos = {node: self._estilo_nodo(node) for node in nodos}
+        self._nodos_resaltados = set()
+        node_sizes = [self._estilo_nodos[n][1] for n in nodos]
+        self._colores_nodos = np.array([to_rgba(self._estilo_nodos[n][0]) for n in nodos])
+        self._bordes_nodos = np.array([to_rgba('black')] * len(nodos))
+        self._tamanos_nodos = np.array(node_sizes, dtype=float)
         
         # Dibujar nodos
-        nx.draw_networkx_nodes(G, pos, node_color=node_colors, node_size=node_sizes,
-                               edgecolors='black', linewidths=2.5, ax=ax)
+        self._coleccion_nodos = nx.draw_networkx_nodes(
+            G, pos, nodelist=nodos, node_color=self._colores_nodos, node_size=self._tamanos_nodos,
+            edgecolors=self._bordes_nodos, linewidths=2.5, ax=ax)
         
         # Dibujar etiquetas CON MEJOR LEGIBILIDAD
         labels = {}
-        for node in G.nodes():
+        for node in nodos:
             nombre = self.agente.formatear_nombre(node)
             # Separar en dos líneas si es muy largo
             if len(nombre) > 10:
@@ -1016,45 +1133,71 @@ class App:
             else:
                 labels[node] = nombre
         
-        nx.draw_networkx_labels(G, pos, labels, font_size=9, font_weight='bold',
-                                font_color='black', ax=ax,
-                                bbox=dict(boxstyle='round,pad=0.3', facecolor='white',
-                                        edgecolor='none', alpha=0.9))
+        self._etiquetas_nodos = nx.draw_networkx_labels(
+            G, pos, labels, font_size=9, font_weight='bold', font_color='black', ax=ax,
+            bbox=dict(boxstyle='round,pad=0.3', facecolor='white', edgecolor='none', alpha=0.9))
         
         # Dibujar aristas MÁS DELGADAS para no saturar
         nx.draw_networkx_edges(G, pos, arrows=True, arrowsize=18, arrowstyle='-|>',
                               edge_color='#34495e', width=2, ax=ax, alpha=0.6,
                               node_size=node_sizes, min_source_margin=30, min_target_margin=30)
         
-        # Leyenda
-        from matplotlib.patches import Patch
-        legend = [
-            Patch(facecolor='#f39c12', edgecolor='black', label='Explorando ahora'),
-            Patch(facecolor='#27ae60', edgecolor='black', label='En camino actual'),
-            Patch(facecolor='#95a5a6', edgecolor='black', label='Visitado'),
-            Patch(facecolor='#ecf0f1', edgecolor='black', label='No visitado'),
-            Patch(facecolor='#e74c3c', edgecolor='black', label='OTITIS (objetivo)')
-        ]
-        ax.legend(handles=legend, loc='upper right', fontsize=10, framealpha=0.95,
-                 edgecolor='black', fancybox=True, shadow=True)
-        
-        ax.set_title(f"Paso {paso['paso']}: Explorando '{self.agente.formatear_nombre(nodo_actual)}'",
-                    fontsize=15, fontweight='bold', pad=20, color='#2c3e50')
-        
-        # Límites ajustados al nuevo layout
-        ax.set_xlim(-0.5, 12.5)
-        ax.set_ylim(-3.5, 7)
-        ax.axis('off')
-        
-        # Líneas de nivel (opcionales, sutiles) - COMENTADAS para menos desorden
-        # for y in [6, 4, 2, 0, -2.5]:
-        #     ax.axhline(y=y, color='lightgray', linestyle='--', linewidth=0.5, alpha=0.2)
+        # Caminos alternativos: cada uno con su color y curvatura propia
+        leyenda_alternativos = []
+        for i, alternativo in enumerate(self.caminos_alternativos):
+            color = self.COLORES_ALTERNATIVOS[i % len(self.COLORES_ALTERNATIVOS)]
+            aristas = list(zip(alternativo[:-1], alternativo[1:]))
+            nx.draw_networkx_edges(G, pos, edgelist=aristas, arrows=True, arrowsize=22,
+                                   arrowstyle='-|>', edge_color=color, width=4, ax=ax,
+                                   style='dashed', connectionstyle=f'arc3,rad={0.12 * (i + 1)}',
+                                   node_size=node_sizes, min_source_margin=30, min_target_margin=30)
+            leyenda_alternativos.append(
+                Line2D([0], [0], color=color, linewidth=3, linestyle='--',
+                       label=f'Alternativa {i + 1} ({len(alternativo) - 1} saltos)'))
+        
+        # Límites ajustados al layout (se amplían si hay síntomas nuevos)
+        xs = [x for x, _ in pos.values()]
+        ys = [y for _, y in pos.values()]
+        ax.set_xlim(min(-0.5, min(xs) - 1), max(12.5, max(xs) + 1))
+        ax.set_ylim(min(-3.5, min(ys) - 1.5), max(7, max(ys) + 1))
+        return leyenda_alternativos
+    
+    def _posiciones_nodos(self):
+        """
+        Posiciones de todos los nodos del grafo actual.
         
-        # Embed en tkinter sin bloqueos
-        canvas = FigureCanvasTkAgg(fig, master=self.frame_grafo)
-        canvas.draw_idle()  # Usar draw_idle en lugar de draw para evitar bloqueos
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        plt.close(fig)
+        Cuando cambia la versión del grafo sólo se ubican los nodos NUEVOS;
+        los existentes conservan su posición para no desorientar al usuario.
+        """
+        if self._version_layout != self.agente.version:
+            for nodo in self.agente.obtener_grafo():
+                if nodo not in self._posiciones:
+                    self._posiciones[nodo] = self._ubicar_nodo_nuevo(nodo)
+            self._version_layout = self.agente.version
+        return self._posiciones
+    
+    def _ubicar_nodo_nuevo(self, nodo):
+        """Ubica un nodo debajo de sus predecesores (o encima de sus sucesores)"""
+        previos = [self._posiciones[p] for p in self.agente.obtener_predecesores(nodo)
+                   if p in self._posiciones]
+        siguientes = [self._posiciones[v] for v in self.agente.obtener_vecinos(nodo)
+                      if v in self._posiciones]
+        
+        if previos:
+            x = sum(px for px, _ in previos) / len(previos)
+            y = min(py for _, py in previos) - 1.5
+        elif siguientes:
+            x = sum(sx for sx, _ in siguientes) / len(siguientes)
+            y = max(sy for _, sy in siguientes) + 1.5
+        else:
+            # Sin conexiones: nueva columna a la derecha del nivel superior
+            x = max(px for px, _ in self._posiciones.values()) + 1.5
+            y = 6
+        
+        # Desplazar a la derecha hasta no pisar otro nodo
+        while any(abs(x - px) < 1.2 and abs(y - py) < 0.8 for px, py in self._posiciones.values()):
+            x += 1.2
+        return (x, y)
     
     def _layout_jerarquico(self):
         """
@@ -1095,17 +1238,34 @@ class App:
             'OTITIS': (6, -2)
         }
     
+    def _cerrar(self):
+        """Lleva a disco las respuestas pendientes antes de salir"""
+        self._cancelar_busqueda(descartar=True)
+        self.registro_sesiones.cerrar()
+        self.root.destroy()
+    
     def _limpiar(self):
         self.sintoma_seleccionado.set("")  # Deseleccionar radio button
+        self.selector_sintomas.limpiar()
         self.resultado = None
         self.paso_actual = 0
         self.btn_anterior.config(state=tk.DISABLED)
         self.btn_siguiente.config(state=tk.DISABLED)
         self.btn_historial.config(state=tk.DISABLED)
+        self.btn_alternativos.config(state=tk.DISABLED)
+        self.caminos_alternativos = []
         self.label_paso.config(text="Paso: 0/0")
-        self.canvas_estructura.delete("all")
+        self.linea_tiempo.set(1)
+        self.linea_tiempo.config(to=1, state=tk.DISABLED)
+        self.label_progreso.config(text="")
+        self._cancelar_busqueda(descartar=True)
+        self.panel_estructura.limpiar()
+        self._cancelar_interactivo()
         for widget in self.frame_grafo.winfo_children():
             widget.destroy()
+        self._figura = None
+        self._clave_figura = None
+        self._renderizador = None
 
 
 if __name__ == "__main__":
@@ -0,0 +1,274 @@
+"""
+Cache de Resultados - Resultados de BFS/DFS guardados en disco (SQLite)
+La clave es la huella del contenido del grafo (grafo, pesos y objetivos)
+más la consulta, así cualquier proceso reutiliza lo que ya calcularon otros
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from control_busqueda import COMPLETO
+from traza import Traza
+
+
+ARCHIVO_CACHE = "resultados.sqlite"
+TAMANO_MAXIMO = 256 * 1024 * 1024  # bytes
+ALGORITMOS = ('bfs', 'dfs', 'bfs_niveles')
+# Aciertos que se acumulan en memoria antes de escribir su 'usado' en la base
+LOTE_USOS = 256
+# Segundos máximos que un acierto espera para llegar a la base
+ESPERA_USOS = 5.0
+
+# Cambia si cambia el formato guardado: las entradas viejas dejan de coincidir
+_VERSION_FORMATO = 1
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS resultados (
+    clave TEXT PRIMARY KEY,
+    resultado BLOB NOT NULL,
+    traza BLOB,
+    tamano INTEGER NOT NULL,
+    usado REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resultados_usado ON resultados (usado);
+"""
+
+
+def _comprimir(valor):
+    texto = json.dumps(valor, ensure_ascii=False, separators=(',', ':'))
+    return zlib.compress(texto.encode('utf-8'))
+
+
+def _descomprimir(datos):
+    return json.loads(zlib.decompress(datos).decode('utf-8'))
+
+
+class CacheResultados:
+    """
+    Cache persistente de resultados de búsqueda sobre SQLite.
+
+    Cada entrada es el resultado sin 'pasos' (JSON comprimido) y, si se
+    pidió `con_pasos`, la traza exportada (ver Traza.exportar) en otra
+    columna. La clave es un SHA-256 de la huella del agente
+    (AgenteOtitis.huella) más algoritmo, síntoma inicial, poda y objetivos:
+    cualquier cambio del grafo, de un peso o de los objetivos da otra clave.
+
+    Varios procesos pueden usar el mismo archivo: la base está en modo WAL
+    (las lecturas no bloquean a la escritura) y cada escritura es una
+    transacción IMMEDIATE que espera hasta `espera` segundos el turno.
+
+    Un acierto es sólo una lectura: la hora de uso queda en memoria y se
+    escribe en lote (cada LOTE_USOS aciertos o ESPERA_USOS segundos, al
+    guardar, al pedir estadísticas y al cerrar). La escritura del lote es
+    de mejor esfuerzo: si otro proceso tiene el turno de escritura no se
+    espera, se reintenta en el próximo lote.
+
+    Cuando el total guardado pasa de `tamano_maximo` bytes se borran las
+    entradas usadas hace más tiempo (LRU por la columna `usado`).
+    Sólo se guardan resultados completos, nunca los inconclusos.
+    """
+
+    def __init__(self, directorio="cache", tamano_maximo=TAMANO_MAXIMO, espera=30.0):
+        self.directorio = directorio
+        self.tamano_maximo = tamano_maximo
+        os.makedirs(directorio, exist_ok=True)
+        self.ruta = os.path.join(directorio, ARCHIVO_CACHE)
+
+        self.aciertos = 0
+        self.fallos = 0
+        self.espera = espera
+        self._usos = {}  # clave -> hora del último acierto, aún no escrita
+        self._ultima_escritura_usos = time.time()
+        self._bloqueo = threading.Lock()
+        self._conexion = sqlite3.connect(self.ruta, timeout=espera, isolation_level=None,
+                                         check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.executescript(_ESQUEMA)
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def clave(agente, algoritmo, sintoma_inicial, podar=False, objetivos=None):
+        """Clave de la consulta (hex): huella del agente + parámetros"""
+        if objetivos is None:
+            objetivos = agente.objetivos
+        elif isinstance(objetivos, str):
+            objetivos = (objetivos,)
+        consulta = [_VERSION_FORMATO, agente.huella(), algoritmo, sintoma_inicial,
+                    bool(podar), list(objetivos)]
+        texto = json.dumps(consulta, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+    def consultar(self, agente, algoritmo, sintoma_inicial, podar=False, objetivos=None,
+                  con_pasos=False):
+        """
+        Resultado de agente.<algoritmo>(sintoma_inicial, podar, objetivos),
+        leído del cache o calculado y guardado.
+
+        Sin `con_pasos` el resultado trae 'pasos' vacío (también al
+        calcularlo, así un acierto y un fallo dan lo mismo). Con `con_pasos`
+        trae la Traza; una entrada guardada sin traza cuenta como fallo y se
+        completa. 'desde_cache' dice si el resultado vino del disco.
+        """
+        if algoritmo not in ALGORITMOS:
+            raise ValueError(f"Algoritmo sin cache: {algoritmo}")
+        buscar = getattr(agente, algoritmo)
+        if sintoma_inicial not in agente.grafo:
+            return buscar(sintoma_inicial, podar=podar, objetivos=objetivos)
+
+        clave = self.clave(agente, algoritmo, sintoma_inicial, podar, objetivos)
+        resultado = self._leer(clave, con_pasos)
+        if resultado is not None:
+            self.aciertos += 1
+            return resultado
+
+        self.fallos += 1
+        resultado = buscar(sintoma_inicial, podar=podar, objetivos=objetivos)
+        if resultado['estado'] == COMPLETO:
+            self._guardar(clave, resultado, con_pasos)
+        if not con_pasos:
+            resultado['pasos'] = []
+        resultado['desde_cache'] = False
+        return resultado
+
+    def _leer(self, clave, con_pasos):
+        with self._bloqueo:
+            fila = self._conexion.execute(
+                "SELECT resultado, traza FROM resultados WHERE clave = ?", (clave,)).fetchone()
+            if fila is None or (con_pasos and fila[1] is None):
+                return None
+            ahora = time.time()
+            self._usos[clave] = ahora
+            if (len(self._usos) >= LOTE_USOS
+                    or ahora - self._ultima_escritura_usos >= ESPERA_USOS):
+                self._escribir_usos(esperar=False)
+
+        resultado = _descomprimir(fila[0])
+        pasos = []
+        if con_pasos:
+            datos = _descomprimir(fila[1])
+            if datos is not None:
+                pasos = Traza.importar(datos)
+        resultado['pasos'] = pasos
+        resultado['desde_cache'] = True
+        return resultado
+
+    def _guardar(self, clave, resultado, con_pasos):
+        datos = _comprimir({k: v for k, v in resultado.items() if k != 'pasos'})
+        traza = None
+        if con_pasos:
+            pasos = resultado['pasos']
+            # bfs_niveles no tiene traza: se guarda null para no recalcular
+            traza = _comprimir(pasos.exportar() if isinstance(pasos, Traza) else None)
+
+        with self._bloqueo:
+            conexion = self._conexion
+            conexion.execute("BEGIN IMMEDIATE")
+            try:
+                # Una entrada guardada sin traza no pisa la traza que ya estaba
+                conexion.execute(
+                    """
+                    INSERT INTO resultados (clave, resultado, traza, tamano, usado)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (clave) DO UPDATE SET
+                        resultado = excluded.resultado,
+                        traza = COALESCE(excluded.traza, traza),
+                        tamano = length(clave) + length(excluded.resultado)
+                                 + COALESCE(length(COALESCE(excluded.traza, traza)), 0),
+                        usado = excluded.usado
+                    """,
+                    (clave, datos, traza, len(clave) + len(datos) + len(traza or b""), time.time()))
+                # Ya se tiene el turno de escritura: los usos pendientes van gratis
+                self._actualizar_usos()
+                self._desalojar()
+                conexion.execute("COMMIT")
+            except BaseException:
+                conexion.execute("ROLLBACK")
+                raise
+
+    def _actualizar_usos(self):
+        """Escribe los usos pendientes (dentro de una transacción ya abierta)"""
+        if self._usos:
+            self._conexion.executemany(
+                "UPDATE resultados SET usado = max(usado, ?) WHERE clave = ?",
+                [(usado, clave) for clave, usado in self._usos.items()])
+            self._usos = {}
+        self._ultima_escritura_usos = time.time()
+
+    def _escribir_usos(self, esperar=True):
+        """
+        Lleva a la base los usos acumulados (con el bloqueo tomado). Con
+        esperar=False no espera el turno de escritura: si otro proceso lo
+        tiene, los usos quedan pendientes para el próximo intento.
+        """
+        if not self._usos:
+            return
+        conexion = self._conexion
+        if not esperar:
+            conexion.execute("PRAGMA busy_timeout = 0")
+        try:
+            conexion.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError:
+            self._ultima_escritura_usos = time.time()  # reintentar en el próximo lote
+            return
+        finally:
+            if not esperar:
+                conexion.execute(f"PRAGMA busy_timeout = {int(self.espera * 1000)}")
+        try:
+            self._actualizar_usos()
+            conexion.execute("COMMIT")
+        except BaseException:
+            conexion.execute("ROLLBACK")
+            raise
+
+    def _desalojar(self):
+        """Borra las entradas menos usadas hasta volver a `tamano_maximo` (dentro de la transacción)"""
+        total, = self._conexion.execute("SELECT total(tamano) FROM resultados").fetchone()
+        if total <= self.tamano_maximo:
+            return
+        viejas = []
+        for clave, tamano in self._conexion.execute(
+                "SELECT clave, tamano FROM resultados ORDER BY usado"):
+            viejas.append((clave,))
+            total -= tamano
+            if total <= self.tamano_maximo:
+                break
+        self._conexion.executemany("DELETE FROM resultados WHERE clave = ?", viejas)
+
+    # ------------------------------------------------------------------
+    # Mantenimiento
+    # ------------------------------------------------------------------
+
+    def estadisticas(self):
+        """Entradas y bytes en disco (todos los procesos) y aciertos/fallos de esta instancia"""
+        with self._bloqueo:
+            self._escribir_usos(esperar=False)
+            entradas, tamano = self._conexion.execute(
+                "SELECT count(*), total(tamano) FROM resultados").fetchone()
+        return {
+            'entradas': entradas,
+            'bytes': int(tamano),
+            'tamano_maximo': self.tamano_maximo,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos
+        }
+
+    def limpiar(self):
+        """Borra todas las entradas"""
+        with self._bloqueo:
+            self._usos = {}
+            self._conexion.execute("DELETE FROM resultados")
+
+    def cerrar(self):
+        """Escribe los usos pendientes y cierra la conexión"""
+        with self._bloqueo:
+            self._escribir_usos()
+            self._conexion.close()
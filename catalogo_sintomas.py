@@ -0,0 +1,69 @@
+"""
+Catálogo de Síntomas - Lista ordenada de síntomas con índice de prefijos
+Se arma una vez por versión del grafo y responde búsquedas "mientras se
+escribe" sin distinguir mayúsculas ni acentos
+"""
+
+from bisect import bisect_left
+import unicodedata
+
+
+def normalizar(texto):
+    """Minúsculas, sin acentos y con '_' como espacio: 'Escalofríos' -> 'escalofrios'"""
+    descompuesto = unicodedata.normalize('NFKD', texto.replace('_', ' '))
+    sin_marcas = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    return ' '.join(sin_marcas.casefold().split())
+
+
+class CatalogoSintomas:
+    """
+    Síntomas ordenados más un índice de prefijos.
+
+    El índice es una lista ordenada de claves normalizadas: el nombre
+    completo y cada sufijo que empieza en una palabra ("dolor punzante" y
+    "punzante"), así "pun" encuentra "Dolor Punzante". Una búsqueda son dos
+    búsquedas binarias más el recorrido de las claves que coinciden:
+    O(log n + coincidencias), sin mirar el resto del catálogo.
+    """
+
+    def __init__(self, sintomas, formatear=str):
+        self.sintomas = tuple(sorted(sintomas))
+        self.nombres = tuple(formatear(sintoma) for sintoma in self.sintomas)
+
+        claves = []
+        for i, (sintoma, nombre) in enumerate(zip(self.sintomas, self.nombres)):
+            variantes = {normalizar(nombre), normalizar(sintoma)}
+            for variante in variantes:
+                palabras = variante.split(' ')
+                for j in range(len(palabras)):
+                    claves.append((' '.join(palabras[j:]), i))
+        claves = sorted(set(claves))
+        self._claves = [clave for clave, _ in claves]
+        self._indices = [i for _, i in claves]
+
+    def __len__(self):
+        return len(self.sintomas)
+
+    def nombre(self, sintoma):
+        """Nombre para mostrar de un síntoma del catálogo"""
+        i = bisect_left(self.sintomas, sintoma)
+        if i == len(self.sintomas) or self.sintomas[i] != sintoma:
+            raise KeyError(sintoma)
+        return self.nombres[i]
+
+    def buscar(self, texto, limite=None):
+        """
+        Síntomas (en el orden del catálogo) con alguna palabra que empiece
+        por `texto`. Texto vacío: todo el catálogo.
+        """
+        prefijo = normalizar(texto)
+        if not prefijo:
+            return self.sintomas if limite is None else self.sintomas[:limite]
+
+        # Las claves que empiezan por el prefijo forman un rango contiguo
+        desde = bisect_left(self._claves, prefijo)
+        hasta = bisect_left(self._claves, prefijo + '\uffff', desde)
+        encontrados = sorted(set(self._indices[desde:hasta]))
+        if limite is not None:
+            encontrados = encontrados[:limite]
+        return tuple(self.sintomas[i] for i in encontrados)
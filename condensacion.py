@@ -0,0 +1,243 @@
+"""
+Condensación - Componentes fuertemente conexas y el DAG de componentes
+Los ciclos del grafo (fiebre ↔ escalofríos) se colapsan en un solo nodo;
+alcanzabilidad y orden topológico se resuelven sobre el DAG resultante y
+los caminos se expanden de vuelta a síntomas reales
+"""
+
+from collections import deque
+
+import numpy as np
+
+
+class Condensacion:
+    """
+    Componentes fuertemente conexas (CFC) de un GrafoCSR y su DAG.
+
+    Las CFC se calculan con Tarjan iterativo (sin recursión, sirve para
+    ciclos de cualquier largo) en O(V + E). Las componentes se numeran en
+    ORDEN TOPOLÓGICO: toda arista entre componentes va de una de número
+    menor a una de número mayor.
+
+    Arreglos:
+    - componente[nodo]: número de su componente
+    - miembros[inicio[c]:inicio[c + 1]]: nodos de la componente c (en el
+      orden en que quedaron en la pila de Tarjan)
+    - indptr / indices: aristas del DAG (sin repetir ni lazos), con una
+      arista real representante por cada una en `origen_real` / `destino_real`
+    """
+
+    def __init__(self, csr):
+        self.csr = csr
+        n = len(csr)
+        indptr = csr.indptr.tolist()
+        indices = csr.indices.tolist()
+
+        # Tarjan iterativo: pila de llamadas con (nodo, próxima arista)
+        numero = [-1] * n
+        bajo = [0] * n
+        en_pila = [False] * n
+        pila = []
+        componente = [-1] * n
+        componentes = []  # listas de miembros, en orden topológico inverso
+        contador = 0
+        for raiz in range(n):
+            if numero[raiz] >= 0:
+                continue
+            llamadas = [(raiz, indptr[raiz])]
+            numero[raiz] = bajo[raiz] = contador
+            contador += 1
+            pila.append(raiz)
+            en_pila[raiz] = True
+            while llamadas:
+                v, k = llamadas[-1]
+                if k < indptr[v + 1]:
+                    llamadas[-1] = (v, k + 1)
+                    w = indices[k]
+                    if numero[w] < 0:
+                        numero[w] = bajo[w] = contador
+                        contador += 1
+                        pila.append(w)
+                        en_pila[w] = True
+                        llamadas.append((w, indptr[w]))
+                    elif en_pila[w] and numero[w] < bajo[v]:
+                        bajo[v] = numero[w]
+                    continue
+                llamadas.pop()
+                if llamadas:
+                    padre = llamadas[-1][0]
+                    if bajo[v] < bajo[padre]:
+                        bajo[padre] = bajo[v]
+                if bajo[v] == numero[v]:
+                    # v es la raíz de una componente: sus miembros están arriba de él
+                    desde = len(pila) - 1
+                    while pila[desde] != v:
+                        desde -= 1
+                    miembros = pila[desde:]
+                    del pila[desde:]
+                    c = len(componentes)
+                    for w in miembros:
+                        en_pila[w] = False
+                        componente[w] = c
+                    componentes.append(miembros)
+
+        # Tarjan termina las componentes en orden topológico inverso
+        total = len(componentes)
+        self.componente = total - 1 - np.array(componente, dtype=np.intp)
+        componentes.reverse()
+        self.tamano = np.fromiter(map(len, componentes), dtype=np.intp, count=total)
+        self.inicio = np.zeros(total + 1, dtype=np.intp)
+        np.cumsum(self.tamano, out=self.inicio[1:])
+        self.miembros = np.fromiter((w for miembros in componentes for w in miembros),
+                                    dtype=np.intp, count=n)
+
+        # DAG: una arista por par de componentes distintas
+        desde = self.componente[csr.origen]
+        hasta = self.componente[csr.indices]
+        entre = np.flatnonzero(desde != hasta)
+        pares, primera = np.unique(desde[entre] * total + hasta[entre], return_index=True)
+        aristas = entre[primera]
+        self.indices = pares % total if total else pares
+        self.indptr = np.searchsorted(pares // total if total else pares,
+                                      np.arange(total + 1)).astype(np.intp)
+        self.origen_real = csr.origen[aristas]
+        self.destino_real = csr.indices[aristas]
+
+    def __len__(self):
+        return len(self.tamano)
+
+    @property
+    def ciclica(self):
+        """True si el grafo tiene algún ciclo (incluido un lazo nodo → nodo)"""
+        if (self.tamano > 1).any():
+            return True
+        return bool((self.csr.origen == self.csr.indices).any())
+
+    def orden_nodos(self):
+        """
+        Nodos en orden topológico de sus componentes. Dentro de un ciclo se
+        empieza por los nodos a los que llegan aristas de componentes
+        anteriores (por donde se ENTRA al ciclo) y se sigue en amplitud, así
+        las aristas que quedan "hacia atrás" son las que cierran el ciclo.
+        """
+        csr = self.csr
+        componente = self.componente.tolist()
+        # Nodos con alguna arista entrante desde otra componente
+        desde_afuera = np.zeros(len(csr), dtype=bool)
+        externas = self.componente[csr.origen] != self.componente[csr.indices]
+        desde_afuera[csr.indices[externas]] = True
+        desde_afuera = desde_afuera.tolist()
+        indptr, indices = csr.indptr.tolist(), csr.indices.tolist()
+
+        orden = []
+        for c in range(len(self)):
+            miembros = self.miembros[self.inicio[c]:self.inicio[c + 1]].tolist()
+            if len(miembros) == 1:
+                orden.append(miembros[0])
+                continue
+            entradas = [v for v in miembros if desde_afuera[v]] or miembros[:1]
+            ubicados = set(entradas)
+            cola = deque(entradas)
+            while cola:
+                v = cola.popleft()
+                orden.append(v)
+                for w in indices[indptr[v]:indptr[v + 1]]:
+                    if componente[w] == c and w not in ubicados:
+                        ubicados.add(w)
+                        cola.append(w)
+        return [csr.nodos[i] for i in orden]
+
+    def _vecinos(self, c):
+        return self.indices[self.indptr[c]:self.indptr[c + 1]]
+
+    # ------------------------------------------------------------------
+    # Alcanzabilidad sobre el DAG
+    # ------------------------------------------------------------------
+
+    def componentes_alcanzables(self, nodo):
+        """Arreglo booleano por componente: alcanzables desde `nodo` (incluida la suya)"""
+        alcanzadas = np.zeros(len(self), dtype=bool)
+        inicio = self.componente[self.csr.indice[nodo]]
+        alcanzadas[inicio] = True
+        pendientes = [inicio]
+        while pendientes:
+            c = pendientes.pop()
+            for d in self._vecinos(c).tolist():
+                if not alcanzadas[d]:
+                    alcanzadas[d] = True
+                    pendientes.append(d)
+        return alcanzadas
+
+    def alcanzables(self, nodo):
+        """Síntomas a los que se puede ir desde `nodo` (incluido él), componente por componente"""
+        alcanzadas = np.flatnonzero(self.componentes_alcanzables(nodo))
+        indices = [self.miembros[self.inicio[c]:self.inicio[c + 1]] for c in alcanzadas]
+        return [self.csr.nodos[i] for i in np.concatenate(indices).tolist()]
+
+    # ------------------------------------------------------------------
+    # Caminos
+    # ------------------------------------------------------------------
+
+    def _dentro(self, c, desde, hasta):
+        """Camino (índices) de `desde` a `hasta` sin salir de la componente c"""
+        if desde == hasta:
+            return [desde]
+        padres = {desde: -1}
+        cola = deque([desde])
+        indptr, indices = self.csr.indptr, self.csr.indices
+        while cola:
+            v = cola.popleft()
+            for w in indices[indptr[v]:indptr[v + 1]].tolist():
+                if w in padres or self.componente[w] != c:
+                    continue
+                padres[w] = v
+                if w == hasta:
+                    camino = [w]
+                    while padres[camino[-1]] >= 0:
+                        camino.append(padres[camino[-1]])
+                    camino.reverse()
+                    return camino
+                cola.append(w)
+        raise AssertionError("Los nodos de una componente fuerte siempre se conectan")
+
+    def camino(self, origen, destino):
+        """
+        Camino de síntomas reales de `origen` a `destino`, o None.
+
+        Primero se busca el camino con menos componentes en el DAG; luego
+        cada componente se cruza por dentro desde el nodo por el que se entró
+        hasta el que tiene la arista de salida.
+        """
+        i, j = self.csr.indice[origen], self.csr.indice[destino]
+        ci, cj = self.componente[i], self.componente[j]
+        if cj < ci:
+            return None  # orden topológico: no hay camino hacia atrás
+
+        previa = {ci: -1}  # componente -> arista del DAG por la que se llegó
+        cola = deque([ci])
+        while cola and cj not in previa:
+            c = cola.popleft()
+            for k in range(self.indptr[c], self.indptr[c + 1]):
+                d = self.indices[k]
+                if d not in previa and d <= cj:
+                    previa[d] = k
+                    cola.append(d)
+        if cj not in previa:
+            return None
+
+        aristas = []
+        c = cj
+        while previa[c] >= 0:
+            k = previa[c]
+            aristas.append(k)
+            c = self.componente[self.origen_real[k]]
+        aristas.reverse()
+
+        camino = []
+        entrada = i
+        for k in aristas:
+            salida = self.origen_real[k]
+            camino += self._dentro(self.componente[entrada], entrada, salida)
+            entrada = self.destino_real[k]
+        camino += self._dentro(cj, entrada, j)
+        return [self.csr.nodos[v] for v in camino]
@@ -0,0 +1,91 @@
+"""
+Control de Búsqueda - Cancelación, presupuesto de nodos y tiempo límite
+Las búsquedas consultan un ControlBusqueda antes de expandir cada nodo y,
+si se alcanza un límite, terminan con un resultado parcial 'inconcluso'
+"""
+
+import threading
+import time
+
+
+COMPLETO = 'completo'
+INCONCLUSO = 'inconcluso'
+
+# Motivos de un resultado inconcluso
+CANCELADA = 'cancelada'
+PRESUPUESTO = 'presupuesto'
+TIEMPO = 'tiempo'
+# Búsqueda en haz que descartó nodos sin llegar al diagnóstico (ver AgenteOtitis.busqueda_haz)
+HAZ = 'haz'
+
+
+class TokenCancelacion:
+    """
+    Señal para detener una búsqueda desde otro hilo (por ejemplo el botón
+    Cancelar de la GUI). Se puede compartir entre varias búsquedas.
+    """
+
+    def __init__(self):
+        self._evento = threading.Event()
+
+    def cancelar(self):
+        self._evento.set()
+
+    @property
+    def cancelado(self):
+        return self._evento.is_set()
+
+
+class ControlBusqueda:
+    """
+    Límites de UNA búsqueda:
+    - max_nodos: nodos que se pueden expandir (sacar de la frontera)
+    - tiempo_limite: segundos desde que empieza la búsqueda
+    - token: TokenCancelacion
+
+    `detener(expandidos)` retorna el motivo para parar ('cancelada',
+    'presupuesto' o 'tiempo') o None para seguir. El reloj se consulta cada
+    `cada` nodos para que el control no pese en búsquedas rápidas.
+    """
+
+    def __init__(self, max_nodos=None, tiempo_limite=None, token=None, cada=32):
+        if max_nodos is not None and max_nodos < 0:
+            raise ValueError(f"max_nodos debe ser >= 0 (recibido {max_nodos})")
+        if tiempo_limite is not None and tiempo_limite < 0:
+            raise ValueError(f"tiempo_limite debe ser >= 0 (recibido {tiempo_limite})")
+        self.max_nodos = max_nodos
+        self.token = token
+        self.cada = cada
+        self.plazo = None if tiempo_limite is None else time.perf_counter() + tiempo_limite
+
+    @classmethod
+    def crear(cls, max_nodos=None, tiempo_limite=None, token=None):
+        """ControlBusqueda para los argumentos dados, o None si no hay límites"""
+        if max_nodos is None and tiempo_limite is None and token is None:
+            return None
+        return cls(max_nodos, tiempo_limite, token)
+
+    def detener(self, expandidos):
+        if self.token is not None and self.token.cancelado:
+            return CANCELADA
+        if self.max_nodos is not None and expandidos >= self.max_nodos:
+            return PRESUPUESTO
+        if self.plazo is not None and expandidos % self.cada == 0 \
+                and time.perf_counter() >= self.plazo:
+            return TIEMPO
+        return None
+
+
+def marcar_estado(resultado, motivo=None, frontera=()):
+    """
+    Agrega 'estado' al resultado. Si la búsqueda se detuvo (`motivo`) el
+    resultado es 'inconcluso' y lleva el 'motivo' y la 'frontera' que
+    quedó sin explorar; 'encontrado' sólo dice lo alcanzado hasta ahí.
+    """
+    if motivo is None:
+        resultado['estado'] = COMPLETO
+    else:
+        resultado['estado'] = INCONCLUSO
+        resultado['motivo'] = motivo
+        resultado['frontera'] = list(frontera)
+    return resultado
@@ -0,0 +1,223 @@
+"""
+Post-dominadores - Árbol de post-dominadores del grafo respecto de un objetivo
+Un síntoma d post-domina a x si TODO camino de x al diagnóstico pasa por d;
+el árbol responde "qué síntomas son inevitables desde x" y "cuál es la
+última compuerta común de varios síntomas iniciales"
+"""
+
+import numpy as np
+
+
+class ArbolPostdominadores:
+    """
+    Árbol de post-dominadores hacia `objetivo` sobre un GrafoCSR.
+
+    Es el árbol de dominadores del grafo INVERTIDO con raíz en el objetivo,
+    calculado con Lengauer–Tarjan (versión con compresión de caminos,
+    O(m log n)), todo iterativo. El padre de x en el árbol (`idom[x]`) es
+    el primer síntoma por el que pasan obligatoriamente todos los caminos de
+    x al objetivo; sus ancestros son TODOS los síntomas inevitables.
+
+    Los nodos que no llegan al objetivo quedan fuera del árbol
+    (profundidad -1). Arreglos por índice del CSR:
+    - idom: padre en el árbol (-1 en la raíz y fuera del árbol)
+    - profundidad: saltos en el árbol hasta el objetivo
+    - entrada / salida: recorrido en preorden del árbol, para saber si d es
+      ancestro de x en O(1): entrada[d] <= entrada[x] y salida[x] <= salida[d]
+    """
+
+    def __init__(self, csr, objetivo):
+        self.csr = csr
+        self.objetivo = objetivo
+        n = len(csr)
+        raiz = csr.indice[objetivo]
+
+        indptr = csr.indptr.tolist()
+        indices = csr.indices.tolist()
+        indptr_inv = csr.indptr_inv.tolist()
+        # Sucesores en el grafo invertido = predecesores en el original
+        predecesores = csr.origen[csr.arista_inv].tolist()
+
+        # 1) DFS desde la raíz por el grafo invertido: número de cada nodo
+        numero = [-1] * n
+        vertice = []
+        padre = [-1] * n
+        numero[raiz] = 0
+        vertice.append(raiz)
+        pila = [(raiz, indptr_inv[raiz])]
+        while pila:
+            v, k = pila[-1]
+            if k == indptr_inv[v + 1]:
+                pila.pop()
+                continue
+            pila[-1] = (v, k + 1)
+            w = predecesores[k]
+            if numero[w] < 0:
+                numero[w] = len(vertice)
+                vertice.append(w)
+                padre[w] = v
+                pila.append((w, indptr_inv[w]))
+
+        # 2) Semidominadores, de atrás hacia adelante (Lengauer–Tarjan)
+        semi = numero[:]
+        ancestro = [-1] * n
+        etiqueta = list(range(n))
+        idom = [-1] * n
+        # Cubetas como listas enlazadas: primero[v] -> siguiente[w] -> ...
+        primero = [-1] * n
+        siguiente = [-1] * n
+
+        def evaluar(v):
+            """Nodo de menor semi en el camino del bosque hasta v (con compresión)"""
+            if ancestro[v] < 0:
+                return v
+            cadena = []
+            while ancestro[ancestro[v]] >= 0:
+                cadena.append(v)
+                v = ancestro[v]
+            for u in reversed(cadena):
+                a = ancestro[u]
+                if semi[etiqueta[a]] < semi[etiqueta[u]]:
+                    etiqueta[u] = etiqueta[a]
+                ancestro[u] = ancestro[a]
+            return etiqueta[cadena[0]] if cadena else etiqueta[v]
+
+        for i in range(len(vertice) - 1, 0, -1):
+            w = vertice[i]
+            # Predecesores en el grafo invertido = sucesores en el original
+            for v in indices[indptr[w]:indptr[w + 1]]:
+                if numero[v] < 0:
+                    continue
+                # Casos sin compresión resueltos sin llamar a evaluar
+                a = ancestro[v]
+                if a < 0:
+                    u = v
+                elif ancestro[a] < 0:
+                    u = etiqueta[v]
+                else:
+                    u = evaluar(v)
+                if semi[u] < semi[w]:
+                    semi[w] = semi[u]
+            s = vertice[semi[w]]
+            siguiente[w] = primero[s]
+            primero[s] = w
+            p = padre[w]
+            ancestro[w] = p
+            v = primero[p]
+            while v >= 0:
+                u = evaluar(v)
+                idom[v] = u if semi[u] < semi[v] else p
+                v = siguiente[v]
+            primero[p] = -1
+
+        # 3) Dominadores inmediatos definitivos, en orden del DFS
+        for w in vertice[1:]:
+            if idom[w] != vertice[semi[w]]:
+                idom[w] = idom[idom[w]]
+
+        self.idom = np.array(idom, dtype=np.intp)
+        profundidad = [-1] * n
+        profundidad[raiz] = 0
+        for w in vertice[1:]:
+            profundidad[w] = profundidad[idom[w]] + 1
+        self.profundidad = np.array(profundidad, dtype=np.intp)
+
+        # 4) Preorden del árbol (entrada / salida) para consultas de ancestro
+        en_arbol = np.array(vertice[1:], dtype=np.intp)
+        orden = en_arbol[np.argsort(self.idom[en_arbol], kind='stable')]
+        inicio_hijos = np.searchsorted(self.idom[orden], np.arange(n + 1)).tolist()
+        orden = orden.tolist()
+        entrada = [-1] * n
+        salida = [-1] * n
+        reloj = 0
+        pila = [(raiz, False)]
+        while pila:
+            v, cerrar = pila.pop()
+            if cerrar:
+                salida[v] = reloj
+                continue
+            entrada[v] = reloj
+            reloj += 1
+            pila.append((v, True))
+            pila.extend((h, False) for h in reversed(orden[inicio_hijos[v]:inicio_hijos[v + 1]]))
+        self.entrada = np.array(entrada, dtype=np.intp)
+        self.salida = np.array(salida, dtype=np.intp)
+
+    # ------------------------------------------------------------------
+    # Consultas de a un nodo (O(profundidad))
+    # ------------------------------------------------------------------
+
+    def llega(self, nodo):
+        """True si el nodo tiene algún camino hasta el objetivo"""
+        return self.profundidad[self.csr.indice[nodo]] >= 0
+
+    def inevitables(self, nodo):
+        """
+        Síntomas por los que pasa TODO camino de `nodo` al objetivo, del más
+        cercano al más lejano (sin el nodo ni el objetivo). None si el nodo
+        no llega al objetivo.
+        """
+        v = self.csr.indice[nodo]
+        if self.profundidad[v] < 0:
+            return None
+        cadena = []
+        v = self.idom[v]
+        while v >= 0 and self.profundidad[v] > 0:
+            cadena.append(self.csr.nodos[v])
+            v = self.idom[v]
+        return cadena
+
+    def compuerta(self, nodos):
+        """
+        Primer síntoma por el que pasan todos los caminos desde CUALQUIERA de
+        los nodos (su ancestro común más profundo). Puede ser uno de ellos o
+        el objetivo mismo; None si alguno no llega al objetivo.
+        """
+        indices = np.array([self.csr.indice[nodo] for nodo in nodos], dtype=np.intp)
+        if not len(indices) or (self.profundidad[indices] < 0).any():
+            return None
+        comun = indices[0]
+        for v in indices[1:]:
+            comun = self.ancestro_comun(np.array([comun]), np.array([v]))[0]
+        return self.csr.nodos[comun]
+
+    # ------------------------------------------------------------------
+    # Consultas por lotes (arreglos de índices del CSR)
+    # ------------------------------------------------------------------
+
+    def domina(self, d, x):
+        """d[i] post-domina a x[i] (o son el mismo nodo), para todo i, en O(1) cada uno"""
+        d = np.asarray(d, dtype=np.intp)
+        x = np.asarray(x, dtype=np.intp)
+        validos = (self.profundidad[d] >= 0) & (self.profundidad[x] >= 0)
+        return (validos & (self.entrada[d] <= self.entrada[x])
+                & (self.salida[x] <= self.salida[d]))
+
+    def ancestro_comun(self, a, b):
+        """
+        Ancestro común más profundo de cada par (a[i], b[i]); -1 si alguno
+        no llega al objetivo. Sube todos los pares a la vez: tantas
+        iteraciones vectoriales como la profundidad máxima del lote.
+        """
+        a = np.array(a, dtype=np.intp)
+        b = np.array(b, dtype=np.intp)
+        invalidos = (self.profundidad[a] < 0) | (self.profundidad[b] < 0)
+        a[invalidos] = b[invalidos] = self.csr.indice[self.objetivo]
+
+        # Igualar profundidades subiendo el más profundo de cada par
+        while True:
+            mas_a = self.profundidad[a] > self.profundidad[b]
+            mas_b = self.profundidad[b] > self.profundidad[a]
+            if not (mas_a.any() or mas_b.any()):
+                break
+            a[mas_a] = self.idom[a[mas_a]]
+            b[mas_b] = self.idom[b[mas_b]]
+        # Subir juntos hasta que coincidan
+        distintos = a != b
+        while distintos.any():
+            a[distintos] = self.idom[a[distintos]]
+            b[distintos] = self.idom[b[distintos]]
+            distintos = a != b
+
+        a[invalidos] = -1
+        return a
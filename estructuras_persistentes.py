@@ -0,0 +1,287 @@
+"""
+Estructuras Persistentes - Conjunto, cola y pila inmutables con estructura compartida
+Cada modificación retorna una versión nueva que comparte casi todo con la
+anterior, así guardar todas las versiones (para deshacer) cuesta O(log n)
+por cambio en vez de copiar los visitados y la frontera completos
+"""
+
+from collections.abc import Set
+
+
+_BITS = 5
+_ANCHO = 1 << _BITS       # 32 hijos por nodo
+_MASCARA = _ANCHO - 1
+_BITS_HASH = 64
+
+
+def _hash(valor):
+    return hash(valor) & ((1 << _BITS_HASH) - 1)
+
+
+class _Nodo:
+    """Nodo HAMT: `mapa` tiene un bit por cada hijo presente, `hijos` sólo los presentes"""
+
+    __slots__ = ('mapa', 'hijos')
+
+    def __init__(self, mapa, hijos):
+        self.mapa = mapa
+        self.hijos = hijos
+
+
+class _Colision:
+    """Valores distintos con el mismo hash (los 64 bits)"""
+
+    __slots__ = ('hash', 'valores')
+
+    def __init__(self, hash_, valores):
+        self.hash = hash_
+        self.valores = valores
+
+
+_VACIO = _Nodo(0, ())
+
+
+def _fusionar(a, hash_a, b, hash_b, nivel):
+    """Subárbol con las dos entradas a y b (hashes distintos) desde `nivel`"""
+    ia = (hash_a >> nivel) & _MASCARA
+    ib = (hash_b >> nivel) & _MASCARA
+    if ia == ib:
+        return _Nodo(1 << ia, (_fusionar(a, hash_a, b, hash_b, nivel + _BITS),))
+    hijos = (a, b) if ia < ib else (b, a)
+    return _Nodo((1 << ia) | (1 << ib), hijos)
+
+
+def _agregar(nodo, valor, h, nivel):
+    """Nodo con `valor` agregado (el mismo nodo si ya estaba)"""
+    bit = 1 << ((h >> nivel) & _MASCARA)
+    posicion = (nodo.mapa & (bit - 1)).bit_count()
+    if not nodo.mapa & bit:
+        hijos = nodo.hijos[:posicion] + (valor,) + nodo.hijos[posicion:]
+        return _Nodo(nodo.mapa | bit, hijos)
+
+    entrada = nodo.hijos[posicion]
+    if isinstance(entrada, _Nodo):
+        nueva = _agregar(entrada, valor, h, nivel + _BITS)
+        if nueva is entrada:
+            return nodo
+    elif isinstance(entrada, _Colision):
+        if valor in entrada.valores:
+            return nodo
+        if entrada.hash == h:
+            nueva = _Colision(h, entrada.valores + (valor,))
+        else:
+            nueva = _fusionar(entrada, entrada.hash, valor, h, nivel + _BITS)
+    else:
+        if entrada == valor:
+            return nodo
+        hash_entrada = _hash(entrada)
+        if hash_entrada == h:
+            nueva = _Colision(h, (entrada, valor))
+        else:
+            nueva = _fusionar(entrada, hash_entrada, valor, h, nivel + _BITS)
+    return _Nodo(nodo.mapa, nodo.hijos[:posicion] + (nueva,) + nodo.hijos[posicion + 1:])
+
+
+def _recorrer(nodo):
+    for entrada in nodo.hijos:
+        if isinstance(entrada, _Nodo):
+            yield from _recorrer(entrada)
+        elif isinstance(entrada, _Colision):
+            yield from entrada.valores
+        else:
+            yield entrada
+
+
+class ConjuntoPersistente(Set):
+    """
+    Conjunto inmutable (hash array mapped trie de 32 hijos por nodo).
+
+    `agregar` retorna un conjunto nuevo en O(log32 n) copiando sólo el
+    camino hasta la hoja; el original sigue válido. Pertenencia O(log32 n).
+    Se usa como un set de sólo lectura: in, len, iteración, |, &.
+    """
+
+    __slots__ = ('_raiz', '_tamano')
+
+    def __init__(self, valores=()):
+        self._raiz = _VACIO
+        self._tamano = 0
+        for valor in valores:
+            nueva = _agregar(self._raiz, valor, _hash(valor), 0)
+            if nueva is not self._raiz:
+                self._raiz = nueva
+                self._tamano += 1
+
+    @classmethod
+    def _desde(cls, raiz, tamano):
+        conjunto = cls.__new__(cls)
+        conjunto._raiz = raiz
+        conjunto._tamano = tamano
+        return conjunto
+
+    def agregar(self, valor):
+        raiz = _agregar(self._raiz, valor, _hash(valor), 0)
+        if raiz is self._raiz:
+            return self
+        return self._desde(raiz, self._tamano + 1)
+
+    def __contains__(self, valor):
+        try:
+            h = _hash(valor)
+        except TypeError:
+            return False
+        nodo, nivel = self._raiz, 0
+        while True:
+            bit = 1 << ((h >> nivel) & _MASCARA)
+            if not nodo.mapa & bit:
+                return False
+            entrada = nodo.hijos[(nodo.mapa & (bit - 1)).bit_count()]
+            if isinstance(entrada, _Nodo):
+                nodo = entrada
+                nivel += _BITS
+            elif isinstance(entrada, _Colision):
+                return valor in entrada.valores
+            else:
+                return entrada == valor
+
+    def __iter__(self):
+        return _recorrer(self._raiz)
+
+    def __len__(self):
+        return self._tamano
+
+    def __repr__(self):
+        return f"ConjuntoPersistente({{{', '.join(map(repr, self))}}})"
+
+    def copy(self):
+        return set(self)
+
+
+class PilaPersistente:
+    """
+    Pila inmutable como lista enlazada de celdas (valor, resto).
+
+    `meter` y `sacar` son O(1) y comparten el resto de la pila. `proximo`
+    es el TOPE; se itera desde la BASE, como una lista.
+    """
+
+    __slots__ = ('_celda', '_tamano')
+
+    def __init__(self, valores=()):
+        self._celda = None
+        self._tamano = 0
+        for valor in valores:
+            self._celda = (valor, self._celda)
+            self._tamano += 1
+
+    @classmethod
+    def _desde(cls, celda, tamano):
+        pila = cls.__new__(cls)
+        pila._celda = celda
+        pila._tamano = tamano
+        return pila
+
+    def meter(self, valor):
+        return self._desde((valor, self._celda), self._tamano + 1)
+
+    def proximo(self):
+        if self._celda is None:
+            raise IndexError("La pila está vacía")
+        return self._celda[0]
+
+    def sacar(self):
+        """Pila sin el tope"""
+        if self._celda is None:
+            raise IndexError("La pila está vacía")
+        return self._desde(self._celda[1], self._tamano - 1)
+
+    def __len__(self):
+        return self._tamano
+
+    def __iter__(self):
+        valores = []
+        celda = self._celda
+        while celda is not None:
+            valores.append(celda[0])
+            celda = celda[1]
+        return reversed(valores)
+
+    def __repr__(self):
+        return f"PilaPersistente({list(self)!r})"
+
+
+def _anexar(nodo, nivel, i, valor):
+    """Trie con `valor` en la posición i (la siguiente libre)"""
+    if nivel == 0:
+        return nodo + (valor,)
+    indice = (i >> nivel) & _MASCARA
+    if indice < len(nodo):
+        return nodo[:indice] + (_anexar(nodo[indice], nivel - _BITS, i, valor),)
+    return nodo + (_anexar((), nivel - _BITS, i, valor),)
+
+
+class ColaPersistente:
+    """
+    Cola FIFO inmutable sobre un vector persistente (trie de 32 hijos).
+
+    `meter` copia sólo el camino hasta la última hoja, O(log32 n); `sacar`
+    avanza el inicio en O(1) y `proximo` lee el frente en O(log32 n). Los
+    elementos ya sacados siguen en el trie hasta que la cola se vacía.
+    """
+
+    __slots__ = ('_raiz', '_nivel', '_inicio', '_fin')
+
+    def __init__(self, valores=()):
+        self._raiz = ()
+        self._nivel = 0
+        self._inicio = self._fin = 0
+        cola = self
+        for valor in valores:
+            cola = cola.meter(valor)
+        self._raiz, self._nivel, self._fin = cola._raiz, cola._nivel, cola._fin
+
+    @classmethod
+    def _desde(cls, raiz, nivel, inicio, fin):
+        cola = cls.__new__(cls)
+        cola._raiz = raiz
+        cola._nivel = nivel
+        cola._inicio = inicio
+        cola._fin = fin
+        return cola
+
+    def _leer(self, i):
+        nodo = self._raiz
+        for nivel in range(self._nivel, 0, -_BITS):
+            nodo = nodo[(i >> nivel) & _MASCARA]
+        return nodo[i & _MASCARA]
+
+    def meter(self, valor):
+        raiz, nivel = self._raiz, self._nivel
+        if self._fin == _ANCHO << nivel:
+            # Trie lleno: la raíz pasa a ser el primer hijo de una nueva
+            raiz, nivel = (raiz,), nivel + _BITS
+        raiz = _anexar(raiz, nivel, self._fin, valor)
+        return self._desde(raiz, nivel, self._inicio, self._fin + 1)
+
+    def proximo(self):
+        if self._inicio == self._fin:
+            raise IndexError("La cola está vacía")
+        return self._leer(self._inicio)
+
+    def sacar(self):
+        """Cola sin el frente"""
+        if self._inicio == self._fin:
+            raise IndexError("La cola está vacía")
+        if self._inicio + 1 == self._fin:
+            return ColaPersistente()
+        return self._desde(self._raiz, self._nivel, self._inicio + 1, self._fin)
+
+    def __len__(self):
+        return self._fin - self._inicio
+
+    def __iter__(self):
+        for i in range(self._inicio, self._fin):
+            yield self._leer(i)
+
+    def __repr__(self):
+        return f"ColaPersistente({list(self)!r})"
@@ -0,0 +1,281 @@
+"""
+Flujo de Pasos - Consumidores de los pasos de una búsqueda mientras ocurre
+Observadores para progreso en la GUI, escritura a disco y métricas, y un
+canal acotado (con contrapresión) para consumir los pasos desde otro hilo
+"""
+
+import json
+import queue
+import threading
+import time
+from collections.abc import Set
+
+from control_busqueda import TokenCancelacion
+
+
+# Cada cuánto (segundos) un productor bloqueado revisa si el canal se cerró
+ESPERA_CANAL = 0.1
+
+
+def materializar(paso, campos=None):
+    """
+    Copia un paso (PasoVista o dict) a un dict independiente de la traza.
+
+    `campos` limita las claves copiadas: la cola/pila y los visitados son
+    O(tamaño) por paso, así que un consumidor que sólo necesita
+    ('paso', 'nodo_actual') evita ese costo.
+    """
+    claves = campos if campos is not None else paso.keys()
+    copia = {}
+    for clave in claves:
+        if clave in paso:
+            valor = paso[clave]
+            # Las vistas de la traza (visitados/podados) se copian a set
+            copia[clave] = set(valor) if isinstance(valor, Set) else valor
+    return copia
+
+
+class ObservadorPasos:
+    """
+    Interfaz de los consumidores de pasos.
+
+    La búsqueda llama a `al_paso(paso)` justo después de registrar cada paso
+    (antes de sacar el nodo) y a `al_terminar(resultado)` al final. El paso
+    es una vista de la traza: 'en_camino' todavía vale False porque el camino
+    final no se conoce. Los métodos corren en el hilo de la búsqueda, así
+    que un observador lento la frena.
+    """
+
+    def al_paso(self, paso):
+        pass
+
+    def al_terminar(self, resultado):
+        pass
+
+
+class _Funcion(ObservadorPasos):
+    """Adapta una función f(paso) como observador"""
+
+    def __init__(self, funcion):
+        self.funcion = funcion
+
+    def al_paso(self, paso):
+        self.funcion(paso)
+
+
+def normalizar_observadores(observadores):
+    """Acepta observadores o funciones sueltas f(paso)"""
+    return [o if isinstance(o, ObservadorPasos) else _Funcion(o) for o in observadores or ()]
+
+
+class MetricasPasos(ObservadorPasos):
+    """
+    Métricas de una búsqueda en curso: pasos, visitados, frontera máxima y
+    ritmo. Sólo escribe enteros, así que otro hilo (la GUI) puede leerlas
+    en cualquier momento.
+    """
+
+    def __init__(self):
+        self.pasos = 0
+        self.visitados = 0
+        self.frontera = 0
+        self.frontera_maxima = 0
+        self.nodo_actual = None
+        self.terminado = False
+        self.encontrado = None
+        self._inicio = time.perf_counter()
+        self._fin = None
+
+    def al_paso(self, paso):
+        self.pasos = paso['paso']
+        self.nodo_actual = paso['nodo_actual']
+        self.visitados = len(paso['visitados'])
+        # Tamaño de la frontera sin copiarla cuando el paso es de una Traza
+        if hasattr(paso, 'tamano_frontera'):
+            self.frontera = paso.tamano_frontera()
+        else:
+            self.frontera = len(paso.get('cola') or paso.get('pila') or ())
+        self.frontera_maxima = max(self.frontera_maxima, self.frontera)
+
+    def al_terminar(self, resultado):
+        self._fin = time.perf_counter()
+        self.encontrado = resultado['encontrado']
+        self.terminado = True
+
+    @property
+    def segundos(self):
+        return (self._fin or time.perf_counter()) - self._inicio
+
+    def pasos_por_segundo(self):
+        return self.pasos / self.segundos if self.segundos > 0 else 0.0
+
+    def resumen(self):
+        return {
+            'pasos': self.pasos,
+            'visitados': self.visitados,
+            'frontera_maxima': self.frontera_maxima,
+            'segundos': self.segundos,
+            'pasos_por_segundo': self.pasos_por_segundo(),
+            'encontrado': self.encontrado
+        }
+
+
+class EscritorJSONL(ObservadorPasos):
+    """
+    Escribe cada paso como una línea JSON a medida que ocurre.
+
+    Los conjuntos se guardan como listas. Al terminar agrega una línea
+    {"fin": true, ...} con el resultado y cierra el archivo. Si la búsqueda
+    lanza una excepción no hay `al_terminar`: usarlo como contexto cierra el
+    archivo igual:
+
+        with EscritorJSONL("traza.jsonl") as escritor:
+            agente.dfs("zumbido", observadores=[escritor])
+    """
+
+    def __init__(self, ruta, campos=None):
+        self.campos = campos
+        self._archivo = open(ruta, "w", encoding="utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+        return False
+
+    def cerrar(self):
+        """Cierra el archivo (se puede llamar más de una vez)"""
+        self._archivo.close()
+
+    def al_paso(self, paso):
+        registro = materializar(paso, self.campos)
+        for clave, valor in registro.items():
+            if isinstance(valor, set):
+                registro[clave] = list(valor)
+        self._archivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+    def al_terminar(self, resultado):
+        self._archivo.write(json.dumps({
+            'fin': True,
+            'encontrado': resultado['encontrado'],
+            'camino_final': resultado['camino_final'],
+            'nodos_explorados': resultado['nodos_explorados']
+        }, ensure_ascii=False) + "\n")
+        self.cerrar()
+
+
+_FIN = object()
+
+
+class CanalPasos(ObservadorPasos):
+    """
+    Canal acotado entre la búsqueda (productor) y un consumidor en otro hilo.
+
+    Con bloquear=True la búsqueda ESPERA cuando el canal tiene `capacidad`
+    pasos sin consumir (contrapresión: nunca hay más de `capacidad` copias en
+    memoria). Con bloquear=False los pasos que no entran se descartan y se
+    cuentan en `descartados` (útil para vistas de progreso).
+
+    Si el consumidor deja de leer (un `break` en el for, o `cerrar()` desde
+    la GUI) el canal se cierra: se vacía la cola, el productor deja de
+    esperar y los pasos siguientes se descartan. La búsqueda lanzada con
+    `ejecutar` recibe el `token` del canal, así que además se cancela y
+    termina 'inconclusa' (salvo que se le haya pasado otro token).
+
+    Uso:
+        canal = CanalPasos(capacidad=64)
+        canal.ejecutar(agente.bfs, "zumbido", ventana=100)
+        for paso in canal:
+            ...
+        canal.resultado
+    """
+
+    def __init__(self, capacidad=64, bloquear=True, campos=None):
+        self.bloquear = bloquear
+        self.campos = campos
+        self.descartados = 0
+        self.resultado = None
+        self.error = None
+        self.token = TokenCancelacion()
+        self._cola = queue.Queue(maxsize=capacidad)
+        self._cerrado = threading.Event()
+        self._hilo = None
+
+    @property
+    def cerrado(self):
+        return self._cerrado.is_set()
+
+    def _poner(self, elemento):
+        """put que espera de a ESPERA_CANAL segundos y se rinde si el canal se cierra"""
+        while not self._cerrado.is_set():
+            try:
+                self._cola.put(elemento, timeout=ESPERA_CANAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def al_paso(self, paso):
+        if self._cerrado.is_set():
+            self.descartados += 1
+            return
+        copia = materializar(paso, self.campos)
+        if self.bloquear:
+            if not self._poner(copia):
+                self.descartados += 1
+        else:
+            try:
+                self._cola.put_nowait(copia)
+            except queue.Full:
+                self.descartados += 1
+
+    def al_terminar(self, resultado):
+        self.resultado = resultado
+        self._poner(_FIN)
+
+    def ejecutar(self, buscar, *args, **kwargs):
+        """Corre buscar(*args, observadores=[self], token=self.token, **kwargs) en un hilo"""
+        kwargs.setdefault('token', self.token)
+
+        def correr():
+            try:
+                buscar(*args, observadores=[self], **kwargs)
+            except Exception as error:  # se relanza en el consumidor
+                self.error = error
+                self._poner(_FIN)
+
+        self._hilo = threading.Thread(target=correr, daemon=True)
+        self._hilo.start()
+        return self
+
+    def cerrar(self):
+        """
+        El consumidor ya no lee: cancela la búsqueda, libera al productor si
+        estaba esperando lugar y descarta lo que quedó en la cola.
+        """
+        self._cerrado.set()
+        self.token.cancelar()
+        while True:
+            try:
+                self._cola.get_nowait()
+            except queue.Empty:
+                break
+
+    def __iter__(self):
+        terminado = False
+        try:
+            while True:
+                paso = self._cola.get()
+                if paso is _FIN:
+                    break
+                yield paso
+            terminado = True
+        finally:
+            # break del consumidor (GeneratorExit) o excepción: cerrar el canal
+            if not terminado:
+                self.cerrar()
+        if self._hilo is not None:
+            self._hilo.join()
+        if self.error is not None:
+            raise self.error
@@ -0,0 +1,223 @@
+"""
+Grafo CSR - Adyacencia comprimida en arreglos NumPy y BFS por niveles
+El BFS avanza un nivel completo por iteración con operaciones vectoriales y
+elige en cada nivel entre expandir la frontera (top-down) o buscar padres
+desde los no visitados (bottom-up), como el BFS "direction-optimizing"
+"""
+
+from itertools import chain
+
+import numpy as np
+
+
+# Cambio de dirección (Beamer): se pasa a bottom-up cuando las aristas que
+# salen de la frontera superan a las que llegan a los no visitados / ALFA,
+# y se vuelve a top-down cuando la frontera baja de n / BETA nodos
+ALFA = 2
+BETA = 24
+
+
+def _rangos(inicios, largos):
+    """Índices inicios[i] .. inicios[i] + largos[i] concatenados, en orden"""
+    total = int(largos.sum())
+    if not total:
+        return np.empty(0, dtype=np.intp)
+    desplazamiento = np.repeat(inicios - (np.cumsum(largos) - largos), largos)
+    return np.arange(total, dtype=np.intp) + desplazamiento
+
+
+class GrafoCSR:
+    """
+    Adyacencia nodo -> vecinos en formato CSR (indptr / indices) con los
+    vecinos en el MISMO orden que las listas del grafo, más la adyacencia
+    inversa. Cada arista inversa guarda su posición en la lista del origen
+    para reproducir el orden de descubrimiento del BFS con cola.
+    """
+
+    def __init__(self, grafo):
+        self.nodos = list(grafo)
+        self.indice = {nodo: i for i, nodo in enumerate(self.nodos)}
+        n = len(self.nodos)
+
+        grados = np.fromiter(map(len, grafo.values()), dtype=np.intp, count=n)
+        self.indptr = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(grados, out=self.indptr[1:])
+        self.indices = np.array(list(map(self.indice.__getitem__, chain.from_iterable(grafo.values()))),
+                                dtype=np.intp)
+        self.grados = grados
+        # Origen de cada arista (misma numeración que `indices`)
+        self.origen = np.repeat(np.arange(n, dtype=np.intp), grados)
+
+        # Inversa: aristas agrupadas por destino, en orden de arista original
+        orden = np.argsort(self.indices, kind='stable')
+        self.grados_entrada = np.bincount(self.indices, minlength=n).astype(np.intp)
+        self.indptr_inv = np.zeros(n + 1, dtype=np.intp)
+        np.cumsum(self.grados_entrada, out=self.indptr_inv[1:])
+        self.arista_inv = orden  # número de arista (CSR directo) de cada arista inversa
+
+    def __len__(self):
+        return len(self.nodos)
+
+    def mascara(self, nodos):
+        """Arreglo booleano con True en los nodos dados"""
+        mascara = np.zeros(len(self.nodos), dtype=bool)
+        indices = [self.indice[nodo] for nodo in nodos if nodo in self.indice]
+        mascara[indices] = True
+        return mascara
+
+    # ------------------------------------------------------------------
+    # Un nivel
+    # ------------------------------------------------------------------
+
+    def _top_down(self, frontera, permitido):
+        """
+        Siguiente nivel expandiendo la frontera: (nodos, padres) en el orden
+        en que una cola FIFO los descubriría.
+        """
+        aristas = _rangos(self.indptr[frontera], self.grados[frontera])
+        destinos = self.indices[aristas]
+        nuevos = permitido[destinos]
+        destinos = destinos[nuevos]
+        if not len(destinos):
+            return destinos, destinos
+        # Primera aparición de cada destino (el primer padre en la cola)
+        _, primera = np.unique(destinos, return_index=True)
+        primera.sort()
+        return destinos[primera], self.origen[aristas[nuevos][primera]]
+
+    def _bottom_up(self, frontera, permitido):
+        """
+        Siguiente nivel buscando, para cada nodo no visitado, su padre en la
+        frontera. Entre varios padres gana el que la cola sacaría primero
+        (posición en la frontera, luego posición en su lista de vecinos),
+        así que el resultado es idéntico al de _top_down.
+        """
+        n = len(self.nodos)
+        candidatos = np.flatnonzero(permitido)
+        aristas = self.arista_inv[_rangos(self.indptr_inv[candidatos],
+                                          self.grados_entrada[candidatos])]
+        origenes = self.origen[aristas]
+        rango = np.full(n, -1, dtype=np.intp)
+        rango[frontera] = np.arange(len(frontera), dtype=np.intp)
+        en_frontera = rango[origenes] >= 0
+        aristas = aristas[en_frontera]
+        if not len(aristas):
+            return aristas, aristas
+        origenes = origenes[en_frontera]
+        destinos = self.indices[aristas]
+        # Clave de orden FIFO: (rango del padre, posición en su lista)
+        clave = rango[origenes] * (int(self.grados.max()) + 1) + (aristas - self.indptr[origenes])
+        orden = np.lexsort((clave, destinos))
+        destinos, clave, origenes = destinos[orden], clave[orden], origenes[orden]
+        primera = np.ones(len(destinos), dtype=bool)
+        primera[1:] = destinos[1:] != destinos[:-1]
+        destinos, clave, origenes = destinos[primera], clave[primera], origenes[primera]
+        orden = np.argsort(clave, kind='stable')
+        return destinos[orden], origenes[orden]
+
+    # ------------------------------------------------------------------
+    # BFS completo
+    # ------------------------------------------------------------------
+
+    def bfs_niveles(self, inicio, objetivos, mascara=None):
+        """
+        BFS nivel a nivel desde el índice `inicio` hasta sacar todos los
+        `objetivos` (índices) o agotar el grafo, con el mismo recorrido que
+        un BFS con cola. `mascara` (booleano) limita los nodos que se pueden
+        encolar (poda).
+
+        Retorna un diccionario con:
+        - 'padres': padre de cada nodo descubierto (-1 en el resto)
+        - 'alcanzados': [(objetivo, posición en la cola)] en orden de salida
+        - 'visitados': nodos encolados hasta que salió el último objetivo
+        - 'expandidos': booleano de los nodos que salieron de la cola y
+          expandieron sus vecinos
+        - 'podados': con `mascara`, cuántos nodos fuera de ella eran vecinos
+          de un nodo expandido (los que el BFS con cola marca como podados)
+        - 'niveles': niveles expandidos y 'bottom_up' cuántos de ellos
+          se hicieron de abajo hacia arriba
+        """
+        n = len(self.nodos)
+        padres = np.full(n, -1, dtype=np.intp)
+        permitido = np.ones(n, dtype=bool) if mascara is None else mascara.copy()
+        permitido[inicio] = False
+        expandidos = np.zeros(n, dtype=bool)
+        pendientes = set(objetivos)
+        es_objetivo = np.zeros(n, dtype=bool)
+        es_objetivo[list(pendientes)] = True
+
+        frontera = np.array([inicio], dtype=np.intp)
+        visitados = 1
+        sacados = 0  # nodos que salieron de la cola en niveles anteriores
+        alcanzados = []
+        niveles = bottom_up = 0
+        # Aristas que llegan a nodos aún encolables (costo de un paso bottom-up)
+        aristas_sin_visitar = int(self.grados_entrada[permitido].sum())
+        usar_bottom_up = False
+
+        while len(frontera):
+            # Objetivos del nivel, en el orden en que salen de la cola
+            corte = len(frontera)
+            if pendientes:
+                for posicion in np.flatnonzero(es_objetivo[frontera]):
+                    objetivo = int(frontera[posicion])
+                    if objetivo not in pendientes:
+                        continue
+                    pendientes.discard(objetivo)
+                    alcanzados.append((objetivo, sacados + int(posicion) + 1))
+                    if not pendientes:
+                        corte = int(posicion)
+                        break
+            if corte < len(frontera):
+                # El último objetivo sale a mitad del nivel: sólo expanden
+                # los que salieron antes que él, y no hace falta seguir
+                expandidos[frontera[:corte]] = True
+                siguiente, _ = self._top_down(frontera[:corte], permitido)
+                visitados += len(siguiente)
+                niveles += 1
+                break
+
+            expandidos[frontera] = True
+            aristas_frontera = int(self.grados[frontera].sum())
+            if not usar_bottom_up:
+                usar_bottom_up = aristas_frontera > aristas_sin_visitar / ALFA
+            else:
+                usar_bottom_up = len(frontera) >= n / BETA
+            if usar_bottom_up:
+                siguiente, padres_siguiente = self._bottom_up(frontera, permitido)
+                bottom_up += 1
+            else:
+                siguiente, padres_siguiente = self._top_down(frontera, permitido)
+            niveles += 1
+
+            padres[siguiente] = padres_siguiente
+            permitido[siguiente] = False
+            aristas_sin_visitar -= int(self.grados_entrada[siguiente].sum())
+            visitados += len(siguiente)
+            sacados += len(frontera)
+            frontera = siguiente
+
+        podados = 0
+        if mascara is not None:
+            fuera = expandidos[self.origen] & ~mascara[self.indices]
+            fuera[self.indices == inicio] = False
+            podados = len(np.unique(self.indices[fuera]))
+
+        return {
+            'padres': padres,
+            'alcanzados': alcanzados,
+            'visitados': visitados,
+            'expandidos': expandidos,
+            'podados': podados,
+            'niveles': niveles,
+            'bottom_up': bottom_up,
+        }
+
+    def camino(self, padres, nodo):
+        """Camino inicio -> nodo siguiendo los padres"""
+        camino = []
+        while nodo >= 0:
+            camino.append(self.nodos[nodo])
+            nodo = padres[nodo]
+        camino.reverse()
+        return camino
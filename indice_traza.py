@@ -0,0 +1,242 @@
+"""
+Índice de Traza - Pasos guardados como fotogramas completos cada k pasos más diferencias
+Cualquier paso se reconstruye desde el fotograma anterior aplicando a lo
+sumo k - 1 diferencias; k crece solo para que los fotogramas no pasen de un
+presupuesto de memoria
+"""
+
+from collections.abc import Sequence
+
+
+# Nodos que pueden ocupar en total los fotogramas (frontera + visitados + camino)
+PRESUPUESTO = 1_000_000
+
+# Claves que se guardan como diferencias; el resto del paso se guarda tal cual
+_CLAVES_ESTADO = ('visitados', 'camino', 'en_camino')
+
+
+def _diferencia(anterior, nueva, desde_frente=False):
+    """
+    (quitar_frente, quitar_final, agregados) tal que
+    nueva == anterior[quitar_frente:len(anterior) - quitar_final] + agregados
+
+    Una pila o un camino cambian por el final (prefijo común); una cola
+    saca por el frente, así que con `desde_frente` se prueba también
+    "salió el primero".
+    """
+    comun = 0
+    for a, b in zip(anterior, nueva):
+        if a != b:
+            break
+        comun += 1
+    mejor = (0, len(anterior) - comun, tuple(nueva[comun:]))
+    if desde_frente and anterior:
+        resto = len(anterior) - 1
+        if len(nueva) - resto < len(mejor[2]) and anterior[1:] == nueva[:resto]:
+            mejor = (1, 0, tuple(nueva[resto:]))
+    return mejor
+
+
+def _aplicar(lista, inicio, diferencia):
+    """Aplica una diferencia a lista[inicio:] en su lugar; retorna el nuevo inicio"""
+    quitar_frente, quitar_final, agregados = diferencia
+    if quitar_final:
+        del lista[len(lista) - quitar_final:]
+    lista.extend(agregados)
+    return inicio + quitar_frente
+
+
+class IndiceTraza(Sequence):
+    """
+    Traza de pasos (diccionarios con 'cola' o 'pila', 'visitados', 'camino')
+    con acceso aleatorio en O(k) y memoria acotada.
+
+    Cada paso guarda sus claves simples (paso, nodo_actual, ...) y la
+    DIFERENCIA con el paso anterior: qué salió y entró en la frontera y en
+    el camino, y qué nodos se agregaron/quitaron de visitados. Cada k pasos
+    se guarda además un fotograma completo. Leer el paso i parte del
+    fotograma i - i % k y aplica como mucho k - 1 diferencias.
+
+    k empieza en 1 y se duplica (descartando un fotograma de cada dos)
+    cada vez que los fotogramas superan `presupuesto` nodos: una traza corta
+    tiene todos los pasos completos y una larga ocupa
+    O(pasos + presupuesto) sin importar su longitud.
+
+    'en_camino' se deriva al leer de los caminos fijados con `finalizar`.
+
+    `agregar(paso)` con el estado completo calcula la diferencia comparando
+    con el paso anterior: O(tamaño del estado). Una búsqueda que ya sabe
+    qué cambió (el nodo que salió, los hijos que entraron) la pasa en
+    `cambios` y el paso cuesta O(cambios); el estado completo sólo se copia
+    en los fotogramas.
+    """
+
+    def __init__(self, estructura, presupuesto=PRESUPUESTO):
+        self.estructura = estructura
+        self.presupuesto = presupuesto
+        self.k = 1
+        self.claves = None
+        self._claves_simples = ()
+        self.en_caminos = frozenset()
+
+        self._simples = []      # por paso: tupla con las claves simples
+        self._diferencias = []  # por paso: (frontera, agregados, quitados, camino)
+        self._fotogramas = {}   # paso -> (frontera, visitados, camino)
+        self._costo = 0
+
+        # Estado del último paso agregado (la frontera es _frontera[_inicio:])
+        self._frontera = []
+        self._inicio = 0
+        self._visitados = set()
+        self._camino = []
+
+    # ------------------------------------------------------------------
+    # Construcción
+    # ------------------------------------------------------------------
+
+    def agregar(self, paso, cambios=None):
+        """
+        Agrega un paso (se copia lo necesario: el llamador puede seguir
+        modificando sus estructuras).
+
+        Sin `cambios` el paso trae el estado completo (frontera, 'visitados'
+        y 'camino'). Con `cambios` trae sólo las claves simples y el estado
+        sale del paso anterior más
+        (frontera, visitados_agregados, visitados_quitados, camino), donde
+        frontera y camino son (quitar_frente, quitar_final, agregados).
+        El primer paso siempre va completo.
+        """
+        i = len(self._simples)
+        if self.claves is None:
+            if cambios is not None:
+                raise ValueError("El primer paso de la traza debe traer el estado completo")
+            self.claves = tuple(paso)
+            self._claves_simples = tuple(clave for clave in self.claves
+                                         if clave not in _CLAVES_ESTADO and clave != self.estructura)
+        self._simples.append(tuple(paso[clave] for clave in self._claves_simples))
+
+        if cambios is None:
+            frontera = list(paso[self.estructura])
+            visitados = set(paso['visitados'])
+            camino = list(paso['camino'])
+            if i:
+                self._diferencias.append((
+                    _diferencia(self._frontera[self._inicio:], frontera, self.estructura == 'cola'),
+                    tuple(visitados - self._visitados),
+                    tuple(self._visitados - visitados),
+                    _diferencia(self._camino, camino),
+                ))
+            else:
+                self._diferencias.append(None)
+            self._frontera = frontera
+            self._inicio = 0
+            self._visitados = visitados
+            self._camino = camino
+        else:
+            d_frontera, agregados, quitados, d_camino = cambios
+            diferencia = ((d_frontera[0], d_frontera[1], tuple(d_frontera[2])),
+                          tuple(agregados), tuple(quitados),
+                          (d_camino[0], d_camino[1], tuple(d_camino[2])))
+            self._diferencias.append(diferencia)
+            self._inicio = self._avanzar(diferencia, self._frontera, self._inicio,
+                                         self._visitados, self._camino)
+            # Una cola que sólo saca por el frente se compacta de vez en cuando
+            if self._inicio > len(self._frontera) // 2:
+                del self._frontera[:self._inicio]
+                self._inicio = 0
+
+        if i % self.k == 0:
+            self._guardar_fotograma(i)
+
+    def _guardar_fotograma(self, i):
+        fotograma = (tuple(self._frontera[self._inicio:]), frozenset(self._visitados),
+                     tuple(self._camino))
+        self._fotogramas[i] = fotograma
+        self._costo += sum(map(len, fotograma))
+        while self._costo > self.presupuesto and len(self._fotogramas) > 1:
+            self._duplicar_k()
+
+    def _duplicar_k(self):
+        """k *= 2: sólo sobreviven los fotogramas múltiplos del nuevo k"""
+        self.k *= 2
+        self._fotogramas = {i: f for i, f in self._fotogramas.items() if i % self.k == 0}
+        self._costo = sum(sum(map(len, f)) for f in self._fotogramas.values())
+
+    def finalizar(self, caminos):
+        """Fija los caminos finales; 'en_camino' de cada paso se deriva de ellos"""
+        en_caminos = set()
+        for camino in caminos:
+            en_caminos.update(camino)
+        self.en_caminos = frozenset(en_caminos)
+
+    @property
+    def num_fotogramas(self):
+        return len(self._fotogramas)
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+
+    def _paso(self, i, frontera, inicio, visitados, camino):
+        paso = dict(zip(self._claves_simples, self._simples[i]))
+        paso[self.estructura] = frontera[inicio:]
+        paso['visitados'] = visitados
+        paso['camino'] = camino
+        paso['en_camino'] = paso['nodo_actual'] in self.en_caminos
+        return {clave: paso[clave] for clave in self.claves}
+
+    def _desde_fotograma(self, j):
+        frontera, visitados, camino = self._fotogramas[j]
+        return list(frontera), 0, set(visitados), list(camino)
+
+    @staticmethod
+    def _avanzar(diferencia, frontera, inicio, visitados, camino):
+        d_frontera, agregados, quitados, d_camino = diferencia
+        inicio = _aplicar(frontera, inicio, d_frontera)
+        visitados.difference_update(quitados)
+        visitados.update(agregados)
+        _aplicar(camino, 0, d_camino)
+        return inicio
+
+    def ultimo_paso(self):
+        """
+        El último paso agregado sin pasar por un fotograma: O(frontera +
+        camino). 'visitados' es el conjunto interno de la traza; vale como
+        vista mientras no se agregue otro paso (ver materializar).
+        """
+        i = len(self._simples) - 1
+        if i < 0:
+            raise IndexError(i)
+        return self._paso(i, self._frontera, self._inicio, self._visitados, list(self._camino))
+
+    def __len__(self):
+        return len(self._simples)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError(indice)
+
+        j = indice - indice % self.k
+        frontera, inicio, visitados, camino = self._desde_fotograma(j)
+        for diferencia in self._diferencias[j + 1:indice + 1]:
+            inicio = self._avanzar(diferencia, frontera, inicio, visitados, camino)
+        return self._paso(indice, frontera, inicio, visitados, camino)
+
+    def __iter__(self):
+        """Recorrido secuencial: una diferencia por paso, sin volver a los fotogramas"""
+        if not self._simples:
+            return
+        frontera, inicio, visitados, camino = self._desde_fotograma(0)
+        for i in range(len(self)):
+            if i:
+                inicio = self._avanzar(self._diferencias[i], frontera, inicio, visitados, camino)
+            yield self._paso(i, frontera, inicio, set(visitados), list(camino))
+
+    def __eq__(self, otro):
+        if isinstance(otro, (IndiceTraza, list)):
+            return len(self) == len(otro) and all(a == b for a, b in zip(self, otro))
+        return NotImplemented
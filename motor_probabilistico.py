@@ -0,0 +1,227 @@
+"""
+Motor Probabilístico de Diagnóstico
+Propaga la evidencia (síntomas presentes / negados) sobre el grafo de síntomas
+con un modelo noisy-OR, en UNA pasada en orden topológico
+"""
+
+import heapq
+
+import numpy as np
+
+from grafo_csr import GrafoCSR
+from condensacion import Condensacion
+
+
+# Valores de evidencia por síntoma
+PRESENTE = 1
+DESCONOCIDO = 0
+NEGADO = -1
+
+
+class MotorProbabilistico:
+    """
+    Modelo noisy-OR sobre el grafo dirigido de síntomas.
+
+    Cada arista padre → hijo activa al hijo con probabilidad pesos[padre]:
+
+        P(hijo) = 1 - (1 - prior) · Π (1 - pesos[padre] · P(padre))
+
+    Los síntomas observados valen 1 y los negados 0. `prior` es la
+    probabilidad de que un síntoma aparezca sin que lo cause ningún padre
+    (0.0 = sólo cuenta la evidencia que se propaga por el grafo). El
+    objetivo nunca tiene prior: sólo se diagnostica a través de síntomas.
+    """
+
+    def __init__(self, grafo, pesos, objetivo="OTITIS", prior=0.0):
+        self.objetivo = objetivo
+        self.prior = prior
+
+        self.nodos = self._orden_topologico(grafo)
+        self.indice = {nodo: i for i, nodo in enumerate(self.nodos)}
+        n = len(self.nodos)
+
+        # Padres e hijos de cada nodo (por índice topológico)
+        self._padres = [[] for _ in range(n)]
+        self._hijos = [[] for _ in range(n)]
+        for nodo, vecinos in grafo.items():
+            i = self.indice[nodo]
+            for vecino in vecinos:
+                j = self.indice[vecino]
+                if j <= i:
+                    continue  # Arista que cierra un ciclo: se ignora
+                self._padres[j].append(i)
+                self._hijos[i].append(j)
+
+        self._fuerza = np.array([pesos.get(nodo, 0.0) for nodo in self.nodos])
+        self._padres_np = [np.array(p, dtype=np.intp) for p in self._padres]
+        self._prior = np.full(n, float(prior))
+        self._prior[self.indice[objetivo]] = 0.0
+
+        # Cache del último paciente: evidencia y probabilidad de cada nodo
+        self._evidencia = np.zeros(n, dtype=np.int8)
+        self._prob = self.probabilidades_lote(self._evidencia[None, :])[0].copy()
+
+    def _orden_topologico(self, grafo):
+        """
+        Orden topológico (Kahn).
+
+        Si el grafo tiene ciclos se usa el orden de su condensación: las
+        componentes fuertes en orden topológico y, dentro de cada una, los
+        síntomas en el orden en que se entró a ellos. Sólo se ignoran al
+        propagar las aristas que vuelven hacia atrás DENTRO de un ciclo
+        (aproximación: el ciclo no se retroalimenta); lo que está después
+        del ciclo se propaga normalmente.
+        """
+        grado_entrada = {nodo: 0 for nodo in grafo}
+        for vecinos in grafo.values():
+            for vecino in vecinos:
+                grado_entrada[vecino] = grado_entrada.get(vecino, 0) + 1
+
+        orden = []
+        pendientes = [nodo for nodo, grado in grado_entrada.items() if grado == 0]
+        while pendientes:
+            nodo = pendientes.pop()
+            orden.append(nodo)
+            for vecino in grafo.get(nodo, []):
+                grado_entrada[vecino] -= 1
+                if grado_entrada[vecino] == 0:
+                    pendientes.append(vecino)
+
+        if len(orden) != len(grado_entrada):
+            completo = {nodo: grafo.get(nodo, []) for nodo in grado_entrada}
+            orden = Condensacion(GrafoCSR(completo)).orden_nodos()
+        return orden
+
+    # ========================================================================
+    # EVIDENCIA
+    # ========================================================================
+
+    def vector_evidencia(self, observados=(), negados=()):
+        """Codifica la evidencia de un paciente como vector (1, 0, -1)"""
+        evidencia = np.zeros(len(self.nodos), dtype=np.int8)
+        for sintoma in observados:
+            evidencia[self.indice[sintoma]] = PRESENTE
+        for sintoma in negados:
+            evidencia[self.indice[sintoma]] = NEGADO
+        return evidencia
+
+    def matriz_evidencia(self, pacientes):
+        """Codifica un lote de pacientes [(observados, negados), ...] como matriz"""
+        matriz = np.zeros((len(pacientes), len(self.nodos)), dtype=np.int8)
+        for fila, (observados, negados) in enumerate(pacientes):
+            for sintoma in observados:
+                matriz[fila, self.indice[sintoma]] = PRESENTE
+            for sintoma in negados:
+                matriz[fila, self.indice[sintoma]] = NEGADO
+        return matriz
+
+    # ========================================================================
+    # PUNTUACIÓN VECTORIZADA (LOTES DE PACIENTES)
+    # ========================================================================
+
+    def probabilidades_lote(self, evidencias):
+        """
+        Probabilidad de cada nodo para un lote de pacientes.
+
+        Una sola pasada en orden topológico: cada nodo se calcula para TODOS
+        los pacientes a la vez con NumPy, así que el costo es O(V + E)
+        operaciones vectoriales de tamaño B.
+
+        Args:
+            evidencias: matriz (B, V) con valores PRESENTE / DESCONOCIDO / NEGADO
+
+        Returns:
+            Matriz (B, V) de probabilidades en el orden de `self.nodos`
+        """
+        evidencias = np.asarray(evidencias, dtype=np.int8)
+        # Trabajar por filas contiguas: una fila por nodo
+        ev = np.ascontiguousarray(evidencias.T)
+        prob = np.empty(ev.shape, dtype=np.float64)
+
+        for i, padres in enumerate(self._padres_np):
+            if padres.size:
+                contribucion = 1.0 - self._fuerza[padres, None] * prob[padres]
+                prob[i] = 1.0 - (1.0 - self._prior[i]) * np.prod(contribucion, axis=0)
+            else:
+                prob[i] = self._prior[i]
+            prob[i][ev[i] == PRESENTE] = 1.0
+            prob[i][ev[i] == NEGADO] = 0.0
+
+        return prob.T
+
+    def probabilidad_lote(self, evidencias):
+        """Probabilidad del objetivo para cada paciente del lote"""
+        return self.probabilidades_lote(evidencias)[:, self.indice[self.objetivo]]
+
+    def muestrear_pacientes(self, n, presentes=(), semilla=None):
+        """
+        Genera n pacientes simulados según el mismo modelo noisy-OR.
+
+        Retorna una matriz booleana (n, V) en el orden de `self.nodos`; los
+        síntomas de `presentes` valen siempre True.
+        """
+        rng = np.random.default_rng(semilla)
+        forzados = self.vector_evidencia(presentes) == PRESENTE
+        muestras = np.zeros((len(self.nodos), n), dtype=bool)
+
+        for i, padres in enumerate(self._padres_np):
+            if forzados[i]:
+                muestras[i] = True
+                continue
+            producto = np.full(n, 1.0 - self._prior[i])
+            for padre in padres:
+                producto *= np.where(muestras[padre], 1.0 - self._fuerza[padre], 1.0)
+            muestras[i] = rng.random(n) < 1.0 - producto
+
+        return muestras.T
+
+    # ========================================================================
+    # PUNTUACIÓN INCREMENTAL (UN PACIENTE)
+    # ========================================================================
+
+    def _valor_nodo(self, i):
+        if self._evidencia[i] == PRESENTE:
+            return 1.0
+        if self._evidencia[i] == NEGADO:
+            return 0.0
+        producto = 1.0 - self._prior[i]
+        for padre in self._padres[i]:
+            producto *= 1.0 - self._fuerza[padre] * self._prob[padre]
+        return 1.0 - producto
+
+    def _actualizar(self, observados, negados):
+        """
+        Lleva la cache al nuevo paciente.
+
+        Reutiliza el resultado de la llamada anterior: sólo se recalculan los
+        nodos cuya evidencia cambió y los descendientes cuyo valor cambia de
+        verdad, en orden topológico. En el modo interactivo, donde cada
+        respuesta agrega un síntoma, esto es mucho menos que una pasada entera.
+        """
+        evidencia = self.vector_evidencia(observados, negados)
+        cambiados = np.flatnonzero(evidencia != self._evidencia)
+        self._evidencia = evidencia
+
+        pendientes = [int(i) for i in cambiados]
+        heapq.heapify(pendientes)
+        en_cola = set(pendientes)
+        while pendientes:
+            i = heapq.heappop(pendientes)
+            en_cola.discard(i)
+            valor = self._valor_nodo(i)
+            if valor != self._prob[i]:
+                self._prob[i] = valor
+                for hijo in self._hijos[i]:
+                    if hijo not in en_cola:
+                        en_cola.add(hijo)
+                        heapq.heappush(pendientes, hijo)
+
+    def probabilidades(self, observados=(), negados=()):
+        """Probabilidad de cada nodo para UN paciente"""
+        self._actualizar(observados, negados)
+        return {nodo: float(self._prob[i]) for i, nodo in enumerate(self.nodos)}
+
+    def probabilidad(self, observados=(), negados=()):
+        """Probabilidad del objetivo para UN paciente"""
+        self._actualizar(observados, negados)
+        return float(self._prob[self.indice[self.objetivo]])
@@ -0,0 +1,286 @@
+"""
+Panel de Estructura - Camino y frontera (cola/pila) de un paso en el canvas
+Los ítems del canvas persisten entre pasos: cada paso sólo crea, mueve o
+borra los que cambiaron, y cada sección muestra una ventana acotada
+"""
+
+import tkinter as tk
+
+
+class PanelEstructura:
+    """
+    Dibuja sobre un tk.Canvas el CAMINO del paso y su FRONTERA real.
+
+    Cada elemento (nodo del camino, entrada de la cola/pila) es un grupo de
+    ítems con un tag propio, guardado por clave (nodo, repetición). Entre
+    pasos se comparan las claves: las que salen se borran, las que entran
+    se crean y las que siguen se mueven o recolorean sólo si cambió su
+    posición o su estilo. Las secciones muestran como mucho VENTANA_*
+    elementos y un resumen "+N más", así una frontera de miles de nodos no
+    crea miles de ítems.
+    """
+
+    VENTANA_CAMINO = 10  # últimos nodos del camino (2 filas de 5)
+    VENTANA_COLA = 12    # primeros de la cola (2 filas de 6)
+    VENTANA_PILA = 5     # los del tope de la pila
+
+    COLOR_ACTUAL = "#e74c3c"
+    COLOR_NUEVO = "#16a085"
+    COLOR_ESPERA = "#95a5a6"
+
+    def __init__(self, canvas, formatear):
+        self.canvas = canvas
+        self.formatear = formatear
+        self._estructura = None  # 'cola' o 'pila' de los ítems fijos dibujados
+        self._fijos = {}
+        self._camino = {}        # clave -> [tag, x, y, estilo]
+        self._frontera = {}
+        self._contador = 0
+        self._anterior = None    # (número de paso, tamaño de la frontera) del último mostrado
+
+    def limpiar(self):
+        self.canvas.delete("all")
+        self._estructura = None
+        self._fijos = {}
+        self._camino = {}
+        self._frontera = {}
+        self._anterior = None
+
+    # ------------------------------------------------------------------
+    # Diferencias entre pasos
+    # ------------------------------------------------------------------
+
+    def _nuevo_tag(self):
+        self._contador += 1
+        return f"elem{self._contador}"
+
+    @staticmethod
+    def _claves(nodos):
+        """(nodo, repetición): la IDDFS puede tener un nodo dos veces en la pila"""
+        vistos = {}
+        claves = []
+        for nodo in nodos:
+            k = vistos.get(nodo, 0)
+            vistos[nodo] = k + 1
+            claves.append((nodo, k))
+        return claves
+
+    def _sincronizar(self, grupo, deseados, crear, estilizar):
+        """
+        Lleva el canvas de `grupo` a `deseados` = [(clave, x, y, estilo)]
+        haciendo sólo las operaciones necesarias.
+        """
+        siguientes = {}
+        for clave, x, y, estilo in deseados:
+            actual = grupo.pop(clave, None)
+            if actual is None:
+                tag = self._nuevo_tag()
+                crear(tag, clave[0], x, y, estilo)
+            else:
+                tag, x0, y0, estilo0 = actual
+                if (x, y) != (x0, y0):
+                    self.canvas.move(tag, x - x0, y - y0)
+                if estilo != estilo0:
+                    estilizar(tag, clave[0], estilo)
+            siguientes[clave] = [tag, x, y, estilo]
+        for tag, *_ in grupo.values():
+            self.canvas.delete(tag)
+        grupo.clear()
+        grupo.update(siguientes)
+
+    # ------------------------------------------------------------------
+    # Ítems fijos (se crean una vez por tipo de estructura)
+    # ------------------------------------------------------------------
+
+    def _texto(self, nombre, x, y, **opciones):
+        self._fijos[nombre] = self.canvas.create_text(x, y, **opciones)
+
+    def _cambiar_texto(self, nombre, texto):
+        self.canvas.itemconfig(self._fijos[nombre], text=texto)
+
+    def _crear_fijos(self, estructura, y_frontera=185):
+        self.limpiar()
+        self._estructura = estructura
+        c = self.canvas
+
+        self._texto("paso", 175, 12, text="", font=("Arial", 11, "bold"), fill="#2c3e50")
+
+        # Camino acumulado
+        c.create_rectangle(5, 28, 345, 178, fill="#ecf0f1", outline="#34495e", width=2)
+        self._texto("titulo_camino", 175, 40, text="🗺️ CAMINO RECORRIDO (Memoria)",
+                    font=("Arial", 10, "bold"), fill="#16a085")
+        self._texto("camino_antes", 330, 40, text="", font=("Arial", 7, "italic"),
+                    fill="#7f8c8d", anchor=tk.E)
+
+        # Frontera
+        color = "#3498db" if estructura == 'cola' else "#9b59b6"
+        c.create_rectangle(10, y_frontera, 340, y_frontera + 30, fill=color, outline="black", width=2)
+        self._texto("titulo_frontera", 175, y_frontera + 15, text="",
+                    font=("Arial", 10, "bold"), fill="white")
+        if estructura == 'cola':
+            self._texto("indicador_sale", 40, y_frontera + 45, text="◀ SALE",
+                        font=("Arial", 8, "bold"), fill=self.COLOR_ACTUAL)
+            self._texto("indicador_entra", 300, y_frontera + 45, text="ENTRA ◀",
+                        font=("Arial", 8, "bold"), fill=self.COLOR_NUEVO)
+        else:
+            self._texto("indicador_tope", 175, y_frontera + 40, text="↑ TOPE (sale primero) ↑",
+                        font=("Arial", 8, "bold"), fill=self.COLOR_ACTUAL)
+        self._texto("frontera_mas", 175, 0, text="", font=("Arial", 7, "italic"), fill="#7f8c8d")
+        self._texto("frontera_vacia", 175, y_frontera + 70, text="",
+                    font=("Arial", 9, "italic"), fill="#7f8c8d")
+
+    # ------------------------------------------------------------------
+    # Paso
+    # ------------------------------------------------------------------
+
+    def mostrar(self, paso, y_frontera=185):
+        """Actualiza el panel al paso dado"""
+        estructura = 'cola' if 'cola' in paso else 'pila'
+        if estructura != self._estructura:
+            self._crear_fijos(estructura, y_frontera)
+
+        self._cambiar_texto(
+            "paso", f"PASO {paso['paso']}  ·  ✓ Visitados: {len(paso['visitados'])}")
+        self._mostrar_camino(paso)
+        # El paso anterior sacó un nodo y agregó al final (cola) o al tope
+        # (pila): lo que está desde len(anterior) - 1 entró en este paso.
+        # Saltando pasos no se sabe qué entró
+        frontera = paso[estructura]
+        nuevos_desde = len(frontera)
+        if self._anterior is not None and self._anterior[0] == paso['paso'] - 1:
+            nuevos_desde = self._anterior[1] - 1
+        self._anterior = (paso['paso'], len(frontera))
+        if estructura == 'cola':
+            self._mostrar_cola(paso, y_frontera, nuevos_desde)
+        else:
+            self._mostrar_pila(paso, y_frontera, nuevos_desde)
+
+        caja = self.canvas.bbox("all")
+        if caja:
+            self.canvas.config(scrollregion=caja)
+
+    def _mostrar_camino(self, paso):
+        camino = paso.get('camino', [])
+        inicio = max(0, len(camino) - self.VENTANA_CAMINO)
+        self._cambiar_texto("camino_antes", f"+{inicio} antes" if inicio else "")
+
+        claves = self._claves(camino)
+        deseados = []
+        for i in range(inicio, len(camino)):
+            w = i - inicio
+            fila, columna = divmod(w, 5)
+            color = self.COLOR_ACTUAL if camino[i] == paso['nodo_actual'] else "#16a085"
+            # Flecha hacia el siguiente sólo dentro de la misma fila
+            flecha = i < len(camino) - 1 and columna < 4
+            deseados.append((claves[i], 15 + columna * 65, 60 + fila * 45, (color, i + 1, flecha)))
+        self._sincronizar(self._camino, deseados, self._crear_nodo_camino, self._estilizar_nodo_camino)
+
+    def _crear_nodo_camino(self, tag, nodo, x, y, estilo):
+        color, numero, flecha = estilo
+        radio = 16
+        c = self.canvas
+        c.create_oval(x, y, x + radio * 2, y + radio * 2, fill=color, outline="black",
+                      width=2, tags=(tag, tag + "_fondo"))
+        c.create_text(x + radio, y + radio, text=str(numero), font=("Arial", 10, "bold"),
+                      fill="white", tags=(tag, tag + "_numero"))
+        c.create_text(x + radio, y + radio * 2 + 10, text=self.formatear(nodo)[:9],
+                      font=("Arial", 8), fill="#2c3e50", tags=(tag,))
+        c.create_line(x + radio * 2, y + radio, x + 65, y + radio, arrow=tk.LAST,
+                      fill="#34495e", width=2, state=tk.NORMAL if flecha else tk.HIDDEN,
+                      tags=(tag, tag + "_flecha"))
+
+    def _estilizar_nodo_camino(self, tag, nodo, estilo):
+        color, numero, flecha = estilo
+        self.canvas.itemconfig(tag + "_fondo", fill=color)
+        self.canvas.itemconfig(tag + "_numero", text=str(numero))
+        self.canvas.itemconfig(tag + "_flecha", state=tk.NORMAL if flecha else tk.HIDDEN)
+
+    def _estilo_frontera(self, es_actual, es_nuevo):
+        if es_actual:
+            return self.COLOR_ACTUAL
+        if es_nuevo:
+            return self.COLOR_NUEVO  # entró en este paso
+        return self.COLOR_ESPERA
+
+    def _mostrar_cola(self, paso, y_frontera, nuevos_desde):
+        cola = paso['cola']
+        self._cambiar_texto("titulo_frontera", f"📋 COLA (BFS - FIFO) · {len(cola)} en espera")
+        visibles = cola[:self.VENTANA_COLA]
+        claves = self._claves(visibles)
+        deseados = []
+        for i, clave in enumerate(claves):
+            fila, columna = divmod(i, 6)
+            color = self._estilo_frontera(i == 0 and clave[0] == paso['nodo_actual'],
+                                          i >= nuevos_desde)
+            flecha = i < len(visibles) - 1 and columna < 5
+            deseados.append((clave, 40 + columna * 48, y_frontera + 65 + fila * 48,
+                             (color, i + 1, flecha)))
+        self._sincronizar(self._frontera, deseados, self._crear_entrada_cola,
+                          self._estilizar_entrada_cola)
+
+        ultimo_y = y_frontera + 65 + ((len(visibles) - 1) // 6 + 1) * 48
+        self._resumen_frontera(len(cola), len(visibles), ultimo_y, "más")
+
+    def _crear_entrada_cola(self, tag, nodo, x, y, estilo):
+        color, numero, flecha = estilo
+        ancho, altura = 45, 30
+        c = self.canvas
+        c.create_rectangle(x, y, x + ancho, y + altura, fill=color, outline="black",
+                           width=2, tags=(tag, tag + "_fondo"))
+        c.create_text(x + ancho / 2, y + altura / 2, text=str(numero), font=("Arial", 9, "bold"),
+                      fill="white", tags=(tag, tag + "_numero"))
+        c.create_text(x + ancho / 2, y + altura + 8, text=self.formatear(nodo)[:6],
+                      font=("Arial", 7), fill="#2c3e50", tags=(tag,))
+        c.create_text(x + ancho + 1, y + altura / 2, text="→", font=("Arial", 10),
+                      fill="#34495e", state=tk.NORMAL if flecha else tk.HIDDEN,
+                      tags=(tag, tag + "_flecha"))
+
+    def _estilizar_entrada_cola(self, tag, nodo, estilo):
+        color, numero, flecha = estilo
+        self.canvas.itemconfig(tag + "_fondo", fill=color)
+        self.canvas.itemconfig(tag + "_numero", text=str(numero))
+        self.canvas.itemconfig(tag + "_flecha", state=tk.NORMAL if flecha else tk.HIDDEN)
+
+    def _mostrar_pila(self, paso, y_frontera, nuevos_desde):
+        pila = paso['pila']
+        # En IDDFS el límite de profundidad actual forma parte del título
+        if 'limite_profundidad' in paso:
+            titulo = f"📚 PILA (IDDFS) · Límite: {paso['limite_profundidad']} · {len(pila)}"
+        else:
+            titulo = f"📚 PILA (DFS - LIFO) · {len(pila)} en espera"
+        self._cambiar_texto("titulo_frontera", titulo)
+
+        # Claves desde la base: un nodo conserva su clave mientras no salga
+        claves = self._claves(pila)
+        visibles = claves[::-1][:self.VENTANA_PILA]  # el TOPE primero
+        deseados = []
+        for i, clave in enumerate(visibles):
+            color = self._estilo_frontera(i == 0 and clave[0] == paso['nodo_actual'],
+                                          len(pila) - 1 - i >= nuevos_desde)
+            deseados.append((clave, 85, y_frontera + 60 + i * 28, (color, len(pila) - i)))
+        self._sincronizar(self._frontera, deseados, self._crear_entrada_pila,
+                          self._estilizar_entrada_pila)
+
+        ultimo_y = y_frontera + 60 + len(visibles) * 28
+        self._resumen_frontera(len(pila), len(visibles), ultimo_y, "más abajo")
+
+    def _crear_entrada_pila(self, tag, nodo, x, y, estilo):
+        color, profundidad = estilo
+        ancho, altura = 180, 25
+        c = self.canvas
+        c.create_rectangle(x, y, x + ancho, y + altura, fill=color, outline="black",
+                           width=2, tags=(tag, tag + "_fondo"))
+        c.create_text(x + ancho / 2, y + altura / 2, text=f"{profundidad}. {self.formatear(nodo)}",
+                      font=("Arial", 8, "bold"), fill="white", tags=(tag, tag + "_texto"))
+
+    def _estilizar_entrada_pila(self, tag, nodo, estilo):
+        color, profundidad = estilo
+        self.canvas.itemconfig(tag + "_fondo", fill=color)
+        self.canvas.itemconfig(tag + "_texto", text=f"{profundidad}. {self.formatear(nodo)}")
+
+    def _resumen_frontera(self, total, mostrados, y, sufijo):
+        """'+N más' debajo de la ventana, o '(Vacía)'"""
+        restantes = total - mostrados
+        self.canvas.coords(self._fijos["frontera_mas"], 175, y + 10)
+        self._cambiar_texto("frontera_mas", f"+{restantes} {sufijo}" if restantes else "")
+        self._cambiar_texto("frontera_vacia", "(Vacía)" if not total else "")
@@ -0,0 +1,308 @@
+"""
+Planificador - Elige la forma más barata de responder cada consulta de diagnóstico
+Sólo hay traza si alguien va a mirar los pasos. Si basta el resultado, la
+búsqueda va sin traza, y un síntoma consultado muchas veces se responde con
+la tabla de distancias a los diagnósticos. Cada decisión queda registrada
+con lo que costó, para poder ajustar los umbrales
+"""
+
+from collections import Counter, deque
+import time
+
+from control_busqueda import marcar_estado
+
+
+# Estrategias
+TRAZADA = 'trazada'        # agente.bfs / agente.dfs con todos los pasos
+SIN_TRAZA = 'sin_traza'    # agente.bfs_niveles / agente.dfs_iterativo sin pasos
+TABLA = 'tabla'            # consulta a agente.tabla_distancias()
+
+# Consultas del mismo síntoma (en la misma versión del grafo) que justifican armar la tabla
+REPETICIONES_TABLA = 3
+# Decisiones que se conservan en el registro (las más viejas se descartan)
+MAX_REGISTRO = 10000
+# Costos iniciales, antes de observar ninguno. Búsquedas ('<estrategia>_<algoritmo>'):
+# ms por nodo explorado; 'construir_tabla': ms por arista y diagnóstico; TABLA: ms por consulta
+COSTOS_INICIALES = {
+    'trazada_bfs': 0.01,
+    'trazada_dfs': 0.01,
+    'sin_traza_bfs': 0.003,
+    'sin_traza_dfs': 0.003,
+    'construir_tabla': 0.002,
+    TABLA: 0.02
+}
+# Peso de cada observación nueva en el promedio móvil de los costos
+SUAVIZADO = 0.2
+
+
+class Planificador:
+    """
+    Punto de entrada de las consultas de diagnóstico sobre un AgenteOtitis.
+
+    Cada consulta dice qué necesita:
+    - con_pasos: la traza completa (la GUI, el paso a paso)
+    - con_camino: camino_final y diagnóstico; sin él basta saber SI llega
+    - todos_caminos: 'objetivos_alcanzados' con el camino a cada diagnóstico
+
+    Con eso y el tamaño del grafo el planificador elige la estrategia:
+    1. TRAZADA si se pidieron los pasos: es la única que los tiene.
+    2. TABLA si la consulta se puede contestar con la tabla de distancias
+       (sin caminos, o BFS con camino) y la tabla ya está armada en esta
+       versión del grafo. También si conviene armarla: el síntoma ya se
+       consultó `repeticiones_tabla` veces, o lo que queda del lote cuesta
+       más con búsquedas que armando la tabla y consultándola.
+    3. SIN_TRAZA si existe la variante sin pasos (BFS siempre; DFS con los
+       objetivos del agente y sin todos_caminos) y su costo observado por
+       nodo no supera al de TRAZADA.
+    4. TRAZADA en otro caso.
+
+    Los costos de cada estrategia se estiman con promedios móviles de lo
+    observado. El recorrido de un síntoma se estima con los nodos que
+    exploró la última vez, o con el promedio, o con el grafo entero.
+    Cada decisión queda en `registro` con su costo estimado y el observado.
+
+    Un resultado de TABLA trae 'encontrado', 'tiene_otitis', 'probabilidad',
+    'objetivos_alcanzables' y 'distancia'. Con camino también trae
+    'camino_final' y 'diagnostico': el mismo camino que bfs(), porque el
+    camino de BFS es el primero (en el orden de los vecinos) de los más
+    cortos. No trae 'pasos' con contenido, ni 'nodos_explorados', ni
+    'objetivos_alcanzados'.
+    """
+
+    def __init__(self, agente, repeticiones_tabla=REPETICIONES_TABLA, max_registro=MAX_REGISTRO):
+        self.agente = agente
+        self.repeticiones_tabla = repeticiones_tabla
+        self.costos = dict(COSTOS_INICIALES)
+        self.registro = deque(maxlen=max_registro)
+
+        self._version = None
+        self._version_tabla = None  # versión del grafo en la que se armó la tabla
+        self._actualizar_version()
+
+    def _actualizar_version(self):
+        """Al cambiar el grafo se olvidan los conteos y los recorridos vistos"""
+        if self._version == self.agente.version:
+            return
+        self._version = self.agente.version
+        self.consultas = Counter()
+        self._nodos_vistos = {}  # (algoritmo, síntoma) -> nodos explorados
+        grafo = self.agente.grafo
+        self.num_nodos = len(grafo)
+        self.num_aristas = sum(map(len, grafo.values()))
+
+    def _objetivos(self, objetivos):
+        if objetivos is None:
+            return tuple(self.agente.objetivos)
+        if isinstance(objetivos, str):
+            return (objetivos,)
+        return tuple(objetivos)
+
+    # ------------------------------------------------------------------
+    # Decisión
+    # ------------------------------------------------------------------
+
+    def tabla_vigente(self):
+        return self._version_tabla == self.agente.version
+
+    def _nodos_estimados(self, algoritmo, sintoma_inicial):
+        nodos = self._nodos_vistos.get((algoritmo, sintoma_inicial))
+        if nodos is None and self._nodos_vistos:
+            nodos = sum(self._nodos_vistos.values()) / len(self._nodos_vistos)
+        return max(1, self.num_nodos if nodos is None else nodos)
+
+    def _costo_tabla(self, objetivos):
+        return self.costos['construir_tabla'] * (self.num_nodos + self.num_aristas) * len(objetivos)
+
+    def planificar(self, sintoma_inicial, algoritmo='bfs', con_pasos=False, con_camino=True,
+                   todos_caminos=False, objetivos=None, lote=1):
+        """
+        Plan para una consulta, sin ejecutarla: {'estrategia', 'motivo',
+        'estimado_ms', 'construir_tabla'}. `lote` es cuántas consultas
+        (ésta incluida) quedan por resolver en la misma tanda.
+        """
+        if algoritmo not in ('bfs', 'dfs'):
+            raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+        self._actualizar_version()
+        objetivos = self._objetivos(objetivos)
+        veces = self.consultas[sintoma_inicial] + 1
+
+        def plan(estrategia, motivo, construir=False):
+            if estrategia == TABLA:
+                estimado = self.costos[TABLA]
+                if construir:
+                    estimado += self._costo_tabla(objetivos)
+            else:
+                estimado = (self.costos[f"{estrategia}_{algoritmo}"]
+                            * self._nodos_estimados(algoritmo, sintoma_inicial))
+            return {'estrategia': estrategia, 'motivo': motivo, 'estimado_ms': estimado,
+                    'construir_tabla': construir}
+
+        if con_pasos:
+            return plan(TRAZADA, "se pidió la traza")
+
+        puede_tabla = (not todos_caminos
+                       and set(objetivos) <= set(self.agente.objetivos)
+                       and (not con_camino or algoritmo == 'bfs'))
+        puede_sin_traza = algoritmo == 'bfs' or (
+            objetivos == tuple(self.agente.objetivos) and not todos_caminos)
+        # En grafos chicos el BFS vectorial sin traza puede salir más caro
+        estrategia_busqueda = TRAZADA
+        if puede_sin_traza and (self.costos[f"{SIN_TRAZA}_{algoritmo}"]
+                                <= self.costos[f"{TRAZADA}_{algoritmo}"]):
+            estrategia_busqueda = SIN_TRAZA
+
+        if puede_tabla:
+            if self.tabla_vigente():
+                return plan(TABLA, "tabla ya armada para esta versión del grafo")
+            if veces >= self.repeticiones_tabla:
+                return plan(TABLA, f"síntoma consultado {veces} veces", construir=True)
+            if lote > 1:
+                busquedas = (lote * self.costos[f"{estrategia_busqueda}_{algoritmo}"]
+                             * self._nodos_estimados(algoritmo, sintoma_inicial))
+                con_tabla = self._costo_tabla(objetivos) + lote * self.costos[TABLA]
+                if con_tabla <= busquedas:
+                    return plan(TABLA, f"un lote de {lote} amortiza la tabla", construir=True)
+
+        if estrategia_busqueda == SIN_TRAZA:
+            return plan(SIN_TRAZA, "no se necesitan los pasos")
+        if puede_sin_traza:
+            return plan(TRAZADA, "la búsqueda con traza resultó más barata por nodo")
+        return plan(TRAZADA, "DFS sin traza sólo con los objetivos del agente y sin todos_caminos")
+
+    # ------------------------------------------------------------------
+    # Ejecución
+    # ------------------------------------------------------------------
+
+    def diagnosticar(self, sintoma_inicial, algoritmo='bfs', con_pasos=False, con_camino=True,
+                     todos_caminos=False, podar=False, objetivos=None, lote=1):
+        """Planifica y ejecuta UNA consulta; agrega 'estrategia' al resultado"""
+        plan = self.planificar(sintoma_inicial, algoritmo, con_pasos, con_camino,
+                               todos_caminos, objetivos, lote)
+        self.consultas[sintoma_inicial] += 1
+        estrategia = plan['estrategia']
+        entrada = {
+            'sintoma': sintoma_inicial,
+            'algoritmo': algoritmo,
+            'estrategia': estrategia,
+            'motivo': plan['motivo'],
+            'lote': lote,
+            'version': self._version,
+            'estimado_ms': plan['estimado_ms']
+        }
+
+        inicio = time.perf_counter()
+        if estrategia == TABLA:
+            if plan['construir_tabla']:
+                self.agente.tabla_distancias()
+                construida = time.perf_counter()
+                entrada['tabla_ms'] = (construida - inicio) * 1000
+                self._version_tabla = self.agente.version
+                self._observar('construir_tabla', entrada['tabla_ms'],
+                               (self.num_nodos + self.num_aristas) * len(self._objetivos(objetivos)))
+                inicio = construida
+            resultado = self._consultar_tabla(sintoma_inicial, self._objetivos(objetivos), con_camino)
+            observado = (time.perf_counter() - inicio) * 1000
+            self._observar(TABLA, observado, 1)
+        else:
+            if estrategia == TRAZADA:
+                buscar = getattr(self.agente, algoritmo)
+                resultado = buscar(sintoma_inicial, podar=podar, objetivos=objetivos)
+            elif algoritmo == 'bfs':
+                resultado = self.agente.bfs_niveles(sintoma_inicial, podar=podar, objetivos=objetivos)
+            else:
+                resultado = self._dfs_sin_traza(sintoma_inicial)
+            observado = (time.perf_counter() - inicio) * 1000
+            nodos = resultado['nodos_explorados']
+            entrada['nodos'] = nodos
+            if nodos:
+                self._nodos_vistos[(algoritmo, sintoma_inicial)] = nodos
+                self._observar(f"{estrategia}_{algoritmo}", observado, nodos)
+
+        entrada['observado_ms'] = observado + entrada.get('tabla_ms', 0.0)
+        self.registro.append(entrada)
+        resultado['estrategia'] = estrategia
+        return resultado
+
+    def diagnosticar_lote(self, sintomas, **opciones):
+        """
+        Resultados de diagnosticar(s, **opciones) para cada síntoma, en
+        orden. Cada consulta sabe cuántas quedan, así un lote grande puede
+        decidir armar la tabla desde la primera.
+        """
+        sintomas = list(sintomas)
+        total = len(sintomas)
+        return [self.diagnosticar(sintoma, lote=total - i, **opciones)
+                for i, sintoma in enumerate(sintomas)]
+
+    def _observar(self, clave, ms, unidades):
+        """Promedio móvil del costo por unidad (nodo, arista o consulta)"""
+        self.costos[clave] += SUAVIZADO * (ms / unidades - self.costos[clave])
+
+    def _dfs_sin_traza(self, sintoma_inicial):
+        """dfs_iterativo sin pasos, con los campos que agrega _busqueda_frontera"""
+        resultado = self.agente.dfs_iterativo(sintoma_inicial, registrar_pasos=False)
+        camino = resultado['camino_final']
+        resultado['diagnostico'] = camino[-1] if camino else None
+        return marcar_estado(resultado)
+
+    def _consultar_tabla(self, sintoma_inicial, objetivos, con_camino):
+        tabla = self.agente.tabla_distancias()
+        distancias = [tabla[objetivo] for objetivo in objetivos]
+
+        def distancia(nodo):
+            cercana = None
+            for por_nodo in distancias:
+                d = por_nodo.get(nodo)
+                if d is not None and (cercana is None or d < cercana):
+                    cercana = d
+            return cercana
+
+        inicial = distancia(sintoma_inicial)
+        encontrado = inicial is not None
+        resultado = {
+            'encontrado': encontrado,
+            'tiene_otitis': encontrado,
+            'probabilidad': (self.agente.motor_probabilistico().probabilidad([sintoma_inicial])
+                             if encontrado else 0.0),
+            'objetivos_alcanzables': [objetivo for objetivo, por_nodo in zip(objetivos, distancias)
+                                      if sintoma_inicial in por_nodo],
+            'distancia': inicial,
+            'pasos': []
+        }
+        if con_camino:
+            # Camino de BFS: en cada salto, el primer vecino un paso más cerca
+            camino = []
+            if encontrado:
+                nodo, d = sintoma_inicial, inicial
+                camino.append(nodo)
+                while d > 0:
+                    nodo = next(v for v in self.agente.obtener_vecinos(nodo) if distancia(v) == d - 1)
+                    camino.append(nodo)
+                    d -= 1
+            resultado['camino_final'] = camino
+            resultado['diagnostico'] = camino[-1] if camino else None
+        return marcar_estado(resultado)
+
+    # ------------------------------------------------------------------
+    # Registro
+    # ------------------------------------------------------------------
+
+    def resumen(self):
+        """Consultas, tiempo total y promedio por estrategia, más los costos vigentes"""
+        por_estrategia = {}
+        for entrada in self.registro:
+            datos = por_estrategia.setdefault(entrada['estrategia'],
+                                              {'consultas': 0, 'ms_total': 0.0, 'estimado_ms': 0.0})
+            datos['consultas'] += 1
+            datos['ms_total'] += entrada['observado_ms']
+            datos['estimado_ms'] += entrada['estimado_ms']
+        for datos in por_estrategia.values():
+            datos['ms_promedio'] = datos['ms_total'] / datos['consultas']
+        return {
+            'estrategias': por_estrategia,
+            'costos': dict(self.costos),
+            'tabla_vigente': self.tabla_vigente(),
+            'construcciones_tabla': sum('tabla_ms' in entrada for entrada in self.registro),
+            'nodos': self.num_nodos,
+            'aristas': self.num_aristas
+        }
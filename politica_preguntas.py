@@ -0,0 +1,157 @@
+"""
+Política de Preguntas - Diagnóstico interactivo con el MÍNIMO de preguntas
+Elige la siguiente pregunta que más información aporta sobre OTITIS / SANO
+"""
+
+from collections import deque
+
+import numpy as np
+
+from motor_probabilistico import PRESENTE, NEGADO
+
+
+def _entropia(p):
+    """Entropía binaria (bits), vectorizada"""
+    p = np.clip(p, 1e-12, 1 - 1e-12)
+    return -(p * np.log2(p) + (1 - p) * np.log2(1 - p))
+
+
+class PoliticaPreguntas:
+    """
+    Selecciona preguntas por ganancia de información sobre el diagnóstico.
+
+    En cada turno:
+    1. Candidatos: síntomas no preguntados alcanzables desde los síntomas
+       confirmados sin pasar por síntomas negados, y que pueden llegar a
+       OTITIS (conjunto inverso-alcanzable precalculado una sola vez).
+    2. Para cada candidato se evalúa, en UN lote vectorizado, la
+       probabilidad de OTITIS si la respuesta es SÍ y si es NO.
+    3. Se pregunta el candidato que más reduce la entropía esperada.
+
+    Se deja de preguntar cuando el diagnóstico alcanza la `confianza` pedida
+    (P(OTITIS) o P(SANO) >= confianza) o ninguna pregunta aporta información;
+    entonces es OTITIS si P(OTITIS) >= umbral.
+    """
+
+    def __init__(self, agente, prior=0.1, umbral=0.5, confianza=0.9, ganancia_minima=1e-3):
+        self.agente = agente
+        self.umbral = umbral
+        self.confianza = confianza
+        self.ganancia_minima = ganancia_minima
+        self.motor = agente.motor_probabilistico(prior)
+        self._alcanzan_objetivo = agente.nodos_que_alcanzan_objetivo()
+        self._i_objetivo = self.motor.indice[agente.objetivo]
+
+    def candidatos(self, presentes, negados):
+        """Síntomas que todavía pueden acercar el diagnóstico a OTITIS"""
+        respondidos = set(presentes) | set(negados)
+        bloqueados = set(negados)
+        vistos = set(presentes)
+        cola = deque(presentes)
+        candidatos = []
+
+        while cola:
+            nodo = cola.popleft()
+            for vecino in self.agente.obtener_vecinos(nodo):
+                # Poda: ramas que ya no pueden llegar al objetivo
+                if (vecino in vistos or vecino in bloqueados
+                        or vecino not in self._alcanzan_objetivo):
+                    continue
+                vistos.add(vecino)
+                cola.append(vecino)
+                if vecino != self.agente.objetivo and vecino not in respondidos:
+                    candidatos.append(vecino)
+        return candidatos
+
+    def probabilidad(self, presentes, negados):
+        return self.motor.probabilidad(presentes, negados)
+
+    def decidir(self, presentes, negados):
+        """Retorna (tiene_otitis, probabilidad) con la evidencia actual"""
+        p = self.probabilidad(presentes, negados)
+        return p >= self.umbral, p
+
+    def siguiente_pregunta(self, presentes, negados):
+        """
+        Retorna (síntoma, ganancia) de la mejor pregunta, o None si conviene
+        terminar (diagnóstico alcanzado o ninguna pregunta aporta información).
+        """
+        p = self.probabilidad(presentes, negados)
+        if max(p, 1 - p) >= self.confianza:
+            return None
+
+        candidatos = self.candidatos(presentes, negados)
+        if not candidatos:
+            return None
+
+        motor = self.motor
+        base = motor.vector_evidencia(presentes, negados)
+        indices = np.array([motor.indice[c] for c in candidatos])
+        k = len(candidatos)
+
+        # Fila 0: evidencia actual; filas 1..k: SÍ; filas k+1..2k: NO
+        lote = np.repeat(base[None, :], 2 * k + 1, axis=0)
+        filas = np.arange(k)
+        lote[1 + filas, indices] = PRESENTE
+        lote[1 + k + filas, indices] = NEGADO
+        prob = motor.probabilidades_lote(lote)
+
+        p_actual = prob[0, self._i_objetivo]
+        p_si = prob[0, indices]  # P(el paciente responde SÍ)
+        p_otitis_si = prob[1:k + 1, self._i_objetivo]
+        p_otitis_no = prob[k + 1:, self._i_objetivo]
+
+        entropia_esperada = p_si * _entropia(p_otitis_si) + (1 - p_si) * _entropia(p_otitis_no)
+        ganancia = _entropia(p_actual) - entropia_esperada
+
+        mejor = int(np.argmax(ganancia))
+        if ganancia[mejor] < self.ganancia_minima:
+            return None
+        return candidatos[mejor], float(ganancia[mejor])
+
+    # ========================================================================
+    # COMPARACIÓN CON EL MODO INTERACTIVO BFS / DFS
+    # ========================================================================
+
+    def _contar_preguntas(self, algoritmo, sintoma_inicial, tiene, politica=None):
+        """Juega una sesión interactiva completa respondiendo con `tiene`"""
+        from sesion_interactiva import SesionInteractiva
+
+        sesion = SesionInteractiva(self.agente, algoritmo, sintoma_inicial, politica)
+        while not sesion.finalizada:
+            sesion.responder(tiene(sesion.pregunta[0]))
+        return sesion.num_preguntas(), sesion.tiene_otitis
+
+    def comparar(self, sintoma_inicial, n_pacientes=500, semilla=0):
+        """
+        Número esperado de preguntas de la política frente a BFS y DFS.
+
+        Simula pacientes con el modelo noisy-OR (el síntoma inicial siempre
+        presente) y responde con ellos a cada estrategia. Como en la interfaz,
+        BFS/DFS también cuentan la pregunta por el síntoma inicial.
+
+        Returns:
+            Dict algoritmo -> {'preguntas_promedio', 'aciertos'} donde
+            'aciertos' es la fracción de diagnósticos que coinciden con el
+            valor simulado de OTITIS.
+        """
+        muestras = self.motor.muestrear_pacientes(n_pacientes, [sintoma_inicial], semilla)
+        indice = self.motor.indice
+
+        estrategias = {
+            'Política': lambda tiene: self._contar_preguntas("BFS", sintoma_inicial, tiene, self),
+            'BFS': lambda tiene: self._contar_preguntas("BFS", sintoma_inicial, tiene),
+            'DFS': lambda tiene: self._contar_preguntas("DFS", sintoma_inicial, tiene),
+        }
+        resumen = {}
+        for nombre, estrategia in estrategias.items():
+            preguntas, aciertos = 0, 0
+            for fila in muestras:
+                n, diagnostico = estrategia(lambda s, fila=fila: bool(fila[indice[s]]))
+                preguntas += n
+                aciertos += diagnostico == bool(fila[self._i_objetivo])
+            resumen[nombre] = {
+                'preguntas_promedio': preguntas / n_pacientes,
+                'aciertos': aciertos / n_pacientes
+            }
+        return resumen
@@ -0,0 +1,275 @@
+"""
+Registro de Sesiones - Grabación y reproducción del diagnóstico interactivo
+Cada respuesta se agrega a un log JSONL (sólo anexar) y cada sesión terminada
+deja una línea en un índice pequeño para consultar miles de sesiones
+"""
+
+import json
+import os
+import time
+import uuid
+
+from sesion_interactiva import SesionInteractiva
+
+
+ARCHIVO_LOG = "sesiones.jsonl"
+ARCHIVO_INDICE = "sesiones.idx"
+
+
+def _linea(registro):
+    """Serializa un registro como una línea JSON compacta"""
+    return json.dumps(registro, ensure_ascii=False, separators=(',', ':')) + "\n"
+
+
+class RegistroSesiones:
+    """
+    Escritor del log de sesiones interactivas.
+
+    Registros del log (uno por línea):
+    - {"t": "inicio", "s": id, "ts", "alg", "ini", "pol"}
+    - {"t": "r", "s": id, "n": nodo, "r": 1|0, "f": tamaño frontera, "ts"}
+    - {"t": "d", "s": id, "n": nodo, "f": tamaño frontera, "ts"}: deshace la
+      última respuesta (la de `nodo`)
+    - {"t": "fin", "s": id, "dx": tiene_otitis, "ts"}
+    - {"t": "abandono", "s": id, "ts"}: la sesión se descartó o reemplazó sin
+      llegar al diagnóstico, o seguía abierta al `cerrar`
+
+    Las líneas se acumulan en memoria y se escriben con UN fsync cada
+    `lote` registros, al finalizar una sesión o al `cerrar`. Si el programa
+    muere se pierden como mucho las respuestas del último lote sin sincronizar.
+
+    Al finalizar (o abandonar) una sesión se agrega al índice una línea con
+    su rango de bytes en el log y un resumen (síntomas con SÍ / NO y
+    diagnóstico, None si se abandonó).
+    """
+
+    def __init__(self, directorio="sesiones", lote=32):
+        self.directorio = directorio
+        self.lote = lote
+        os.makedirs(directorio, exist_ok=True)
+        self.ruta_log = os.path.join(directorio, ARCHIVO_LOG)
+        self.ruta_indice = os.path.join(directorio, ARCHIVO_INDICE)
+
+        self._log = open(self.ruta_log, "ab")
+        self._offset = self._log.tell()
+        self._pendientes = []
+        self._abiertas = {}  # id -> resumen de la sesión en curso
+
+    def _agregar(self, registro):
+        datos = _linea(registro).encode("utf-8")
+        offset = self._offset
+        self._pendientes.append(datos)
+        self._offset += len(datos)
+        if len(self._pendientes) >= self.lote:
+            self.sincronizar()
+        return offset
+
+    def sincronizar(self):
+        """Escribe los registros pendientes y los lleva a disco (fsync)"""
+        if not self._pendientes:
+            return
+        self._log.write(b"".join(self._pendientes))
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._pendientes = []
+
+    def iniciar(self, sesion):
+        """Registra el comienzo de una SesionInteractiva y retorna su id"""
+        sesion_id = uuid.uuid4().hex[:12]
+        inicio = self._agregar({
+            't': 'inicio',
+            's': sesion_id,
+            'ts': round(time.time(), 3),
+            'alg': sesion.algoritmo,
+            'ini': sesion.sintoma_inicial,
+            'pol': sesion.politica is not None
+        })
+        self._abiertas[sesion_id] = {
+            'sesion': sesion_id,
+            'inicio': inicio,
+            'algoritmo': sesion.algoritmo,
+            'sintoma_inicial': sesion.sintoma_inicial,
+            'politica': sesion.politica is not None,
+            'si': [],
+            'no': []
+        }
+        return sesion_id
+
+    def registrar_respuesta(self, sesion_id, nodo, tiene_sintoma, tamano_frontera):
+        """Agrega una respuesta (nodo preguntado, SÍ/NO, tamaño de la frontera)"""
+        self._agregar({
+            't': 'r',
+            's': sesion_id,
+            'n': nodo,
+            'r': 1 if tiene_sintoma else 0,
+            'f': tamano_frontera,
+            'ts': round(time.time(), 3)
+        })
+        self._abiertas[sesion_id]['si' if tiene_sintoma else 'no'].append(nodo)
+
+    def registrar_deshacer(self, sesion_id, nodo, tiene_sintoma, tamano_frontera):
+        """Anula la última respuesta (nodo, SÍ/NO) de la sesión"""
+        self._agregar({
+            't': 'd',
+            's': sesion_id,
+            'n': nodo,
+            'f': tamano_frontera,
+            'ts': round(time.time(), 3)
+        })
+        self._abiertas[sesion_id]['si' if tiene_sintoma else 'no'].pop()
+
+    def finalizar(self, sesion_id, tiene_otitis):
+        """Cierra la sesión: registro final, fsync y línea en el índice"""
+        self._agregar({
+            't': 'fin',
+            's': sesion_id,
+            'dx': bool(tiene_otitis),
+            'ts': round(time.time(), 3)
+        })
+        self._indexar(sesion_id, tiene_otitis=bool(tiene_otitis), abandonada=False)
+
+    def abandonar(self, sesion_id):
+        """
+        Cierra una sesión que no llegó al diagnóstico (cancelada, reemplazada
+        o abierta al salir). Queda en el índice con tiene_otitis None para
+        poder buscarla y reproducirla hasta la última respuesta. No hace
+        nada si la sesión ya estaba cerrada.
+        """
+        if sesion_id not in self._abiertas:
+            return
+        self._agregar({
+            't': 'abandono',
+            's': sesion_id,
+            'ts': round(time.time(), 3)
+        })
+        self._indexar(sesion_id, tiene_otitis=None, abandonada=True)
+
+    def _indexar(self, sesion_id, **final):
+        """fsync del log y línea de la sesión en el índice"""
+        self.sincronizar()
+
+        resumen = self._abiertas.pop(sesion_id)
+        resumen['fin'] = self._offset
+        resumen.update(final)
+        with open(self.ruta_indice, "ab") as indice:
+            indice.write(_linea(resumen).encode("utf-8"))
+            indice.flush()
+            os.fsync(indice.fileno())
+
+    def cerrar(self):
+        """Abandona las sesiones que siguen abiertas y lleva todo a disco"""
+        for sesion_id in list(self._abiertas):
+            self.abandonar(sesion_id)
+        self.sincronizar()
+        self._log.close()
+
+
+class LectorSesiones:
+    """
+    Consultas y reproducción sobre un directorio de sesiones grabadas.
+
+    Sólo se carga el índice (una línea corta por sesión); los registros de
+    una sesión se leen del log con un seek a su rango de bytes cuando se
+    piden, sin recorrer el resto del archivo.
+    """
+
+    def __init__(self, directorio="sesiones"):
+        self.ruta_log = os.path.join(directorio, ARCHIVO_LOG)
+        self.ruta_indice = os.path.join(directorio, ARCHIVO_INDICE)
+        self.indice = {}
+        self._por_respuesta = {}  # (nodo, 1|0) -> [ids]
+
+        if os.path.exists(self.ruta_indice):
+            with open(self.ruta_indice, encoding="utf-8") as archivo:
+                for linea in archivo:
+                    if linea.strip():
+                        self._indexar(json.loads(linea))
+
+    def _indexar(self, resumen):
+        sesion_id = resumen['sesion']
+        self.indice[sesion_id] = resumen
+        for clave, valor in (('si', 1), ('no', 0)):
+            for nodo in resumen[clave]:
+                self._por_respuesta.setdefault((nodo, valor), []).append(sesion_id)
+
+    def sesiones(self, algoritmo=None, sintoma_inicial=None, tiene_otitis=None,
+                 nodo=None, respuesta=None, abandonada=None):
+        """
+        Ids de las sesiones que cumplen TODOS los filtros dados.
+
+        Las sesiones abandonadas tienen tiene_otitis None: un filtro por
+        diagnóstico nunca las incluye; `abandonada=True` las lista.
+
+        `nodo` + `respuesta` (True/False) usa el índice invertido: por
+        ejemplo, todas las sesiones en que el paciente dijo SÍ a 'fiebre'.
+        """
+        if nodo is not None:
+            valores = (1, 0) if respuesta is None else (1 if respuesta else 0,)
+            candidatos = []
+            for valor in valores:
+                candidatos.extend(self._por_respuesta.get((nodo, valor), []))
+            candidatos = list(dict.fromkeys(candidatos))
+        else:
+            candidatos = list(self.indice)
+
+        resultado = []
+        for sesion_id in candidatos:
+            resumen = self.indice[sesion_id]
+            if algoritmo is not None and resumen['algoritmo'] != algoritmo:
+                continue
+            if sintoma_inicial is not None and resumen['sintoma_inicial'] != sintoma_inicial:
+                continue
+            if tiene_otitis is not None and resumen['tiene_otitis'] != tiene_otitis:
+                continue
+            # Los índices anteriores al registro de abandonos no traen la clave
+            if abandonada is not None and resumen.get('abandonada', False) != abandonada:
+                continue
+            resultado.append(sesion_id)
+        return resultado
+
+    def registros(self, sesion_id):
+        """Registros del log de una sesión (inicio, respuestas, fin o abandono)"""
+        resumen = self.indice[sesion_id]
+        with open(self.ruta_log, "rb") as log:
+            log.seek(resumen['inicio'])
+            bloque = log.read(resumen['fin'] - resumen['inicio'])
+
+        # Otras sesiones pudieron escribir en el mismo rango: filtrar por id
+        registros = []
+        for linea in bloque.splitlines():
+            registro = json.loads(linea)
+            if registro['s'] == sesion_id:
+                registros.append(registro)
+        return registros
+
+    def reproducir(self, sesion_id, agente, politica=None):
+        """
+        Reconstruye la SesionInteractiva de una sesión grabada.
+
+        Aplica las respuestas en orden sin interfaz. Si la sesión usó la
+        política de mínimas preguntas y no se pasa una, se crea con los
+        parámetros por defecto. Lanza ValueError si el grafo del agente ya
+        no produce las mismas preguntas que se grabaron.
+        """
+        registros = self.registros(sesion_id)
+        inicio = registros[0]
+        if inicio['pol'] and politica is None:
+            from politica_preguntas import PoliticaPreguntas
+            politica = PoliticaPreguntas(agente)
+
+        sesion = SesionInteractiva(agente, inicio['alg'], inicio['ini'],
+                                   politica if inicio['pol'] else None)
+        for registro in registros[1:]:
+            if registro['t'] == 'd':
+                sesion.deshacer()
+                continue
+            if registro['t'] != 'r':
+                continue
+            if sesion.finalizada or sesion.pregunta[0] != registro['n']:
+                raise ValueError(
+                    f"La sesión {sesion_id} no se puede reproducir: se esperaba "
+                    f"'{registro['n']}' y el agente pregunta "
+                    f"'{sesion.pregunta[0] if sesion.pregunta else None}'"
+                )
+            sesion.responder(bool(registro['r']))
+        return sesion
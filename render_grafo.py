@@ -0,0 +1,346 @@
+"""
+Render de Grafos Grandes - Dibujo del grafo con colecciones de matplotlib
+Las aristas van en una LineCollection armada una vez, los nodos en
+PathCollections que sólo cambian sus puntos, las etiquetas se limitan a
+los nodos relevantes del paso y cada paso se dibuja con blitting
+"""
+
+from collections import deque
+from math import ceil, sqrt
+
+import numpy as np
+from matplotlib.collections import LineCollection
+
+
+def layout_por_niveles(grafo, objetivos, separacion=1.0):
+    """
+    Posiciones en capas según la distancia a los objetivos, en O(V + E).
+
+    Los objetivos quedan abajo (y=0) y cada síntoma a la altura de su
+    distancia al diagnóstico más cercano, como el layout jerárquico de la
+    App. Los nodos que no llegan a ningún objetivo van en una capa superior.
+    Las capas muy anchas se parten en varias filas para que el dibujo no
+    quede como una línea.
+    """
+    # BFS inverso multi-fuente desde los objetivos
+    inversos = {nodo: [] for nodo in grafo}
+    for nodo, vecinos in grafo.items():
+        for vecino in vecinos:
+            inversos.setdefault(vecino, []).append(nodo)
+    distancia = {}
+    cola = deque()
+    for objetivo in objetivos:
+        if objetivo in inversos and objetivo not in distancia:
+            distancia[objetivo] = 0
+            cola.append(objetivo)
+    while cola:
+        nodo = cola.popleft()
+        for previo in inversos[nodo]:
+            if previo not in distancia:
+                distancia[previo] = distancia[nodo] + 1
+                cola.append(previo)
+
+    # Capas en el orden del BFS (hermanos juntos); sin salida, arriba de todo
+    capa_sin_salida = max(distancia.values(), default=0) + 1
+    capas = {}
+    for nodo in distancia:
+        capas.setdefault(distancia[nodo], []).append(nodo)
+    for nodo in inversos:
+        if nodo not in distancia:
+            capas.setdefault(capa_sin_salida, []).append(nodo)
+
+    ancho = max(20, int(2 * sqrt(len(inversos))))
+    posiciones = {}
+    y = 0.0
+    for nivel in sorted(capas):
+        nodos = capas[nivel]
+        filas = ceil(len(nodos) / ancho)
+        for fila in range(filas):
+            tramo = nodos[fila * ancho:(fila + 1) * ancho]
+            inicio = -(len(tramo) - 1) / 2
+            for i, nodo in enumerate(tramo):
+                posiciones[nodo] = ((inicio + i) * separacion, y + fila * 0.5 * separacion)
+        y += (filas * 0.5 + 1.5) * separacion
+    return posiciones
+
+
+class RenderizadorGrafo:
+    """
+    Dibuja y actualiza un grafo grande sobre un Axes.
+
+    - Aristas: UNA LineCollection sin flechas. Es la parte cara de dibujar,
+      así que queda en el fondo estático y sólo se redibuja con el zoom
+    - Nodos: una PathCollection por estilo (color, tamaño); un paso sólo
+      mueve los nodos que cambiaron de estilo entre colecciones. Agg dibuja
+      una colección de un solo color varias veces más rápido que una con un
+      color por punto
+    - Etiquetas: un grupo fijo de textos que se reubica en cada paso sobre
+      el nodo actual, el camino y el frente de la frontera
+    - Nivel de detalle: el tamaño de los nodos depende de cuántos hay a la
+      vista; fuera de la vista no se dibujan aristas y con más de
+      MAX_ARISTAS a la vista se dibuja una muestra pareja de ellas. La rueda
+      del mouse hace zoom
+
+    Nodos, camino, etiquetas y los `animados` extra (el título) se dibujan
+    con blitting sobre el fondo guardado en el último dibujo completo.
+
+    `estilo(nodo, nodo_actual, camino, visitados, podados)` retorna
+    (color, tamaño, podado) con los tamaños de la App (4000 = normal); aquí
+    se escalan según el espacio disponible.
+    """
+
+    UMBRAL_NODOS = 150      # desde aquí la App usa este renderizador
+    MAX_ETIQUETAS = 12
+    MAX_ARISTAS = 4000
+    TAMANO_BASE = 4000
+
+    def __init__(self, ax, grafo, posiciones, estilo, formatear=str):
+        self.ax = ax
+        self.estilo = estilo
+        self.formatear = formatear
+        self.canvas = None
+        self._fondo = None
+        self.animados = []
+
+        self.nodos = list(grafo)
+        self.indice = {nodo: i for i, nodo in enumerate(self.nodos)}
+        self.xy = np.array([posiciones[nodo] for nodo in self.nodos], dtype=float).reshape(-1, 2)
+
+        # Aristas como pares de índices; los segmentos se derivan de xy
+        origenes, destinos = [], []
+        for nodo, vecinos in grafo.items():
+            i = self.indice[nodo]
+            for vecino in vecinos:
+                j = self.indice.get(vecino)
+                if j is not None:
+                    origenes.append(i)
+                    destinos.append(j)
+        self.aristas = np.array([origenes, destinos], dtype=np.int64).reshape(2, -1)
+        self._segmentos = self.xy[self.aristas.T].reshape(-1, 2, 2)
+        self.coleccion_aristas = LineCollection(
+            self._segmentos, colors='#34495e', linewidths=0.6, alpha=0.35, zorder=1)
+        ax.add_collection(self.coleccion_aristas)
+
+        # Caminos alternativos (estáticos) y camino del paso (animado)
+        self.coleccion_alternativos = LineCollection([], linewidths=2, linestyles='dashed', zorder=2)
+        ax.add_collection(self.coleccion_alternativos)
+        self.coleccion_camino = LineCollection([], colors='#27ae60', linewidths=2.5, zorder=2,
+                                               animated=True)
+        ax.add_collection(self.coleccion_camino)
+
+        # Nodos agrupados por estilo: código de estilo por nodo
+        self._escala = 1.0  # tamaño en pantalla / tamaño del estilo
+        self._borde = 0.5
+        self._codigos = {}        # estilo -> código
+        self._colecciones = []    # código -> PathCollection
+        self._estilos = []        # código -> estilo
+        self._codigo_nodo = np.zeros(len(self.nodos), dtype=np.int32)
+        for i, nodo in enumerate(self.nodos):
+            self._codigo_nodo[i] = self._codigo(estilo(nodo))
+        for codigo in range(len(self._colecciones)):
+            self._actualizar_coleccion(codigo)
+        self._resaltados = set()
+
+        # Etiquetas reutilizables
+        self._etiquetas = [
+            ax.text(0, 0, "", fontsize=8, fontweight='bold', ha='center', va='bottom',
+                    visible=False, zorder=5, clip_on=True, animated=True)
+            for _ in range(self.MAX_ETIQUETAS)
+        ]
+        self._nodos_etiquetados = []
+        self._todas_visibles = False  # ¿con el zoom actual se etiqueta todo lo visible?
+        self._visibles = np.ones(len(self.nodos), dtype=bool)
+
+        margen = 1.0
+        if len(self.nodos):
+            ax.set_xlim(self.xy[:, 0].min() - margen, self.xy[:, 0].max() + margen)
+            ax.set_ylim(self.xy[:, 1].min() - margen, self.xy[:, 1].max() + margen)
+        ax.callbacks.connect('xlim_changed', lambda _: self._aplicar_detalle())
+        ax.callbacks.connect('ylim_changed', lambda _: self._aplicar_detalle())
+        self._aplicar_detalle()
+
+    def _codigo(self, estilo):
+        """Código de un estilo; crea su PathCollection la primera vez"""
+        codigo = self._codigos.get(estilo)
+        if codigo is None:
+            codigo = self._codigos[estilo] = len(self._colecciones)
+            color, tamano, podado = estilo
+            coleccion = self.ax.scatter(
+                [], [], s=tamano * self._escala, c=color,
+                edgecolors='#b2bec3' if podado else 'black', linewidths=self._borde,
+                zorder=3 + tamano / 10000, animated=True)
+            self._colecciones.append(coleccion)
+            self._estilos.append(estilo)
+        return codigo
+
+    def _actualizar_coleccion(self, codigo):
+        self._colecciones[codigo].set_offsets(self.xy[self._codigo_nodo == codigo])
+
+    # ------------------------------------------------------------------
+    # Nivel de detalle
+    # ------------------------------------------------------------------
+
+    def _aplicar_detalle(self):
+        """Ajusta tamaños, aristas y etiquetas a la porción visible del grafo"""
+        x0, x1 = sorted(self.ax.get_xlim())
+        y0, y1 = sorted(self.ax.get_ylim())
+        xs, ys = self.xy[:, 0], self.xy[:, 1]
+        self._visibles = (xs >= x0) & (xs <= x1) & (ys >= y0) & (ys <= y1)
+        num_visibles = int(self._visibles.sum())
+
+        # Diámetro de un nodo ~ 70% de la separación entre vecinos en pantalla
+        ancho_pt = self.ax.figure.get_figwidth() * 72 * self.ax.get_position().width
+        separacion_pt = ancho_pt / max(x1 - x0, 1e-9)
+        diametro = min(max(0.7 * separacion_pt, 2.0), 60.0)
+        self._escala = diametro ** 2 / self.TAMANO_BASE
+        # Con nodos de pocos píxeles el borde sólo ensucia
+        self._borde = 0.5 if diametro > 6 else 0
+        for coleccion, (_, tamano, _) in zip(self._colecciones, self._estilos):
+            coleccion.set_sizes([tamano * self._escala])
+            coleccion.set_linewidth(self._borde)
+
+        # Aristas: sólo las que tocan la vista, y una muestra si son demasiadas
+        if self.aristas.shape[1]:
+            dentro = np.flatnonzero(self._visibles[self.aristas[0]] | self._visibles[self.aristas[1]])
+            if len(dentro) > self.MAX_ARISTAS:
+                dentro = dentro[::ceil(len(dentro) / self.MAX_ARISTAS)]
+            segmentos = self._segmentos[dentro]
+        else:
+            segmentos = self._segmentos
+        self.coleccion_aristas.set_segments(segmentos)
+        densa = len(segmentos) > self.MAX_ARISTAS // 4
+        self.coleccion_aristas.set_linewidth(0.3 if densa else 0.8)
+        self.coleccion_aristas.set_alpha(0.2 if densa else 0.4)
+
+        self._todas_visibles = num_visibles <= self.MAX_ETIQUETAS
+        if hasattr(self, '_etiquetas'):
+            self._etiquetar(self._nodos_etiquetados)
+
+    # ------------------------------------------------------------------
+    # Canvas: zoom y blitting
+    # ------------------------------------------------------------------
+
+    def conectar(self, canvas, factor=1.5):
+        """
+        Engancha el renderizador al canvas: guarda el fondo en cada dibujo
+        completo y hace zoom con la rueda del mouse centrado en el cursor.
+        """
+        self.canvas = canvas
+
+        def al_dibujar(_):
+            self._fondo = canvas.copy_from_bbox(self.ax.figure.bbox)
+            self._dibujar_animados()
+
+        def al_girar(evento):
+            if evento.inaxes is not self.ax or evento.xdata is None:
+                return
+            escala = 1 / factor if evento.button == 'up' else factor
+            x0, x1 = self.ax.get_xlim()
+            y0, y1 = self.ax.get_ylim()
+            cx, cy = evento.xdata, evento.ydata
+            self.ax.set_xlim(cx - (cx - x0) * escala, cx + (x1 - cx) * escala)
+            self.ax.set_ylim(cy - (cy - y0) * escala, cy + (y1 - cy) * escala)
+            self._fondo = None
+            canvas.draw_idle()
+
+        canvas.mpl_connect('draw_event', al_dibujar)
+        canvas.mpl_connect('scroll_event', al_girar)
+
+    def agregar_animado(self, artista):
+        """Artista que cambia en cada paso (se dibuja con blitting)"""
+        artista.set_animated(True)
+        self.animados.append(artista)
+
+    def _dibujar_animados(self):
+        figura = self.ax.figure
+        for artista in [self.coleccion_camino] + self._colecciones + self._etiquetas + self.animados:
+            figura.draw_artist(artista)
+
+    def redibujar(self):
+        """Dibuja el paso actual: blitting si hay fondo, si no un dibujo completo"""
+        if self.canvas is None:
+            return
+        if self._fondo is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._fondo)
+        self._dibujar_animados()
+        self.canvas.blit(self.ax.figure.bbox)
+
+    # ------------------------------------------------------------------
+    # Pasos
+    # ------------------------------------------------------------------
+
+    def mostrar_caminos_alternativos(self, caminos, colores):
+        segmentos, colores_segmentos = [], []
+        for k, camino in enumerate(caminos):
+            for origen, destino in zip(camino[:-1], camino[1:]):
+                segmentos.append((self.xy[self.indice[origen]], self.xy[self.indice[destino]]))
+                colores_segmentos.append(colores[k % len(colores)])
+        self.coleccion_alternativos.set_segments(segmentos)
+        self.coleccion_alternativos.set_color(colores_segmentos or 'none')
+        self._fondo = None
+
+    def mostrar_paso(self, paso):
+        """Mueve de colección los nodos que cambiaron y reubica las etiquetas"""
+        nodo_actual = paso['nodo_actual']
+        camino = paso['camino']
+        en_camino = set(camino)
+        visitados = paso['visitados']
+        podados = paso.get('podados', ())
+
+        # Sólo pueden cambiar los nodos resaltados ahora o en el paso anterior
+        resaltados = {nodo_actual} | en_camino | set(visitados) | set(podados)
+        modificadas = set()
+        for nodo in resaltados | self._resaltados:
+            i = self.indice.get(nodo)
+            if i is None:
+                continue
+            codigo = self._codigo(self.estilo(nodo, nodo_actual, en_camino, visitados, podados))
+            anterior = self._codigo_nodo[i]
+            if codigo != anterior:
+                self._codigo_nodo[i] = codigo
+                modificadas.update((codigo, anterior))
+        self._resaltados = resaltados
+        for codigo in modificadas:
+            self._actualizar_coleccion(codigo)
+
+        self.coleccion_camino.set_segments([
+            (self.xy[self.indice[a]], self.xy[self.indice[b]])
+            for a, b in zip(camino[:-1], camino[1:]) if a in self.indice and b in self.indice
+        ])
+
+        # Etiquetas: nodo actual, camino (del final hacia atrás) y frontera
+        frontera = paso.get('cola', paso.get('pila', ()))
+        if 'pila' in paso:
+            frontera = frontera[::-1]  # el tope primero
+        self._etiquetar([nodo_actual] + camino[::-1] + list(frontera[:self.MAX_ETIQUETAS]))
+
+    def _etiquetar(self, candidatos):
+        """Asigna los textos disponibles a los primeros candidatos visibles"""
+        self._nodos_etiquetados = candidatos
+        elegidos = []
+        vistos = set()
+        for nodo in candidatos:
+            i = self.indice.get(nodo)
+            if i is None or nodo in vistos or not self._visibles[i]:
+                continue
+            vistos.add(nodo)
+            elegidos.append(i)
+            if len(elegidos) == self.MAX_ETIQUETAS:
+                break
+        # Con zoom suficiente se etiqueta todo lo que está a la vista
+        if self._todas_visibles:
+            for i in np.flatnonzero(self._visibles):
+                if len(elegidos) == self.MAX_ETIQUETAS:
+                    break
+                if self.nodos[i] not in vistos:
+                    elegidos.append(int(i))
+
+        for texto, i in zip(self._etiquetas, elegidos):
+            x, y = self.xy[i]
+            texto.set_position((x, y))
+            texto.set_text(self.formatear(self.nodos[i]))
+            texto.set_visible(True)
+        for texto in self._etiquetas[len(elegidos):]:
+            texto.set_visible(False)
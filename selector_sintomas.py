@@ -0,0 +1,133 @@
+"""
+Selector de Síntomas - Buscador con lista virtualizada para catálogos grandes
+Sólo existen los Radiobutton de las filas visibles: al desplazarse o filtrar
+se les cambia el texto y el valor, sin crear ni destruir widgets
+"""
+
+import tkinter as tk
+
+
+class SelectorSintomas:
+    """
+    Campo de búsqueda + lista de síntomas con barra de desplazamiento.
+
+    La lista muestra `resultados[primero:primero + filas]` reutilizando un
+    conjunto fijo de Radiobutton enlazados a `variable`, así el costo de
+    pintar no depende del tamaño del catálogo (20 o 20.000 síntomas).
+    Enter en el buscador elige el primer resultado.
+
+    `catalogo` es una función que retorna el CatalogoSintomas vigente
+    (el del agente actual de la App).
+    """
+
+    def __init__(self, padre, catalogo, variable, filas=8):
+        self.catalogo = catalogo
+        self.variable = variable
+        self.resultados = ()
+        self.primero = 0
+
+        self.marco = tk.Frame(padre, bg="white")
+
+        self.busqueda = tk.Entry(self.marco, font=("Arial", 9), relief=tk.SOLID, bd=1)
+        self.busqueda.pack(fill=tk.X, padx=3, pady=(0, 4))
+        self.busqueda.bind("<KeyRelease>", lambda evento: self.filtrar())
+        self.busqueda.bind("<Return>", lambda evento: self.elegir_primero())
+
+        self.label_total = tk.Label(self.marco, text="", font=("Arial", 7, "italic"),
+                                    bg="white", fg="#7f8c8d", anchor="w")
+        self.label_total.pack(fill=tk.X, padx=3)
+
+        cuerpo = tk.Frame(self.marco, bg="white")
+        cuerpo.pack(fill=tk.BOTH, expand=True)
+        self.barra = tk.Scrollbar(cuerpo, orient=tk.VERTICAL, command=self._desplazar)
+        self.barra.pack(side=tk.RIGHT, fill=tk.Y)
+        self.lista = tk.Frame(cuerpo, bg="white")
+        self.lista.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.filas = []
+        for _ in range(filas):
+            fila = tk.Radiobutton(
+                self.lista,
+                text="",
+                variable=self.variable,
+                value="",
+                font=("Arial", 9),
+                bg="white",
+                padx=3,
+                pady=2,
+                anchor="w"
+            )
+            fila.pack(fill=tk.X, padx=3, pady=1)
+            for evento in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                fila.bind(evento, self._rueda)
+            self.filas.append(fila)
+        for evento in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.lista.bind(evento, self._rueda)
+
+        self.filtrar()
+
+    def pack(self, **opciones):
+        self.marco.pack(**opciones)
+
+    # ------------------------------------------------------------------
+    # Filtro y ventana visible
+    # ------------------------------------------------------------------
+
+    def filtrar(self):
+        """Vuelve a buscar con el texto del buscador y muestra desde el principio"""
+        catalogo = self.catalogo()
+        self.resultados = catalogo.buscar(self.busqueda.get())
+        self.primero = 0
+        total = len(catalogo)
+        if len(self.resultados) == total:
+            self.label_total.config(text=f"{total} síntomas")
+        else:
+            self.label_total.config(text=f"{len(self.resultados)} de {total} síntomas")
+        self._mostrar()
+
+    def _mostrar(self):
+        """Reasigna las filas fijas a la ventana resultados[primero:primero + filas]"""
+        catalogo = self.catalogo()
+        visibles = self.resultados[self.primero:self.primero + len(self.filas)]
+        for fila, sintoma in zip(self.filas, visibles):
+            fila.config(text=catalogo.nombre(sintoma), value=sintoma, state=tk.NORMAL)
+        for fila in self.filas[len(visibles):]:
+            # Valor imposible para que la fila vacía nunca aparezca marcada
+            fila.config(text="", value="\0", state=tk.DISABLED)
+
+        total = len(self.resultados)
+        if total:
+            self.barra.set(self.primero / total, min(1.0, (self.primero + len(self.filas)) / total))
+        else:
+            self.barra.set(0.0, 1.0)
+
+    def _ir_a(self, primero):
+        maximo = max(0, len(self.resultados) - len(self.filas))
+        primero = min(max(0, primero), maximo)
+        if primero != self.primero:
+            self.primero = primero
+            self._mostrar()
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        """Comando de la barra: ('moveto', fracción) o ('scroll', n, 'units'|'pages')"""
+        if accion == tk.MOVETO:
+            self._ir_a(int(float(cantidad) * len(self.resultados)))
+        elif accion == tk.SCROLL:
+            paso = len(self.filas) if unidad == tk.PAGES else 1
+            self._ir_a(self.primero + int(cantidad) * paso)
+
+    def _rueda(self, evento):
+        if getattr(evento, 'num', None) == 4 or getattr(evento, 'delta', 0) > 0:
+            self._ir_a(self.primero - 3)
+        else:
+            self._ir_a(self.primero + 3)
+        return "break"
+
+    def elegir_primero(self):
+        if self.resultados:
+            self.variable.set(self.resultados[0])
+
+    def limpiar(self):
+        """Borra la búsqueda y vuelve a mostrar todo el catálogo"""
+        self.busqueda.delete(0, tk.END)
+        self.filtrar()
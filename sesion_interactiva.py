@@ -0,0 +1,176 @@
+"""
+Sesión Interactiva - Máquina de estados del diagnóstico pregunta a pregunta
+No depende de la interfaz: la App sólo muestra la pregunta y reenvía la respuesta
+"""
+
+from estructuras_persistentes import ColaPersistente, ConjuntoPersistente, PilaPersistente
+
+
+class SesionInteractiva:
+    """
+    Diagnóstico interactivo como máquina de estados dirigida por eventos.
+
+    Estados:
+    - PREGUNTANDO: hay una `pregunta` pendiente (síntoma, camino)
+    - FINALIZADA: `tiene_otitis` contiene el diagnóstico
+
+    Cada llamada a `responder` hace O(grado) trabajo con BFS/DFS y nunca
+    recursión, así que la pila de Python no crece con la duración de la
+    sesión. Con una `politica` (PoliticaPreguntas) el orden de las
+    preguntas lo decide la ganancia de información en vez de la frontera.
+
+    Los visitados y la frontera son estructuras persistentes y el resto del
+    estado nunca se modifica en su lugar: cada respuesta guarda la versión
+    anterior en O(1) y `deshacer` la restaura al instante.
+    """
+
+    PREGUNTANDO = 'preguntando'
+    FINALIZADA = 'finalizada'
+
+    # Atributos que cambian con cada respuesta (todos inmutables o nunca
+    # modificados en su lugar, así una versión es sólo una tupla de referencias)
+    _CAMPOS_ESTADO = ('estado', 'paso', 'camino', 'visitados', 'tiene_otitis', 'pregunta')
+
+    def __init__(self, agente, algoritmo, sintoma_inicial, politica=None):
+        self.agente = agente
+        self.algoritmo = algoritmo
+        self.sintoma_inicial = sintoma_inicial
+        self.politica = politica
+
+        self.estado = self.PREGUNTANDO
+        self.paso = 1
+        self.camino = [sintoma_inicial]
+        self.visitados = ConjuntoPersistente((sintoma_inicial,))
+        self.tiene_otitis = None
+        self.pregunta = None
+        self._versiones = []  # [(estado anterior, (nodo, respuesta))]
+
+        if politica is not None:
+            # El síntoma inicial ya es evidencia: no se pregunta
+            self.presentes = [sintoma_inicial]
+            self.negados = []
+        else:
+            # Cola (BFS) o pila (DFS) de (nodo, camino)
+            estructura = ColaPersistente if algoritmo == "BFS" else PilaPersistente
+            self.frontera = estructura([(sintoma_inicial, [sintoma_inicial])])
+
+        self._avanzar()
+
+    @property
+    def finalizada(self):
+        return self.estado == self.FINALIZADA
+
+    def _finalizar(self, tiene_otitis):
+        self.estado = self.FINALIZADA
+        self.tiene_otitis = tiene_otitis
+        self.pregunta = None
+
+    def _avanzar(self):
+        """Calcula la siguiente pregunta o finaliza la sesión"""
+        if self.politica is not None:
+            eleccion = self.politica.siguiente_pregunta(self.presentes, self.negados)
+            if eleccion is None:
+                self._finalizar(self.politica.decidir(self.presentes, self.negados)[0])
+                return
+            nodo = eleccion[0]
+            self.pregunta = (nodo, self.presentes + [nodo])
+            return
+
+        if not self.frontera:
+            self._finalizar(False)
+            return
+
+        nodo, camino = self.frontera.proximo()
+        if nodo in self.agente.objetivos:
+            # Llegar a un diagnóstico (OTITIS) por la frontera ya es el diagnóstico
+            self.camino = camino
+            self._finalizar(True)
+            return
+        self.pregunta = (nodo, camino)
+
+    def responder(self, tiene_sintoma):
+        """Aplica la respuesta del paciente a la pregunta pendiente"""
+        if self.finalizada:
+            raise RuntimeError("La sesión interactiva ya finalizó")
+
+        nodo_actual, camino = self.pregunta
+        self._versiones.append((self._estado(), (nodo_actual, tiene_sintoma)))
+
+        if self.politica is not None:
+            self.visitados = self.visitados.agregar(nodo_actual)
+            if tiene_sintoma:
+                self.presentes = self.presentes + [nodo_actual]
+                self.camino = self.presentes
+            else:
+                self.negados = self.negados + [nodo_actual]
+        else:
+            # Desencolar/desapilar
+            self.frontera = self.frontera.sacar()
+
+            if tiene_sintoma:
+                # Agregar a camino y explorar vecinos
+                self.camino = camino
+                vecinos = self.agente.obtener_vecinos(nodo_actual)
+
+                # Para DFS: agregar en orden REVERSO (igual que en agente_otitis.py)
+                if self.algoritmo == "DFS":
+                    vecinos = list(reversed(vecinos))
+
+                for vecino in vecinos:
+                    if vecino not in self.visitados:
+                        self.visitados = self.visitados.agregar(vecino)
+                        self.frontera = self.frontera.meter((vecino, camino + [vecino]))
+
+        self.paso += 1
+        self._avanzar()
+
+    def _campos(self):
+        if self.politica is not None:
+            return self._CAMPOS_ESTADO + ('presentes', 'negados')
+        return self._CAMPOS_ESTADO + ('frontera',)
+
+    def _estado(self):
+        return tuple(getattr(self, campo) for campo in self._campos())
+
+    @property
+    def puede_deshacer(self):
+        return bool(self._versiones)
+
+    def deshacer(self):
+        """
+        Vuelve al estado anterior a la última respuesta, en O(1).
+        Retorna esa respuesta: (nodo, tiene_sintoma).
+        """
+        if not self._versiones:
+            raise RuntimeError("No hay respuestas para deshacer")
+        estado, respuesta = self._versiones.pop()
+        for campo, valor in zip(self._campos(), estado):
+            setattr(self, campo, valor)
+        return respuesta
+
+    def num_preguntas(self):
+        """Preguntas respondidas hasta ahora"""
+        return self.paso - 1
+
+    def frontera_nodos(self):
+        """Nodos pendientes (candidatos de la política o cola/pila)"""
+        if self.politica is not None:
+            return self.politica.candidatos(self.presentes, self.negados)
+        return [n for n, _ in self.frontera]
+
+    def tamano_frontera(self):
+        """Cantidad de nodos pendientes"""
+        if self.politica is not None:
+            return len(self.frontera_nodos())
+        return len(self.frontera)
+
+    def paso_visual(self):
+        """Estado actual con el formato de un paso de búsqueda (para la GUI)"""
+        nodo_actual, camino = self.pregunta if self.pregunta else (self.camino[-1], self.camino)
+        return {
+            'paso': self.paso,
+            'nodo_actual': nodo_actual,
+            'camino': camino,
+            'visitados': self.visitados,
+            'pila' if self.algoritmo == "DFS" else 'cola': camino
+        }
@@ -0,0 +1,374 @@
+"""
+Traza de Búsqueda - Pasos de BFS/DFS guardados en arreglos paralelos
+Cada paso ocupa unos pocos enteros; los diccionarios de la interfaz se
+arman sólo al leerlos
+"""
+
+from array import array
+from collections.abc import Sequence, Set
+
+
+class _Prefijo(Set):
+    """
+    Vista de conjunto sobre los primeros n elementos de una lista que sólo
+    crece (visitados / podados). Pertenencia O(1) usando la posición de cada
+    elemento; no copia nada.
+    """
+
+    __slots__ = ('_orden', '_posicion', '_n')
+
+    def __init__(self, orden, posicion, n):
+        self._orden = orden
+        self._posicion = posicion
+        self._n = n
+
+    def __contains__(self, nodo):
+        posicion = self._posicion.get(nodo)
+        return posicion is not None and posicion < self._n
+
+    def __iter__(self):
+        for i in range(self._n):
+            yield self._orden[i]
+
+    def __len__(self):
+        return self._n
+
+    def __repr__(self):
+        return f"{{{', '.join(map(repr, self))}}}"
+
+    def copy(self):
+        return set(self)
+
+
+class PasoVista:
+    """
+    Un paso de la traza con acceso tipo diccionario: paso['nodo_actual'],
+    paso.get('podados', ()), 'cola' in paso, dict(paso).
+
+    'en_camino' se calcula al leer a partir de los caminos finales. `_i`
+    es el número absoluto del paso (desde 0), así la vista sigue siendo
+    válida aunque la traza descarte pasos viejos (ventana).
+    """
+
+    __slots__ = ('_traza', '_i')
+
+    def __init__(self, traza, i):
+        self._traza = traza
+        self._i = i
+
+    def keys(self):
+        return self._traza.claves
+
+    def __getitem__(self, clave):
+        traza = self._traza
+        if clave == 'paso':
+            return self._i + 1
+        i = self._i - traza._base
+        if i < 0:
+            raise IndexError(f"El paso {self._i + 1} ya salió de la ventana de la traza")
+        if clave == 'nodo_actual':
+            return traza._nodos[i]
+        if clave == traza.estructura:
+            return traza._frontera_en(i)
+        if clave == 'visitados':
+            return _Prefijo(traza._orden_visitados, traza._pos_visitados, traza._n_visitados[i])
+        if clave == 'camino':
+            return traza.camino(traza._nodos[i])
+        if clave == 'en_camino':
+            return traza._nodos[i] in traza.en_caminos
+        if clave == 'podados' and traza.con_podados:
+            return _Prefijo(traza._orden_podados, traza._pos_podados, traza._n_podados[i])
+        raise KeyError(clave)
+
+    def tamano_frontera(self):
+        """len(paso['cola'/'pila']) sin armar la lista"""
+        return self._traza._tamano[self._i - self._traza._base]
+
+    def get(self, clave, defecto=None):
+        try:
+            return self[clave]
+        except KeyError:
+            return defecto
+
+    def __contains__(self, clave):
+        return clave in self._traza.claves
+
+    def __iter__(self):
+        return iter(self._traza.claves)
+
+    def __len__(self):
+        return len(self._traza.claves)
+
+    def items(self):
+        return [(clave, self[clave]) for clave in self._traza.claves]
+
+    def __eq__(self, otro):
+        if isinstance(otro, (PasoVista, dict)):
+            return dict(self.items()) == dict(otro.items())
+        return NotImplemented
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class Traza(Sequence):
+    """
+    Frontera y traza de un recorrido BFS ('cola') o DFS ('pila').
+
+    La búsqueda usa la traza como su frontera:
+    - cola: lista de entradas en orden de llegada + índice del frente, así la
+      cola de cada paso es la ventana entradas[frente:fin]
+    - pila: entradas enlazadas (cada una apunta a la de abajo), así la pila
+      de cada paso es la cadena que baja desde su tope
+    Cada nodo entra una sola vez (se marca visitado al entrar), por lo que
+    su camino se reconstruye siguiendo `padre`; visitados y podados sólo
+    crecen, así que cada paso guarda únicamente cuántos había.
+
+    Por paso se guardan el nodo y 2-4 enteros; los pasos se leen como
+    PasoVista con las mismas claves que los antiguos diccionarios.
+
+    Con `ventana` sólo se conservan (al menos) los últimos `ventana` pasos:
+    la secuencia expone exactamente esos y `num_pasos` cuenta todos.
+    """
+
+    def __init__(self, estructura, nodo_inicial, con_podados=False, ventana=None):
+        self.estructura = estructura
+        self.con_podados = con_podados
+        self.ventana = ventana
+        self._base = 0  # pasos descartados por la ventana
+        self.claves = ('paso', 'nodo_actual', estructura, 'visitados', 'camino', 'en_camino')
+        if con_podados:
+            self.claves += ('podados',)
+        self.en_caminos = frozenset()
+
+        # Frontera viva
+        self._entradas = []
+        self._debajo = array('l')  # sólo pila
+        self._frente = 0           # sólo cola
+        self._tope = -1            # sólo pila
+        self._pendientes = 0
+        self._padre = {nodo_inicial: None}
+
+        # Conjuntos que sólo crecen
+        self._orden_visitados = []
+        self._pos_visitados = {}
+        self._orden_podados = []
+        self._pos_podados = {}
+
+        # Columnas por paso
+        self._nodos = []
+        self._marca = array('l')   # frente (cola) o tope (pila)
+        self._tamano = array('l')  # nodos en la frontera
+        self._n_visitados = array('l')
+        self._n_podados = array('l')
+
+        self.marcar_visitado(nodo_inicial)
+        self.meter(nodo_inicial, None)
+
+    # ------------------------------------------------------------------
+    # Frontera
+    # ------------------------------------------------------------------
+
+    def hay_pendientes(self):
+        """True mientras la frontera tenga nodos"""
+        return self._pendientes > 0
+
+    def siguiente(self):
+        """Nodo que saldrá ahora: el frente de la cola o el tope de la pila"""
+        if self.estructura == 'cola':
+            return self._entradas[self._frente]
+        return self._entradas[self._tope]
+
+    def sacar(self):
+        nodo = self.siguiente()
+        self._pendientes -= 1
+        if self.estructura == 'cola':
+            self._frente += 1
+        else:
+            self._tope = self._debajo[self._tope]
+        return nodo
+
+    def meter(self, nodo, padre):
+        if padre is not None:
+            self._padre[nodo] = padre
+        self._entradas.append(nodo)
+        self._pendientes += 1
+        if self.estructura == 'pila':
+            self._debajo.append(self._tope)
+            self._tope = len(self._entradas) - 1
+
+    def marcar_visitado(self, nodo):
+        self._pos_visitados[nodo] = len(self._orden_visitados)
+        self._orden_visitados.append(nodo)
+
+    def visitado(self, nodo):
+        return nodo in self._pos_visitados
+
+    def marcar_podado(self, nodo):
+        self._pos_podados[nodo] = len(self._orden_podados)
+        self._orden_podados.append(nodo)
+
+    def podado(self, nodo):
+        return nodo in self._pos_podados
+
+    @property
+    def num_visitados(self):
+        return len(self._orden_visitados)
+
+    @property
+    def num_podados(self):
+        return len(self._orden_podados)
+
+    def camino(self, nodo):
+        """Camino desde el nodo inicial siguiendo los padres"""
+        camino = []
+        while nodo is not None:
+            camino.append(nodo)
+            nodo = self._padre[nodo]
+        camino.reverse()
+        return camino
+
+    # ------------------------------------------------------------------
+    # Pasos
+    # ------------------------------------------------------------------
+
+    def registrar_paso(self):
+        """Guarda el estado ANTES de sacar el próximo nodo"""
+        self._nodos.append(self.siguiente())
+        self._marca.append(self._frente if self.estructura == 'cola' else self._tope)
+        self._tamano.append(self._pendientes)
+        self._n_visitados.append(len(self._orden_visitados))
+        if self.con_podados:
+            self._n_podados.append(len(self._orden_podados))
+        # Recortar por mitades: O(1) amortizado por paso
+        if self.ventana is not None and len(self._nodos) >= 2 * self.ventana:
+            self._descartar(len(self._nodos) - self.ventana)
+
+    def _descartar(self, n):
+        """Olvida los n pasos más viejos"""
+        for columna in (self._nodos, self._marca, self._tamano, self._n_visitados):
+            del columna[:n]
+        if self.con_podados:
+            del self._n_podados[:n]
+        self._base += n
+
+    @property
+    def num_pasos(self):
+        """Pasos registrados en total (incluidos los que salieron de la ventana)"""
+        return self._base + len(self._nodos)
+
+    def ultimo_paso(self):
+        return PasoVista(self, self.num_pasos - 1)
+
+    def finalizar(self, caminos):
+        """Fija los caminos finales; 'en_camino' de cada paso se deriva de ellos"""
+        en_caminos = set()
+        for camino in caminos:
+            en_caminos.update(camino)
+        self.en_caminos = frozenset(en_caminos)
+
+    def _frontera_en(self, i):
+        return self._frontera_desde(self._marca[i], self._tamano[i])
+
+    def frontera_actual(self):
+        """Nodos que siguen en la frontera (cola desde el frente / pila desde la base)"""
+        marca = self._frente if self.estructura == 'cola' else self._tope
+        return self._frontera_desde(marca, self._pendientes)
+
+    def _frontera_desde(self, marca, tamano):
+        if self.estructura == 'cola':
+            return self._entradas[marca:marca + tamano]
+        # Pila: bajar desde el tope y dar vuelta (la base primero)
+        pila = []
+        entrada = marca
+        while entrada >= 0:
+            pila.append(self._entradas[entrada])
+            entrada = self._debajo[entrada]
+        pila.reverse()
+        return pila
+
+    def _primero_visible(self):
+        """Índice absoluto del primer paso expuesto (los últimos `ventana`)"""
+        if self.ventana is None:
+            return self._base
+        return max(self._base, self.num_pasos - self.ventana)
+
+    def __len__(self):
+        return self.num_pasos - self._primero_visible()
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError(indice)
+        return PasoVista(self, self._primero_visible() + indice)
+
+    def __eq__(self, otro):
+        if isinstance(otro, (Traza, list)):
+            return len(self) == len(otro) and all(a == b for a, b in zip(self, otro))
+        return NotImplemented
+
+    # ------------------------------------------------------------------
+    # Exportar / importar
+    # ------------------------------------------------------------------
+
+    def exportar(self):
+        """
+        Diccionario con sólo listas, números y textos (serializable a JSON)
+        con todo lo necesario para reconstruir la traza: las mismas columnas
+        por paso, sin expandir ningún paso.
+        """
+        return {
+            'estructura': self.estructura,
+            'con_podados': self.con_podados,
+            'ventana': self.ventana,
+            'base': self._base,
+            'en_caminos': sorted(self.en_caminos),
+            'entradas': self._entradas,
+            'debajo': self._debajo.tolist(),
+            'frente': self._frente,
+            'tope': self._tope,
+            'pendientes': self._pendientes,
+            'padre': [list(self._padre), list(self._padre.values())],
+            'visitados': self._orden_visitados,
+            'podados': self._orden_podados,
+            'nodos': self._nodos,
+            'marca': self._marca.tolist(),
+            'tamano': self._tamano.tolist(),
+            'n_visitados': self._n_visitados.tolist(),
+            'n_podados': self._n_podados.tolist(),
+        }
+
+    @classmethod
+    def importar(cls, datos):
+        """Traza reconstruida a partir de `exportar()`"""
+        traza = cls.__new__(cls)
+        traza.estructura = datos['estructura']
+        traza.con_podados = datos['con_podados']
+        traza.ventana = datos['ventana']
+        traza._base = datos['base']
+        traza.claves = ('paso', 'nodo_actual', traza.estructura, 'visitados', 'camino', 'en_camino')
+        if traza.con_podados:
+            traza.claves += ('podados',)
+        traza.en_caminos = frozenset(datos['en_caminos'])
+
+        traza._entradas = list(datos['entradas'])
+        traza._debajo = array('l', datos['debajo'])
+        traza._frente = datos['frente']
+        traza._tope = datos['tope']
+        traza._pendientes = datos['pendientes']
+        traza._padre = dict(zip(*datos['padre']))
+
+        traza._orden_visitados = list(datos['visitados'])
+        traza._pos_visitados = {nodo: i for i, nodo in enumerate(traza._orden_visitados)}
+        traza._orden_podados = list(datos['podados'])
+        traza._pos_podados = {nodo: i for i, nodo in enumerate(traza._orden_podados)}
+
+        traza._nodos = list(datos['nodos'])
+        traza._marca = array('l', datos['marca'])
+        traza._tamano = array('l', datos['tamano'])
+        traza._n_visitados = array('l', datos['n_visitados'])
+        traza._n_podados = array('l', datos['n_podados'])
+        return traza